@@ -3,16 +3,26 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import re
 import sys
+import threading
 import difflib
-from typing import Any, Dict, List, Tuple
+import hashlib
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+from llama_cpp import Llama, LlamaRAMCache  # CPU-only by default if N_GPU_LAYERS=0
+
+from cli_stream import chunked, iter_input_rows, normalize_input, scan_resume, skip_done
+from inference_queue import InferenceQueue
+from result_cache import SPACES_RE, ResultCache, cache_key
 
 app = Flask(__name__)
 
@@ -30,11 +40,41 @@ N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
 
+MODELS_DIR = "models"
+# Use models/<MODEL_FILE> as-is without asking the Hub for updates
+OFFLINE = os.getenv("OFFLINE", "0").lower() in ("1", "true", "yes")
+# Load + warm up the model at server start instead of on the first request
+PRELOAD = os.getenv("PRELOAD", "0").lower() in ("1", "true", "yes")
+
+# Rows packed into one prompt (1 = one completion per row)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1"))
+# Bytes of llama.cpp state kept in RAM for prompt-prefix reuse (0 = off). Off by
+# default: the Llama object already reuses the KV state of a shared prefix, and
+# the RAM cache copies the whole state after every completion.
+PROMPT_CACHE_BYTES = int(os.getenv("PROMPT_CACHE_BYTES", "0"))
+
+# Result cache: SQLite file next to models/ ("" = memory only) + in-memory LRU
+CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(MODELS_DIR, "standardize_cache.sqlite3"))
+CACHE_MEMORY_SIZE = int(os.getenv("CACHE_MEMORY_SIZE", "4096"))
+CACHE_MAX_ROWS = int(os.getenv("CACHE_MAX_ROWS", "200000"))
+
+# Server inference queue: rows per model call and how long to wait to fill it
+QUEUE_MAX_BATCH = int(os.getenv("QUEUE_MAX_BATCH", str(BATCH_SIZE)))
+QUEUE_MAX_WAIT_MS = float(os.getenv("QUEUE_MAX_WAIT_MS", "10"))
+
+# CLI: fsync the output file every N rows so a crash redoes at most N rows
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY", "100"))
+
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
+# Greedy array matcher for batched replies
+JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
 
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
@@ -46,15 +86,26 @@ def _read_lines(path: str) -> List[str]:
         return []
 
 
-CANON_UNIS = _read_lines(CANON_UNIS_PATH)
-CANON_PROGS = _read_lines(CANON_PROGS_PATH)
-
+# Whole-string, case-insensitive abbreviation patterns (no capturing groups)
 ABBREV_UNI: Dict[str, str] = {
-    r"(?i)^mcg(\.|ill)?$": "McGill University",
-    r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
-    r"(?i)^uoft$": "University of Toronto",
+    r"mcg(?:\.|ill)?": "McGill University",
+    r"ubc|u\.?b\.?c\.?": "University of British Columbia",
+    r"uoft": "University of Toronto",
 }
 
+# One alternation for all abbreviations; the matching group index picks the expansion
+ABBREV_UNI_RE = re.compile(
+    "|".join(f"({pat})" for pat in ABBREV_UNI), re.IGNORECASE
+)
+ABBREV_UNI_FULL: List[str] = list(ABBREV_UNI.values())
+
+OF_RE = re.compile(r"\bOf\b")
+SPLIT_RE = re.compile(r",| at | @ ")
+MCGILL_RE = re.compile(r"mcg(?:ill)?\.?", re.IGNORECASE)
+UBC_RE = re.compile(
+    r"ubc|u\.?b\.?c\.?|university of british columbia", re.IGNORECASE
+)
+
 COMMON_UNI_FIXES: Dict[str, str] = {
     "McGiill University": "McGill University",
     "Mcgill University": "McGill University",
@@ -110,64 +161,256 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+BATCH_PROMPT = (
+    SYSTEM_PROMPT
+    + "\nWhen the input is a JSON array of such objects, return a JSON array with "
+    "exactly one result object per input, in the same order.\n"
+)
+
+
+def _build_prefix(system_prompt: str, batched: bool) -> List[Dict[str, str]]:
+    """Build the static system + few-shot messages shared by every request."""
+    messages = [{"role": "system", "content": system_prompt}]
+    if batched:
+        shots = [
+            ([x_in for x_in, _ in FEW_SHOTS], [x_out for _, x_out in FEW_SHOTS])
+        ]
+    else:
+        shots = list(FEW_SHOTS)
+    for x_in, x_out in shots:
+        messages.append(
+            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
+        )
+        messages.append(
+            {
+                "role": "assistant",
+                "content": json.dumps(x_out, ensure_ascii=False),
+            }
+        )
+    return messages
+
+
+# Built once so every prompt starts with byte-identical tokens; llama.cpp then
+# reuses the evaluated KV state for this prefix instead of re-reading it.
+PREFIX_MESSAGES = _build_prefix(SYSTEM_PROMPT, batched=False)
+BATCH_PREFIX_MESSAGES = _build_prefix(BATCH_PROMPT, batched=True)
+
 _LLM: Llama | None = None
+_LLM_LOCK = threading.Lock()
+# Startup state reported by /ready
+_STARTUP: Dict[str, Any] = {
+    "preloading": False,
+    "warmed_up": False,
+    "load_seconds": None,
+    "error": None,
+}
 
+WARM_UP_PROGRAM = "Computer Science, Johns Hopkins University"
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
 
-    model_path = hf_hub_download(
+def _model_path() -> str:
+    """Return the local GGUF path, consulting the Hub only when not offline."""
+    local = os.path.join(MODELS_DIR, MODEL_FILE)
+    if OFFLINE:
+        if not os.path.exists(local):
+            raise FileNotFoundError(f"OFFLINE is set but {local} does not exist")
+        return local
+    return hf_hub_download(
         repo_id=MODEL_REPO,
         filename=MODEL_FILE,
-        local_dir="models",
+        local_dir=MODELS_DIR,
         local_dir_use_symlinks=False,
         force_filename=MODEL_FILE,
     )
 
-    _LLM = Llama(
-        model_path=model_path,
-        n_ctx=N_CTX,
-        n_threads=N_THREADS,
-        n_gpu_layers=N_GPU_LAYERS,
-        verbose=False,
-    )
+
+def _load_llm(warm_up: bool = False) -> Llama:
+    """Download (or reuse) the GGUF file and initialize llama.cpp.
+
+    With ``warm_up`` a first completion is run before the model is published,
+    so concurrent callers wait on the lock instead of racing the warm-up.
+    """
+    global _LLM
+    if _LLM is not None:
+        return _LLM
+    with _LLM_LOCK:
+        if _LLM is not None:
+            return _LLM
+        started = time.perf_counter()
+        llm = Llama(
+            model_path=_model_path(),
+            n_ctx=N_CTX,
+            n_threads=N_THREADS,
+            n_gpu_layers=N_GPU_LAYERS,
+            verbose=False,
+        )
+        if PROMPT_CACHE_BYTES > 0:
+            llm.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_BYTES))
+        if warm_up:
+            # Also evaluates the shared few-shot prefix so the first request reuses it
+            warm = {"role": "user", "content": json.dumps({"program": WARM_UP_PROGRAM})}
+            llm.create_chat_completion(
+                messages=PREFIX_MESSAGES + [warm],
+                temperature=0.0,
+                max_tokens=128,
+            )
+            _STARTUP["warmed_up"] = True
+        _STARTUP["load_seconds"] = round(time.perf_counter() - started, 3)
+        # A later load succeeding supersedes an earlier preload failure
+        _STARTUP["error"] = None
+        _LLM = llm
     return _LLM
 
 
+def _preload() -> None:
+    """Eagerly load and warm up the model; failures are reported by /ready."""
+    _STARTUP["preloading"] = True
+    try:
+        _load_llm(warm_up=True)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        _STARTUP["error"] = f"{type(exc).__name__}: {exc}"
+        print(f"preload failed: {_STARTUP['error']}", file=sys.stderr)
+    finally:
+        _STARTUP["preloading"] = False
+
+
+def _start_preload() -> None:
+    """Run ``_preload`` in the background; /ready reports 503 until it is done."""
+    # Set before the thread starts so /ready never sees a gap
+    _STARTUP["preloading"] = True
+    threading.Thread(target=_preload, name="preload", daemon=True).start()
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
-    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
-    parts = [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
+    s = SPACES_RE.sub(" ", (text or "")).strip().strip(",")
+    parts = [p.strip() for p in SPLIT_RE.split(s) if p.strip()]
     prog = parts[0] if parts else ""
     uni = parts[1] if len(parts) > 1 else ""
 
     # High-signal expansions
-    if re.fullmatch(r"(?i)mcg(ill)?(\.)?", uni or ""):
+    if MCGILL_RE.fullmatch(uni or ""):
         uni = "McGill University"
-    if re.fullmatch(
-        r"(?i)(ubc|u\.?b\.?c\.?|university of british columbia)",
-        uni or "",
-    ):
+    if UBC_RE.fullmatch(uni or ""):
         uni = "University of British Columbia"
 
     # Title-case program; normalize 'Of' → 'of' for universities
     prog = prog.title()
     if uni:
-        uni = re.sub(r"\bOf\b", "of", uni.title())
+        uni = OF_RE.sub("of", uni.title())
     else:
         uni = "Unknown"
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
-        return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+class FuzzyIndex:  # pylint: disable=too-few-public-methods
+    """Precomputed candidate index reproducing ``difflib.get_close_matches(n=1)``.
+
+    Each string's character multiset is encoded as a bitmask with one bit per
+    (character, occurrence) pair, so the number of shared characters, which is
+    difflib's ``quick_ratio`` upper bound, is ``popcount(a & b)``. Candidates
+    are bucketed by length for the ``real_quick_ratio`` bound, survivors are
+    scored best-bound-first with the exact ``SequenceMatcher.ratio``, and the
+    scan stops once no remaining bound can beat the best score. Results,
+    including tie-breaks, therefore match difflib at the same cutoff.
+    """
+
+    def __init__(self, candidates: Iterable[str]) -> None:
+        self.candidates = list(candidates)
+        self._bits: Dict[Tuple[str, int], int] = {}
+        self._by_len: Dict[int, List[Tuple[str, int]]] = {}
+        for cand in self.candidates:
+            self._by_len.setdefault(len(cand), []).append((cand, self._mask(cand, grow=True)))
+
+    def _mask(self, text: str, grow: bool = False) -> int:
+        """Bitmask of (char, nth occurrence) pairs present in ``text``."""
+        mask = 0
+        for char, count in Counter(text).items():
+            for nth in range(count):
+                bit = self._bits.get((char, nth))
+                if bit is None:
+                    if not grow:
+                        break
+                    bit = self._bits[(char, nth)] = len(self._bits)
+                mask |= 1 << bit
+        return mask
+
+    def best(self, name: str, cutoff: float) -> str | None:  # pylint: disable=too-many-locals
+        """Return the closest candidate scoring at least ``cutoff``, or None."""
+        if not name or not self.candidates:
+            return None
+        len_b = len(name)
+        name_mask = self._mask(name)
+
+        bounded: List[Tuple[float, str]] = []
+        for len_a, bucket in self._by_len.items():
+            total = len_a + len_b
+            # difflib.real_quick_ratio
+            if 2.0 * min(len_a, len_b) / total < cutoff:
+                continue
+            for cand, mask in bucket:
+                # difflib.quick_ratio: size of the shared character multiset
+                bound = 2.0 * (name_mask & mask).bit_count() / total
+                if bound >= cutoff:
+                    bounded.append((bound, cand))
+        bounded.sort(reverse=True)
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(name)
+        best_score, best_cand = -1.0, None
+        for bound, cand in bounded:
+            if best_cand is not None and bound < best_score:
+                break
+            matcher.set_seq1(cand)
+            score = matcher.ratio()
+            if score >= cutoff and (best_cand is None or (score, cand) > (best_score, best_cand)):
+                best_score, best_cand = score, cand
+        return best_cand
+
+
+class CanonTable:  # pylint: disable=too-few-public-methods
+    """Canonical names with a case-folded exact lookup and a fuzzy index."""
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+        self.lookup: Dict[str, str] = {}
+        for name in names:
+            self.lookup.setdefault(name.casefold(), name)
+        self.index = FuzzyIndex(names)
+
+    def exact(self, name: str) -> str | None:
+        """Return the canonical spelling of ``name`` ignoring case, or None."""
+        return self.lookup.get(name.casefold())
+
+
+_CANON_LOCK = threading.Lock()
+
+
+def _load_canon() -> Dict[str, Any]:
+    """(Re)read the canonical files and swap in freshly built tables."""
+    global CANON_UNIS, CANON_PROGS, UNI_TABLE, PROG_TABLE, CANON_VERSION  # pylint: disable=global-statement
+    unis = _read_lines(CANON_UNIS_PATH)
+    progs = _read_lines(CANON_PROGS_PATH)
+    uni_table, prog_table = CanonTable(unis), CanonTable(progs)
+    digest = hashlib.sha1("\n".join(unis + ["\0"] + progs).encode("utf-8"))
+    with _CANON_LOCK:
+        CANON_UNIS, CANON_PROGS = unis, progs
+        UNI_TABLE, PROG_TABLE = uni_table, prog_table
+        CANON_VERSION = digest.hexdigest()[:12]
+    return {"universities": len(unis), "programs": len(progs), "version": CANON_VERSION}
+
+
+CANON_UNIS: List[str] = []
+CANON_PROGS: List[str] = []
+UNI_TABLE = CanonTable([])
+PROG_TABLE = CanonTable([])
+CANON_VERSION = ""
+_load_canon()
+
+
+def _best_match(name: str, index: FuzzyIndex, cutoff: float = 0.86) -> str | None:
+    """Fuzzy match against a prebuilt canonical index (difflib-equivalent)."""
+    return index.best(name, cutoff)
 
 
 def _post_normalize_program(prog: str) -> str:
@@ -175,9 +418,11 @@ def _post_normalize_program(prog: str) -> str:
     p = (prog or "").strip()
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
-    if p in CANON_PROGS:
-        return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    table = PROG_TABLE
+    exact = table.exact(p)
+    if exact:
+        return exact
+    match = _best_match(p, table.index, cutoff=0.84)
     return match or p
 
 
@@ -186,55 +431,93 @@ def _post_normalize_university(uni: str) -> str:
     u = (uni or "").strip()
 
     # Abbreviations
-    for pat, full in ABBREV_UNI.items():
-        if re.fullmatch(pat, u):
-            u = full
-            break
+    abbrev = ABBREV_UNI_RE.fullmatch(u)
+    if abbrev:
+        u = ABBREV_UNI_FULL[abbrev.lastindex - 1]
 
     # Common spelling fixes
     u = COMMON_UNI_FIXES.get(u, u)
 
     # Normalize 'Of' → 'of'
     if u:
-        u = re.sub(r"\bOf\b", "of", u.title())
+        u = OF_RE.sub("of", u.title())
 
     # Canonical or fuzzy map
-    if u in CANON_UNIS:
-        return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    table = UNI_TABLE
+    exact = table.exact(u)
+    if exact:
+        return exact
+    match = _best_match(u, table.index, cutoff=0.86)
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
+# ---------------- Rule-based fast path ----------------
+# Where each row's answer came from: rules, the result cache, or the model
+ROUTE_STATS: Dict[str, int] = {"rules": 0, "cache": 0, "model": 0}
+_ROUTE_LOCK = threading.Lock()
+
+
+def _count_route(route: str, n: int = 1) -> None:
+    with _ROUTE_LOCK:
+        ROUTE_STATS[route] += n
+
+
+def _fast_path_rate(routes: Dict[str, int]) -> float:
+    """Share of all rows (every route, cache hits included) resolved by rules."""
+    total = sum(routes.get(route, 0) for route in ("rules", "cache", "model"))
+    return (routes.get("rules", 0) / total) if total else 0.0
+
+
+def _rule_classify(program_text: str) -> Dict[str, str] | None:
+    """Resolve a clean "Program, University" string without the model.
+
+    Only strings that split into exactly two parts, both of which are already
+    canonical (ignoring case, after the fallback's abbreviation expansion),
+    are accepted; anything else returns None and goes to the model.
+    """
+    s = SPACES_RE.sub(" ", program_text or "").strip().strip(",")
+    if sum(1 for part in SPLIT_RE.split(s) if part.strip()) != 2:
+        return None
+    prog, uni = _split_fallback(s)
+    abbrev = ABBREV_UNI_RE.fullmatch(uni)
+    if abbrev:
+        uni = ABBREV_UNI_FULL[abbrev.lastindex - 1]
+    canon_prog = PROG_TABLE.exact(prog)
+    canon_uni = UNI_TABLE.exact(uni) if canon_prog else None
+    if not canon_uni:
+        return None
+    return {"standardized_program": canon_prog, "standardized_university": canon_uni}
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    for x_in, x_out in FEW_SHOTS:
-        messages.append(
-            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
-        )
-        messages.append(
-            {
-                "role": "assistant",
-                "content": json.dumps(x_out, ensure_ascii=False),
-            }
-        )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
-    )
 
+def _chat(messages: List[Dict[str, str]], max_tokens: int) -> str:
+    """Run one deterministic chat completion and return the reply text."""
+    llm = _load_llm()
     out = llm.create_chat_completion(
         messages=messages,
         temperature=0.0,
-        max_tokens=128,
+        max_tokens=max_tokens,
         top_p=1.0,
     )
+    return (out["choices"][0]["message"]["content"] or "").strip()
+
+
+def _finalize(std_prog: str, std_uni: str) -> Dict[str, str]:
+    """Apply post-normalization to raw model (or fallback) output."""
+    return {
+        "standardized_program": _post_normalize_program(std_prog),
+        "standardized_university": _post_normalize_university(std_uni),
+    }
+
 
-    text = (out["choices"][0]["message"]["content"] or "").strip()
+def _call_llm(program_text: str) -> Dict[str, str]:
+    """Query the tiny LLM and return standardized fields."""
+    messages = PREFIX_MESSAGES + [
+        {
+            "role": "user",
+            "content": json.dumps({"program": program_text}, ensure_ascii=False),
+        }
+    ]
+    text = _chat(messages, max_tokens=128)
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
@@ -243,21 +526,147 @@ def _call_llm(program_text: str) -> Dict[str, str]:
     except Exception:
         std_prog, std_uni = _split_fallback(program_text)
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
-    return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
-    }
+    return _finalize(std_prog, std_uni)
 
 
-def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
-    """Accept either a list of rows or {'rows': [...]}."""
-    if isinstance(payload, list):
-        return payload
-    if isinstance(payload, dict) and isinstance(payload.get("rows"), list):
-        return payload["rows"]
-    return []
+def _call_llm_batch(program_texts: List[str]) -> List[Dict[str, str]]:
+    """Standardize several program strings with one completion.
+
+    The model is asked for a JSON array in input order. If the reply does not
+    parse into exactly one object per input, every row is redone with
+    :func:`_call_llm`.
+    """
+    if len(program_texts) <= 1:
+        return [_call_llm(text) for text in program_texts]
+
+    messages = BATCH_PREFIX_MESSAGES + [
+        {
+            "role": "user",
+            "content": json.dumps(
+                [{"program": text} for text in program_texts], ensure_ascii=False
+            ),
+        }
+    ]
+    text = _chat(messages, max_tokens=48 * len(program_texts) + 16)
+    try:
+        match = JSON_ARR_RE.search(text)
+        items = json.loads(match.group(0) if match else text)
+        if not isinstance(items, list) or len(items) != len(program_texts):
+            raise ValueError("batched reply does not match input length")
+        pairs = [
+            (
+                str(item["standardized_program"]).strip(),
+                str(item["standardized_university"]).strip(),
+            )
+            for item in items
+        ]
+    except (ValueError, TypeError, KeyError):
+        return [_call_llm(text) for text in program_texts]
+
+    return [_finalize(std_prog, std_uni) for std_prog, std_uni in pairs]
+
+
+# Result caches by namespace (model file + canonical-list version)
+_CACHES: Dict[str, ResultCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def _get_cache() -> ResultCache:
+    """Open the result cache for the current model and canonical lists on first use."""
+    namespace = f"{MODEL_FILE}:{CANON_VERSION}"
+    with _CACHES_LOCK:
+        cache = _CACHES.get(namespace)
+        if cache is None:
+            cache = _CACHES[namespace] = ResultCache(
+                CACHE_PATH or None,
+                memory_size=CACHE_MEMORY_SIZE,
+                max_rows=CACHE_MAX_ROWS,
+                namespace=namespace,
+            )
+        return cache
+
+
+_QUEUE: InferenceQueue | None = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def _get_queue() -> InferenceQueue:
+    """Start the process-wide inference worker on first use."""
+    global _QUEUE  # pylint: disable=global-statement
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = InferenceQueue(
+                _call_llm_batch,
+                max_batch=QUEUE_MAX_BATCH,
+                max_wait=QUEUE_MAX_WAIT_MS / 1000.0,
+            )
+        return _QUEUE
+
+
+def _standardize_texts(
+    texts: List[str],
+    infer: Callable[[List[str]], List[Dict[str, str]]] | None = None,
+) -> List[Dict[str, str]]:
+    """Standardize program strings via the rule fast path, then the result cache.
+
+    Only distinct cache misses reach the model, through ``infer`` (default
+    :func:`_call_llm_batch`); their results are stored.
+    """
+    cache = _get_cache()
+    results: List[Dict[str, str] | None] = []
+    for text in texts:
+        result = _rule_classify(text)
+        if result is not None:
+            _count_route("rules")
+        else:
+            result = cache.get(text)
+            if result is not None:
+                _count_route("cache")
+        results.append(result)
+    pending: Dict[str, List[int]] = {}
+    for index, result in enumerate(results):
+        if result is None:
+            pending.setdefault(cache_key(texts[index]), []).append(index)
+
+    if pending:
+        _count_route("model", sum(len(indexes) for indexes in pending.values()))
+        originals = [texts[indexes[0]] for indexes in pending.values()]
+        for indexes, original, result in zip(
+            pending.values(), originals, (infer or _call_llm_batch)(originals)
+        ):
+            cache.put(original, result)
+            for index in indexes:
+                results[index] = dict(result)
+    return [result for result in results if result is not None]
+
+
+def _standardize_rows(
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = BATCH_SIZE,
+    infer: Callable[[List[str]], List[Dict[str, str]]] | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield rows with the two LLM fields added, ``batch_size`` rows per prompt.
+
+    When ``infer`` is given (the server's inference queue), ``batch_size`` is
+    the number of rows submitted at a time and the queue decides prompt size.
+    """
+    batch_size = max(1, batch_size)
+    chunk: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        texts = [(row or {}).get("program") or "" for row in chunk]
+        for row, result in zip(chunk, _standardize_texts(texts, infer=infer)):
+            row["llm-generated-program"] = result["standardized_program"]
+            row["llm-generated-university"] = result["standardized_university"]
+            yield row
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            yield from flush()
+    if chunk:
+        yield from flush()
 
 
 @app.get("/")
@@ -266,65 +675,218 @@ def health() -> Any:
     return jsonify({"ok": True})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    """Readiness check: 503 while a preload runs or after it failed, else 200.
+
+    Without ``--preload`` the model loads on the first /standardize call, so
+    the server reports ready (with ``loaded`` false) to let that call through.
+    """
+    loaded = _LLM is not None
+    body = {
+        "ready": loaded or not (_STARTUP["preloading"] or _STARTUP["error"]),
+        "loaded": loaded,
+        "model": MODEL_FILE,
+        "offline": OFFLINE,
+        **_STARTUP,
+    }
+    return jsonify(body), (200 if body["ready"] else 503)
+
+
+@app.get("/stats")
+def stats() -> Any:
+    """Rules/cache/model routing counters and result-cache hit rate."""
+    with _ROUTE_LOCK:
+        routes: Dict[str, Any] = dict(ROUTE_STATS)
+    routes["fast_path_rate"] = _fast_path_rate(routes)
+    return jsonify(
+        {"routes": routes, "cache": _get_cache().stats(), "queue": _get_queue().stats()}
+    )
+
+
+@app.post("/reload-canon")
+def reload_canon() -> Any:
+    """Re-read the canonical university/program files without a restart."""
+    info = _load_canon()
+    # Cached results were normalized against the old lists.
+    with _CACHES_LOCK:
+        _CACHES.clear()
+    return jsonify({"ok": True, **info})
+
+
 @app.post("/standardize")
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """Standardize rows from an HTTP request and return JSON.
+
+    With ``Accept: application/x-ndjson`` the response is streamed instead:
+    one JSON row per line, each sent as soon as its batch is done. The request
+    body is still parsed whole; only serialization of the reply is streamed.
+    """
     payload = request.get_json(force=True, silent=True)
-    rows = _normalize_input(payload)
+    rows = normalize_input(payload)
+    batch_size = request.args.get(
+        "batch_size", default=max(BATCH_SIZE, QUEUE_MAX_BATCH), type=int
+    )
+    results = _standardize_rows(rows, batch_size=batch_size, infer=_get_queue().submit)
+
+    accept = request.accept_mimetypes.best_match([JSON_MIMETYPE, NDJSON_MIMETYPE])
+    if accept == NDJSON_MIMETYPE:
+        lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in results)
+        return Response(stream_with_context(lines), mimetype=NDJSON_MIMETYPE)
+
+    return jsonify({"rows": list(results)})
+
+
+# ---------------- CLI worker processes ----------------
+def _init_worker(n_threads: int) -> None:
+    """Give each pool process its own model with a share of the CPU threads."""
+    global N_THREADS  # pylint: disable=global-statement
+    N_THREADS = n_threads
+
+
+def _run_counts() -> Dict[str, int]:
+    """Snapshot this process's cache and routing counters."""
+    cache = _get_cache()
+    with _ROUTE_LOCK:
+        return {"hits": cache.hits, "misses": cache.misses, **ROUTE_STATS}
+
+
+def _worker_standardize(
+    rows: List[Dict[str, Any]],
+    batch_size: int,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Standardize one shard inside a worker; also return counter deltas."""
+    before = _run_counts()
+    out = list(_standardize_rows(rows, batch_size=batch_size))
+    _get_cache().flush()
+    after = _run_counts()
+    return out, {key: after[key] - before[key] for key in after}
+
+
+def _standardize_parallel(
+    rows: Iterable[Dict[str, Any]],
+    workers: int,
+    batch_size: int,
+    counts: Dict[str, int],
+) -> Iterator[Dict[str, Any]]:
+    """Shard rows across ``workers`` processes and yield results in input order.
+
+    Each process loads its own model with ``N_THREADS // workers`` threads.
+    At most ``2 * workers`` shards are in flight, so memory stays bounded and
+    the output is always a prefix of the input.
+    """
+    threads = max(1, N_THREADS // workers)
+    chunk_size = max(1, batch_size) * 4
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(threads,),
+    )
+    pending: deque = deque()
 
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
-        out.append(row)
+    def collect() -> List[Dict[str, Any]]:
+        out, deltas = pending.popleft().result()
+        for key, value in deltas.items():
+            counts[key] = counts.get(key, 0) + value
+        return out
 
-    return jsonify({"rows": out})
+    try:
+        for chunk in chunked(rows, chunk_size):
+            pending.append(pool.submit(_worker_standardize, chunk, batch_size))
+            if len(pending) >= 2 * workers:
+                yield from collect()
+        while pending:
+            yield from collect()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
-def _cli_process_file(
+def _cli_process_file(  # pylint: disable=too-many-arguments,too-many-locals
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    batch_size: int = BATCH_SIZE,
+    workers: int = 1,
+    resume: bool = False,
+    checkpoint_every: int = CHECKPOINT_EVERY,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    """Process a JSON or JSONL file and write JSONL incrementally.
+
+    With ``resume``, rows already present in the output file (matched by
+    ``url``, else by position) are skipped and new rows are appended.
+    """
+    rows: Iterable[Dict[str, Any]] = iter_input_rows(in_path)
+    skipped = [0]
 
     sink = sys.stdout if to_stdout else None
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
-        mode = "a" if append else "w"
+        if resume:
+            rows = skip_done(rows, scan_resume(out_path), skipped)
+        mode = "a" if append or resume else "w"
         sink = open(out_path, mode, encoding="utf-8")
 
     assert sink is not None  # for type-checkers
 
-    try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
+    counts: Dict[str, int] = {}
+    if workers > 1:
+        results = _standardize_parallel(rows, workers, batch_size, counts)
+    else:
+        results = _standardize_rows(rows, batch_size=batch_size)
 
+    written = 0
+    durable = sink is not sys.stdout and checkpoint_every > 0
+    started = time.perf_counter()
+    try:
+        for row in results:
             json.dump(row, sink, ensure_ascii=False)
             sink.write("\n")
             sink.flush()
+            written += 1
+            if durable and written % checkpoint_every == 0:
+                os.fsync(sink.fileno())
     finally:
         if sink is not sys.stdout:
+            sink.flush()
+            os.fsync(sink.fileno())
             sink.close()
+    elapsed = time.perf_counter() - started
+
+    if workers <= 1:
+        _get_cache().flush()
+        counts = _run_counts()
+    lookups = counts.get("hits", 0) + counts.get("misses", 0)
+    print(
+        f"cache: {counts.get('hits', 0)} hits, {counts.get('misses', 0)} misses "
+        f"({(counts.get('hits', 0) / lookups) if lookups else 0.0:.1%} hit rate)",
+        file=sys.stderr,
+    )
+    print(
+        f"routing: {counts.get('rules', 0)} rows by rules, "
+        f"{counts.get('cache', 0)} from the cache, "
+        f"{counts.get('model', 0)} by the model "
+        f"({_fast_path_rate(counts):.1%} fast path)",
+        file=sys.stderr,
+    )
+    if resume:
+        print(f"resume: skipped {skipped[0]} rows already in output", file=sys.stderr)
+    print(
+        f"rows: {written} in {elapsed:.1f}s "
+        f"({(written / elapsed) if elapsed else 0.0:.2f} rows/sec, "
+        f"{max(1, workers)} worker(s))",
+        file=sys.stderr,
+    )
 
 
-if __name__ == "__main__":
-    import argparse
-
+def main(argv: List[str] | None = None) -> None:
+    """Run the HTTP server, or standardize ``--file`` from the command line."""
     parser = argparse.ArgumentParser(
         description="Standardize program/university with a tiny local LLM.",
     )
     parser.add_argument(
         "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
+        help="Path to JSON input (list of rows, {'rows': [...]}, or JSON Lines)",
         default=None,
     )
     parser.add_argument(
@@ -332,6 +894,12 @@ if __name__ == "__main__":
         action="store_true",
         help="Run the HTTP server instead of CLI.",
     )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        default=PRELOAD,
+        help="Load and warm up the model at startup; /ready turns 200 when done.",
+    )
     parser.add_argument(
         "--out",
         default=None,
@@ -343,23 +911,63 @@ if __name__ == "__main__":
         action="store_true",
         help="Append to the output file instead of overwriting.",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip rows already in the output file (--out, default <input>.jsonl; "
+        "matched by url, else position) and append the rest.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY,
+        help="fsync the output file every N rows (0 = only at the end).",
+    )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="Rows packed into one prompt (falls back per row on bad JSON).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes, each with its own model and N_THREADS/N threads. "
+        "Output stays in input order.",
+    )
+    args = parser.parse_args(argv)
+    if args.resume and (args.stdout or args.serve or args.file is None):
+        parser.error("--resume needs --file and an output file; it cannot be used "
+                     "with --stdout or --serve")
 
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
+        if args.preload:
+            _start_preload()
         app.run(host="0.0.0.0", port=port, debug=False)
     else:
         # Default to stdout when a file is provided and no output is specified,
         # so `python app.py --file input.json > out.json` works as expected.
-        to_stdout = bool(args.stdout) or (args.out is None and not args.append)
+        stdout_mode = bool(args.stdout) or (
+            args.out is None and not args.append and not args.resume
+        )
         _cli_process_file(
             in_path=args.file,
             out_path=args.out,
             append=bool(args.append),
-            to_stdout=to_stdout,
+            to_stdout=stdout_mode,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            resume=bool(args.resume),
+            checkpoint_every=args.checkpoint_every,
         )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark: FuzzyIndex vs difflib.get_close_matches on the canon lists.
+
+Generates misspelled variants of canonical names, checks both matchers agree
+on every query, and prints per-query timings.
+
+    python bench_fuzzy.py --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import time
+from typing import Callable, List
+
+from app import CANON_PROGS, CANON_UNIS, FuzzyIndex
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz "
+
+
+def perturb(text: str, rng: random.Random) -> str:
+    """Apply up to four random character edits."""
+    chars = list(text)
+    for _ in range(rng.randint(0, 4)):
+        if not chars:
+            break
+        pos = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[pos] = rng.choice(ALPHABET)
+        elif op < 0.7:
+            del chars[pos]
+        else:
+            chars.insert(pos, rng.choice(ALPHABET))
+    return "".join(chars)
+
+
+def timed(fn: Callable[[str], str | None], queries: List[str]) -> tuple[float, list]:
+    """Return (seconds per query, results)."""
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main() -> None:
+    """Run the comparison for universities and programs."""
+    parser = argparse.ArgumentParser(description="FuzzyIndex vs difflib")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for label, candidates, cutoff in (
+        ("universities", CANON_UNIS, 0.86),
+        ("programs", CANON_PROGS, 0.84),
+    ):
+        queries = [perturb(rng.choice(candidates), rng) for _ in range(args.queries)]
+
+        def via_difflib(q: str) -> str | None:
+            matches = difflib.get_close_matches(q, candidates, n=1, cutoff=cutoff)
+            return matches[0] if matches else None
+
+        start = time.perf_counter()
+        index = FuzzyIndex(candidates)
+        build = time.perf_counter() - start
+
+        base, expected = timed(via_difflib, queries)
+        fast, got = timed(lambda q: index.best(q, cutoff), queries)
+        mismatches = sum(1 for a, b in zip(expected, got) if a != b)
+        print(
+            f"{label:>12} ({len(candidates)} canon): difflib {base * 1e3:.3f} ms/query, "
+            f"index {fast * 1e3:.3f} ms/query ({base / fast:.1f}x), "
+            f"build {build * 1e3:.1f} ms, mismatches {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Streaming input and resumable output helpers for the standardizer CLI."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+NUMBER_START = frozenset("-0123456789")
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def normalize_input(payload: Any) -> List[Dict[str, Any]]:
+    """Accept either a list of rows or {'rows': [...]}."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict) and isinstance(payload.get("rows"), list):
+        return payload["rows"]
+    return []
+
+
+def iter_json_array(
+    f: Any,
+    first: str = "",
+    chunk_size: int = 1 << 16,
+) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading it whole.
+
+    ``first`` is text already read from ``f`` (starting at the ``[``). Only the
+    current element and one read chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = first
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buf += data
+        return not eof
+
+    def skip_ws(pos: int) -> int:
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or not fill():
+                return pos
+
+    pos = skip_ws(0)
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("expected a JSON array")
+    pos = skip_ws(pos + 1)
+    if pos < len(buf) and buf[pos] == "]":
+        return
+    while True:
+        # Any prefix of a number is itself a valid number ("84743." parses as
+        # 84743), so only decode one once a delimiter or EOF follows it
+        if pos < len(buf) and buf[pos] in NUMBER_START:
+            tail = pos
+            while tail < len(buf) and buf[tail] in NUMBER_CHARS:
+                tail += 1
+            if tail == len(buf) and not eof and fill():
+                continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        yield item
+        if end >= chunk_size:
+            buf, end = buf[end:], 0
+        pos = skip_ws(end)
+        if pos >= len(buf):
+            raise ValueError("unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        if buf[pos] != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {buf[pos]!r}")
+        pos = skip_ws(pos + 1)
+
+
+def iter_input_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a JSON array, JSON Lines, or a ``{"rows": [...]}`` file.
+
+    Arrays and JSON Lines are read incrementally, so the first row is
+    standardized before the rest of the file has been parsed.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == "[":
+            yield from iter_json_array(f, first=head)
+            return
+        rest = head + f.readline()
+        try:
+            first = json.loads(rest)
+        except json.JSONDecodeError:
+            # Pretty-printed {"rows": [...]} wrapper: no streaming possible
+            yield from normalize_input(json.loads(rest + f.read()))
+            return
+        if isinstance(first, dict) and isinstance(first.get("rows"), list):
+            yield from first["rows"]
+            return
+        yield first
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def row_key(row: Any, index: int) -> Tuple[str, Any]:
+    """Identify a row by its ``url`` when present, else by input position."""
+    url = row.get("url") if isinstance(row, dict) else None
+    return ("url", url) if url else ("index", index)
+
+
+def scan_resume(out_path: str) -> set:
+    """Collect keys of rows already written to ``out_path``.
+
+    Blank lines are ignored. A torn last line from a crash mid-write is
+    truncated away so appended output stays valid JSON Lines; an invalid line
+    anywhere else raises ValueError and leaves the file untouched.
+    """
+    done: set = set()
+    if not os.path.exists(out_path):
+        return done
+    good = 0
+    index = 0
+    with open(out_path, "rb+") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                good += len(line)
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            if row is None or not line.endswith(b"\n"):
+                if f.read(1):
+                    raise ValueError(
+                        f"{out_path}: line {number} is not valid JSON; not resuming"
+                    )
+                break
+            done.add(row_key(row, index))
+            index += 1
+            good += len(line)
+        f.truncate(good)
+    return done
+
+
+def skip_done(
+    rows: Iterable[Dict[str, Any]],
+    done: set,
+    skipped: List[int],
+) -> Iterator[Dict[str, Any]]:
+    """Drop rows whose key is in ``done``; count them in ``skipped[0]``."""
+    for index, row in enumerate(rows):
+        if row_key(row, index) in done:
+            skipped[0] += 1
+            continue
+        yield row
+
+
+def chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group rows into lists of at most ``size``."""
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Single-worker micro-batching queue in front of a model call."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+InferFn = Callable[[List[str]], List[Dict[str, str]]]
+
+# Queued by close(); tells the worker to exit once earlier rows are answered
+_STOP = object()
+
+
+class InferenceQueue:  # pylint: disable=too-many-instance-attributes
+    """Serialize model calls on one worker thread, micro-batching across callers.
+
+    A ``Llama`` object is not safe for concurrent use, so HTTP request threads
+    enqueue their rows here instead of calling the model. The worker takes the
+    first waiting row, keeps collecting until ``max_batch`` rows or
+    ``max_wait`` seconds, and answers them with one ``infer`` call. If
+    ``infer`` raises, every caller in that batch gets the exception.
+    """
+
+    def __init__(
+        self,
+        infer: InferFn,
+        max_batch: int = 1,
+        max_wait: float = 0.01,
+        history: int = 1000,
+    ) -> None:
+        self.infer = infer
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: "queue.Queue[Tuple[str, Future, float]]" = queue.Queue()
+        self._latencies: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._counts = {"rows": 0, "batches": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="inference", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> List[Dict[str, str]]:
+        """Enqueue ``texts`` and block until every result is ready."""
+        now = time.perf_counter()
+        futures: List[Future] = []
+        with self._lock:
+            # Checked under the lock so no row can land behind the stop marker
+            if self._closed:
+                raise RuntimeError("inference queue is closed")
+            for text in texts:
+                future: Future = Future()
+                self._queue.put((text, future, now))
+                futures.append(future)
+        return [future.result() for future in futures]
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop accepting rows, answer the ones already queued, and stop the worker."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self) -> Tuple[List[Tuple[str, Future, float]], bool]:
+        # Returns the batch and whether the stop marker was reached
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+            try:
+                results = self.infer([text for text, _, _ in batch])
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                # Every waiter in the batch gets the error instead of hanging
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+                continue
+            done = time.perf_counter()
+            with self._lock:
+                self._counts["rows"] += len(batch)
+                self._counts["batches"] += 1
+                self._latencies.extend(done - queued for _, _, queued in batch)
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, batch sizes and recent per-row latency percentiles (ms)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+
+        def pct(q: float) -> float | None:
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(q * len(latencies)))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            "depth": self._queue.qsize(),
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            **counts,
+            "mean_batch": (counts["rows"] / counts["batches"]) if counts["batches"] else 0.0,
+            "latency_ms": {"p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99)},
+        }
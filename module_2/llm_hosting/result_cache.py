@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Memoized standardizer results: in-memory LRU in front of a SQLite file."""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+SPACES_RE = re.compile(r"\s+")
+
+
+def cache_key(program_text: str) -> str:
+    """Normalize program text so trivial spacing/case variants share an entry."""
+    return SPACES_RE.sub(" ", program_text or "").strip().casefold()
+
+
+class ResultCache:  # pylint: disable=too-many-instance-attributes
+    """Memoize standardized results: in-memory LRU in front of a SQLite file.
+
+    Entries are namespaced (the server uses model file and canonical-list
+    version) so switching models or reloading the lists never serves stale
+    answers. The disk table is trimmed to ``max_rows`` by evicting the least
+    recently used tenth when it overflows; the row count is tracked in memory
+    and only recounted when it crosses ``max_rows``. Disk-hit access times are
+    buffered and written with the next insert, eviction or ``flush``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str | None,
+        memory_size: int = 4096,
+        max_rows: int = 200000,
+        namespace: str = "",
+        touch_batch: int = 256,
+    ) -> None:
+        self.memory_size = max(0, memory_size)
+        self.max_rows = max(1, max_rows)
+        self.namespace = namespace
+        self.touch_batch = max(1, touch_batch)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._touched: Dict[str, int] = {}
+        self._tick = 0
+        self._rows = 0
+        self._db: sqlite3.Connection | None = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # CLI worker processes share the file; wait on their write locks
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " ns TEXT, key TEXT, program TEXT, university TEXT, used INTEGER,"
+                " PRIMARY KEY (ns, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+            row = self._db.execute(
+                "SELECT COALESCE(MAX(used), 0), COUNT(*) FROM results"
+            ).fetchone()
+            self._tick, self._rows = row
+            self._db.commit()
+
+    def _remember(self, key: str, value: Dict[str, str]) -> None:
+        if not self.memory_size:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _write_touched(self) -> None:
+        # Caller holds the lock and commits
+        if self._touched and self._db is not None:
+            self._db.executemany(
+                "UPDATE results SET used = ? WHERE ns = ? AND key = ?",
+                [(tick, self.namespace, key) for key, tick in self._touched.items()],
+            )
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        # Other processes may share the file, so recount before trimming
+        assert self._db is not None
+        self._rows = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self._rows <= self.max_rows:
+            return
+        excess = self._rows - self.max_rows + self.max_rows // 10
+        self._db.execute(
+            "DELETE FROM results WHERE rowid IN "
+            "(SELECT rowid FROM results ORDER BY used LIMIT ?)",
+            (excess,),
+        )
+        self._rows -= excess
+
+    def get(self, program_text: str) -> Dict[str, str] | None:
+        """Return the cached result for ``program_text``, or None."""
+        key = cache_key(program_text)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT program, university FROM results WHERE ns = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                if row is not None:
+                    self._tick += 1
+                    self._touched[key] = self._tick
+                    if len(self._touched) >= self.touch_batch:
+                        self._write_touched()
+                        self._db.commit()
+                    value = {
+                        "standardized_program": row[0],
+                        "standardized_university": row[1],
+                    }
+                    self._remember(key, value)
+                    self.hits += 1
+                    return dict(value)
+            self.misses += 1
+            return None
+
+    def put(self, program_text: str, value: Dict[str, str]) -> None:
+        """Store a standardized result."""
+        key = cache_key(program_text)
+        with self._lock:
+            self._remember(key, dict(value))
+            if self._db is None:
+                return
+            self._tick += 1
+            self._touched.pop(key, None)
+            params = (
+                value["standardized_program"],
+                value["standardized_university"],
+                self._tick,
+                self.namespace,
+                key,
+            )
+            updated = self._db.execute(
+                "UPDATE results SET program = ?, university = ?, used = ?"
+                " WHERE ns = ? AND key = ?",
+                params,
+            ).rowcount
+            if not updated:
+                self._db.execute(
+                    "INSERT INTO results (program, university, used, ns, key)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    params,
+                )
+                self._rows += 1
+            self._write_touched()
+            if self._rows > self.max_rows:
+                self._evict()
+            self._db.commit()
+
+    def flush(self) -> None:
+        """Write buffered access times to disk."""
+        with self._lock:
+            if self._db is not None:
+                self._write_touched()
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
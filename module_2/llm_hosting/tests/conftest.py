@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import types
+
+import pytest
+
+HOSTING_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if HOSTING_DIR not in sys.path:
+    # Ensure test imports resolve to the llm_hosting modules.
+    sys.path.insert(0, HOSTING_DIR)
+
+# Memory-only result cache and absolute canon paths before app is imported.
+os.environ.setdefault("CACHE_PATH", "")
+os.environ.setdefault("CANON_UNIS_PATH", os.path.join(HOSTING_DIR, "canon_universities.txt"))
+os.environ.setdefault("CANON_PROGS_PATH", os.path.join(HOSTING_DIR, "canon_programs.txt"))
+
+
+def _split_reply(program):
+    # Deterministic stand-in for the model: "Program, University" split.
+    parts = [part.strip() for part in program.split(",")]
+    return {
+        "standardized_program": parts[0],
+        "standardized_university": parts[1] if len(parts) > 1 else "Unknown",
+    }
+
+
+class FakeLlama:
+    # Minimal llama_cpp.Llama replacement; records every prompt it answers.
+    calls = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def set_cache(self, cache):
+        self.cache = cache
+
+    def create_chat_completion(self, messages, **kwargs):
+        FakeLlama.calls.append(messages)
+        last = json.loads(messages[-1]["content"])
+        if isinstance(last, list):
+            reply = [_split_reply(item["program"]) for item in last]
+        else:
+            reply = _split_reply(last["program"])
+        return {"choices": [{"message": {"content": json.dumps(reply)}}]}
+
+
+if "llama_cpp" not in sys.modules:
+    _fake = types.ModuleType("llama_cpp")
+    _fake.Llama = FakeLlama
+    _fake.LlamaRAMCache = lambda capacity_bytes=0: None
+    sys.modules["llama_cpp"] = _fake
+
+
+@pytest.fixture
+def llm_app(monkeypatch):
+    # app module with the model load short-circuited and fresh counters.
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "hf_hub_download", lambda **kwargs: "fake.gguf")
+    monkeypatch.setattr(app_module, "_CACHES", {})
+    monkeypatch.setattr(app_module, "ROUTE_STATS", dict.fromkeys(app_module.ROUTE_STATS, 0))
+    FakeLlama.calls.clear()
+    yield app_module
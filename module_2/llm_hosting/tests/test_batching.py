@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from conftest import FakeLlama
+from inference_queue import InferenceQueue
+
+TEXTS = [f"Underwater Basketry {i}, Atlantis Institute {i}" for i in range(5)]
+
+
+def _prompt_sizes():
+    # Rows per model call: a JSON array for batched prompts, one object otherwise.
+    sizes = []
+    for messages in FakeLlama.calls:
+        last = json.loads(messages[-1]["content"])
+        sizes.append(len(last) if isinstance(last, list) else 1)
+    return sizes
+
+
+def test_well_formed_batch_is_one_completion(llm_app):
+    # Act: five rows in one batched prompt.
+    results = llm_app._call_llm_batch(TEXTS)
+    # Assert: a single call answered every row, in order.
+    assert _prompt_sizes() == [5]
+    assert [r["standardized_program"] for r in results] == [
+        f"Underwater Basketry {i}" for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize(
+    "bad_reply",
+    [
+        "not json at all",
+        json.dumps([{"standardized_program": "X", "standardized_university": "Y"}]),
+        json.dumps([{"program_only": "X"}] * 5),
+    ],
+)
+def test_bad_batched_reply_falls_back_per_row(llm_app, monkeypatch, bad_reply):
+    # Arrange: per-row answers to compare against.
+    expected = [llm_app._call_llm(text) for text in TEXTS]
+    FakeLlama.calls.clear()
+    answer = FakeLlama.create_chat_completion
+
+    def reply(self, messages, **kwargs):
+        if isinstance(json.loads(messages[-1]["content"]), list):
+            FakeLlama.calls.append(messages)
+            return {"choices": [{"message": {"content": bad_reply}}]}
+        return answer(self, messages, **kwargs)
+
+    monkeypatch.setattr(FakeLlama, "create_chat_completion", reply)
+    # Act: the batched reply is malformed, short or missing keys.
+    results = llm_app._call_llm_batch(TEXTS)
+    # Assert: one batched attempt, then one call per row with identical output.
+    assert _prompt_sizes() == [5, 1, 1, 1, 1, 1]
+    assert results == expected
+
+
+@pytest.mark.parametrize("batch_size, sizes", [(2, [2, 2, 1]), (5, [5])])
+def test_batch_size_query_parameter(llm_app, monkeypatch, batch_size, sizes):
+    # Arrange: a queue that can hold a whole request chunk.
+    queue = InferenceQueue(llm_app._call_llm_batch, max_batch=10, max_wait=0.01)
+    monkeypatch.setattr(llm_app, "_QUEUE", queue)
+    rows = [{"program": text} for text in TEXTS]
+    # Act
+    resp = llm_app.app.test_client().post(
+        f"/standardize?batch_size={batch_size}", data=json.dumps(rows)
+    )
+    queue.close()
+    # Assert: rows reach the model in chunks of batch_size, output in order.
+    assert resp.status_code == 200
+    assert _prompt_sizes() == sizes
+    assert [row["program"] for row in resp.get_json()["rows"]] == TEXTS
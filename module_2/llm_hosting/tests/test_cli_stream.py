@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+
+from cli_stream import iter_input_rows, iter_json_array
+
+ARRAY_TEXT = (
+    '[84743.37, 1, -0.5e-3, 12E+2, 0, -7, {"program": "CS, MIT", "gpa": 3.95},'
+    ' "x,]", [1.25, [2e1]], true, null, false, 1e10 , 99999999999999999999]'
+)
+
+
+def _iter(text, chunk_size):
+    # The CLI passes the leading "[" it already read as ``first``.
+    handle = io.StringIO(text)
+    first = handle.read(1)
+    return list(iter_json_array(handle, first=first, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", range(1, len(ARRAY_TEXT) + 2))
+def test_iter_json_array_matches_json_loads(chunk_size):
+    # Act/Assert: every chunk boundary yields the same elements as json.loads.
+    assert _iter(ARRAY_TEXT, chunk_size) == json.loads(ARRAY_TEXT)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[5]", "[-1.5e3 ]", "[1,\n2]"])
+def test_iter_json_array_small_arrays(text, chunk_size):
+    handle = io.StringIO(text)
+    assert list(iter_json_array(handle, chunk_size=chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", '{"rows": []}', "[1,"])
+def test_iter_json_array_rejects_malformed_input(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '[{"program": "a"}, {"program": "b"}]',
+        '{"program": "a"}\n\n{"program": "b"}\n',
+        '{"rows": [{"program": "a"}, {"program": "b"}]}',
+        '{\n  "rows": [\n    {"program": "a"},\n    {"program": "b"}\n  ]\n}',
+    ],
+)
+def test_iter_input_rows_accepts_every_input_shape(tmp_path, content):
+    # Arrange: the same two rows in each supported layout.
+    path = tmp_path / "input.json"
+    path.write_text(content, encoding="utf-8")
+    # Act/Assert: rows come back in order.
+    assert list(iter_input_rows(str(path))) == [{"program": "a"}, {"program": "b"}]
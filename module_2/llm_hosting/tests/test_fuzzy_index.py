@@ -0,0 +1,56 @@
+import difflib
+import random
+
+import pytest
+
+from bench_fuzzy import perturb
+
+
+def _difflib_best(name, candidates, cutoff):
+    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+def _assert_same(index, candidates, queries, cutoff):
+    for query in queries:
+        assert index.best(query, cutoff) == _difflib_best(query, candidates, cutoff), query
+
+
+@pytest.mark.parametrize("cutoff", [0.75, 0.84, 0.86, 0.95])
+def test_matches_difflib_on_perturbed_canonical_names(llm_app, cutoff):
+    # Arrange: seeded misspellings of the shipped canonical lists.
+    rng = random.Random(cutoff)
+    for candidates in (llm_app.CANON_UNIS, llm_app.CANON_PROGS):
+        queries = [perturb(rng.choice(candidates), rng) for _ in range(100)]
+        # Act/Assert
+        _assert_same(llm_app.FuzzyIndex(candidates), candidates, queries, cutoff)
+
+
+def test_exact_ties_break_like_difflib(llm_app):
+    # Arrange: candidates scoring exactly the same against each query.
+    candidates = ["abcx", "abcy", "abcw", "xbca", "Physics", "Physica", "Physicz"]
+    queries = ["abcz", "abc", "Physicq", "Physic"]
+    # Act/Assert: difflib keeps the largest (score, candidate) pair.
+    _assert_same(llm_app.FuzzyIndex(candidates), candidates, queries, 0.6)
+
+
+def test_no_match_returns_none(llm_app):
+    # Arrange
+    candidates = llm_app.CANON_UNIS
+    index = llm_app.FuzzyIndex(candidates)
+    # Act/Assert: nothing clears the cutoff, exactly as difflib.
+    for query in ["zzzzqqqq", "0123456789", "Ü", "x"]:
+        assert index.best(query, 0.86) is None
+        assert _difflib_best(query, candidates, 0.86) is None
+
+
+def test_long_strings_match_difflib(llm_app):
+    # Arrange: long candidates and perturbed long queries.
+    rng = random.Random(7)
+    words = llm_app.CANON_PROGS + llm_app.CANON_UNIS
+    candidates = [" ".join(rng.choice(words) for _ in range(12)) for _ in range(40)]
+    queries = [perturb(perturb(rng.choice(candidates), rng), rng) for _ in range(40)]
+    queries.append(" ".join(rng.choice(words) for _ in range(12)))
+    # Act/Assert
+    for cutoff in (0.5, 0.86):
+        _assert_same(llm_app.FuzzyIndex(candidates), candidates, queries, cutoff)
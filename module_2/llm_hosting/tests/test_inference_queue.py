@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from inference_queue import InferenceQueue
+
+
+class FakeInfer:
+    # Records each batch it is called with; optionally fails or blocks.
+    def __init__(self, fail=None, gate=None):
+        self.batches = []
+        self.fail = fail
+        self.gate = gate
+
+    def __call__(self, texts):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(list(texts))
+        if self.fail is not None:
+            raise self.fail
+        return [{"standardized_program": text.upper()} for text in texts]
+
+
+def _submit_concurrently(q, texts):
+    # One caller thread per text, released together; returns result or error.
+    barrier = threading.Barrier(len(texts))
+    outcomes = {}
+
+    def call(text):
+        barrier.wait()
+        try:
+            outcomes[text] = q.submit([text])
+        except Exception as exc:  # recorded for the assertions
+            outcomes[text] = exc
+
+    threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_batches_are_capped_at_max_batch():
+    # Arrange: generous wait so only the size cap closes a batch.
+    infer = FakeInfer()
+    q = InferenceQueue(infer, max_batch=3, max_wait=0.2)
+    # Act: seven rows in one call.
+    results = q.submit([f"row {i}" for i in range(7)])
+    # Assert: order kept, split 3/3/1.
+    assert results == [{"standardized_program": f"ROW {i}"} for i in range(7)]
+    assert [len(batch) for batch in infer.batches] == [3, 3, 1]
+    q.close()
+
+
+def test_concurrent_callers_share_a_batch():
+    # Arrange: room for every caller in one batch.
+    infer = FakeInfer()
+    q = InferenceQueue(infer, max_batch=4, max_wait=0.5)
+    texts = ["a", "b", "c", "d"]
+    # Act: four threads submit one row each.
+    outcomes = _submit_concurrently(q, texts)
+    # Assert: one model call answered everyone with their own row.
+    assert len(infer.batches) == 1
+    assert sorted(infer.batches[0]) == texts
+    assert outcomes == {text: [{"standardized_program": text.upper()}] for text in texts}
+    q.close()
+
+
+def test_max_wait_closes_a_partial_batch():
+    # Arrange: a batch size that is never reached.
+    infer = FakeInfer()
+    q = InferenceQueue(infer, max_batch=100, max_wait=0.05)
+    # Act: one row, then another after the first batch has gone.
+    start = time.perf_counter()
+    q.submit(["first"])
+    waited = time.perf_counter() - start
+    q.submit(["second"])
+    # Assert: the first row waited out max_wait and was answered alone.
+    assert waited >= 0.05
+    assert infer.batches == [["first"], ["second"]]
+    q.close()
+
+
+def test_infer_error_reaches_every_waiter_in_the_batch():
+    # Arrange: a model call that fails.
+    infer = FakeInfer(fail=ValueError("bad batch"))
+    q = InferenceQueue(infer, max_batch=3, max_wait=0.5)
+    # Act: three callers land in the failing batch.
+    outcomes = _submit_concurrently(q, ["a", "b", "c"])
+    # Assert: each caller got the error rather than hanging.
+    assert len(infer.batches) == 1
+    assert all(isinstance(out, ValueError) for out in outcomes.values())
+    assert q.stats()["batches"] == 0
+    # The worker keeps serving after a failed batch.
+    infer.fail = None
+    assert q.submit(["d"]) == [{"standardized_program": "D"}]
+    q.close()
+
+
+def test_close_answers_queued_rows_then_rejects_new_ones():
+    # Arrange: hold the worker inside its first model call.
+    gate = threading.Event()
+    infer = FakeInfer(gate=gate)
+    q = InferenceQueue(infer, max_batch=1, max_wait=0.0)
+    outcomes = []
+    caller = threading.Thread(target=lambda: outcomes.extend(q.submit(["a", "b"])))
+    caller.start()
+    # "a" is in the model call once only "b" is left waiting.
+    while q.stats()["depth"] != 1:
+        time.sleep(0.001)
+    # Act: close while a row is still queued, then release the model.
+    closer = threading.Thread(target=q.close)
+    closer.start()
+    gate.set()
+    closer.join(5)
+    caller.join(5)
+    # Assert: both rows were answered, the worker exited, new rows are refused.
+    assert outcomes == [{"standardized_program": "A"}, {"standardized_program": "B"}]
+    assert not q._thread.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        q.submit(["c"])
+    q.close()
+
+
+def test_stats_report_batches_and_latency():
+    # Arrange/Act: two batches of two.
+    q = InferenceQueue(FakeInfer(), max_batch=2, max_wait=0.2)
+    q.submit(["a", "b", "c", "d"])
+    stats = q.stats()
+    # Assert: counters and percentiles are filled in.
+    assert (stats["rows"], stats["batches"], stats["mean_batch"]) == (4, 2, 2.0)
+    assert stats["depth"] == 0
+    assert stats["latency_ms"]["p50"] is not None
+    q.close()
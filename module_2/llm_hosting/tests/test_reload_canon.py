@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import FakeLlama
+
+NEW_UNI = "McAtlantis Institute of Marine Basketry"
+TEXT = "Marine Basketry, MCATLANTIS INSTITUTE OF MARINE BASKETRY"
+
+
+@pytest.fixture
+def canon_app(llm_app, monkeypatch, tmp_path):
+    # Restore the canonical tables after a test reloads them from a temp file.
+    for name in ("CANON_UNIS", "CANON_PROGS", "UNI_TABLE", "PROG_TABLE", "CANON_VERSION"):
+        monkeypatch.setattr(llm_app, name, getattr(llm_app, name))
+    path = tmp_path / "canon_universities.txt"
+    path.write_text("\n".join(llm_app.CANON_UNIS + [NEW_UNI]) + "\n", encoding="utf-8")
+    monkeypatch.setattr(llm_app, "CANON_UNIS_PATH", str(path))
+    return llm_app
+
+
+def test_exact_lookup_ignores_case(llm_app):
+    table = llm_app.CanonTable(["McGill University", "MIT"])
+    assert table.exact("MCGILL UNIVERSITY") == "McGill University"
+    assert table.exact("mit") == "MIT"
+    assert table.exact("McGill") is None
+
+
+def test_reload_canon_swaps_tables_and_cache_namespace(canon_app):
+    # Arrange: standardize once against the shipped lists (result is cached).
+    old_version = canon_app.CANON_VERSION
+    before = canon_app._standardize_texts([TEXT])[0]
+    assert before["standardized_university"] != NEW_UNI
+    # Act: reload from the file that adds the new university.
+    resp = canon_app.app.test_client().post("/reload-canon")
+    after = canon_app._standardize_texts([TEXT])[0]
+    # Assert: new version, the entry resolves from differently-cased input,
+    # and the pre-reload cached answer was not served.
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert body["version"] != old_version
+    assert body["universities"] == len(canon_app.CANON_UNIS)
+    assert canon_app._post_normalize_university("mcatlantis institute OF marine basketry") == NEW_UNI
+    assert after["standardized_university"] == NEW_UNI
+    assert canon_app.ROUTE_STATS["cache"] == 0
+    assert canon_app.ROUTE_STATS["model"] == 2
+    assert len(FakeLlama.calls) == 2
@@ -0,0 +1,92 @@
+import sqlite3
+
+from result_cache import ResultCache, cache_key
+
+
+def _value(name):
+    return {"standardized_program": name, "standardized_university": "Uni"}
+
+
+def _disk_keys(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT key FROM results")}
+
+
+def test_cache_key_ignores_spacing_and_case():
+    assert cache_key("  Computer   Science, MIT ") == cache_key("computer science, mit")
+
+
+def test_memory_lru_evicts_least_recently_used():
+    # Arrange: two-entry memory cache, no disk.
+    cache = ResultCache(None, memory_size=2)
+    cache.put("a", _value("A"))
+    cache.put("b", _value("B"))
+    # Act: touch "a", then add a third entry.
+    assert cache.get("a") == _value("A")
+    cache.put("c", _value("C"))
+    # Assert: "b" was the least recently used and is gone.
+    assert cache.get("b") is None
+    assert cache.get("a") == _value("A")
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+
+def test_results_persist_across_instances(tmp_path):
+    # Arrange: write through one instance.
+    path = str(tmp_path / "cache.sqlite3")
+    ResultCache(path, namespace="m:v1").put("Physics, MIT", _value("Physics"))
+    # Act: reopen the file.
+    reopened = ResultCache(path, namespace="m:v1")
+    # Assert: the entry is served from disk; other namespaces do not see it.
+    assert reopened.get("physics,  mit") == _value("Physics")
+    assert ResultCache(path, namespace="m:v2").get("Physics, MIT") is None
+
+
+def test_disk_table_stays_within_max_rows(tmp_path):
+    # Arrange: room for ten rows on disk, memory layer off.
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path, memory_size=0, max_rows=10)
+    # Act: insert far more than fits.
+    for i in range(35):
+        cache.put(f"row {i}", _value(str(i)))
+        assert len(_disk_keys(path)) <= 10
+    # Assert: the newest row survives and a reopened cache counts correctly.
+    assert cache.get("row 34") == _value("34")
+    assert ResultCache(path, max_rows=10)._rows == len(_disk_keys(path))
+
+
+def test_disk_eviction_keeps_recently_read_rows(tmp_path):
+    # Arrange: ten rows on disk; read the oldest one back.
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path, memory_size=0, max_rows=10, touch_batch=100)
+    for i in range(10):
+        cache.put(f"row {i}", _value(str(i)))
+    assert cache.get("row 0") == _value("0")
+    # Act: overflow the table by one.
+    cache.put("row 10", _value("10"))
+    # Assert: the buffered read counted as a use, so "row 1" went first.
+    keys = _disk_keys(path)
+    assert "row 0" in keys
+    assert "row 1" not in keys
+
+
+def test_overwriting_a_key_does_not_grow_the_count(tmp_path):
+    # Arrange/Act: the same key stored twice.
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), memory_size=0)
+    cache.put("Math, UBC", _value("Old"))
+    cache.put("math, ubc", _value("New"))
+    # Assert: one row, latest value.
+    assert cache._rows == 1
+    assert cache.get("Math, UBC") == _value("New")
+
+
+def test_flush_writes_buffered_access_times(tmp_path):
+    # Arrange: a disk hit whose access time is only buffered.
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path, memory_size=0)
+    cache.put("a", _value("A"))
+    cache.get("a")
+    # Act: flush the buffer.
+    cache.flush()
+    # Assert: the stored access time moved past the insert.
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT used FROM results").fetchone()[0] == 2
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from cli_stream import scan_resume, skip_done
+
+ROWS = [
+    {"program": "Computer Science, MIT", "url": "u/1"},
+    {"program": "Physics, Stanford University"},
+    {"program": "Mathematics, UBC", "url": "u/3"},
+    {"program": "Chemistry, Harvard University"},
+    {"program": "Biology, Yale University", "url": "u/5"},
+]
+
+
+def _write_lines(path, lines):
+    path.write_bytes("".join(lines).encode("utf-8"))
+
+
+def _dump(row):
+    return json.dumps(row) + "\n"
+
+
+def test_scan_resume_missing_file(tmp_path):
+    assert scan_resume(str(tmp_path / "nope.jsonl")) == set()
+
+
+def test_scan_resume_truncates_torn_tail(tmp_path):
+    # Arrange: two complete rows, then a half-written third.
+    out = tmp_path / "out.jsonl"
+    _write_lines(out, [_dump(ROWS[0]), _dump(ROWS[1]), _dump(ROWS[2])[:12]])
+    # Act: scan for resume.
+    done = scan_resume(str(out))
+    # Assert: keys by url, else position; the torn line is gone.
+    assert done == {("url", "u/1"), ("index", 1)}
+    assert out.read_text(encoding="utf-8") == _dump(ROWS[0]) + _dump(ROWS[1])
+
+
+def test_scan_resume_drops_complete_json_without_newline(tmp_path):
+    # Arrange: the last row parsed but its newline never made it to disk.
+    out = tmp_path / "out.jsonl"
+    _write_lines(out, [_dump(ROWS[0]), json.dumps(ROWS[2])])
+    # Act/Assert: the unterminated row is redone.
+    assert scan_resume(str(out)) == {("url", "u/1")}
+    assert out.read_text(encoding="utf-8") == _dump(ROWS[0])
+
+
+def test_scan_resume_skips_blank_lines(tmp_path):
+    # Arrange: blank lines between rows and at the end.
+    out = tmp_path / "out.jsonl"
+    _write_lines(out, [_dump(ROWS[0]), "\n", _dump(ROWS[1]), "  \n", _dump(ROWS[3]), "\n"])
+    before = out.read_bytes()
+    # Act: scan for resume.
+    done = scan_resume(str(out))
+    # Assert: positions ignore blank lines and nothing is truncated.
+    assert done == {("url", "u/1"), ("index", 1), ("index", 2)}
+    assert out.read_bytes() == before
+
+
+def test_scan_resume_collapses_duplicate_keys(tmp_path):
+    # Arrange: the same url written twice.
+    out = tmp_path / "out.jsonl"
+    _write_lines(out, [_dump(ROWS[0]), _dump(ROWS[0]), _dump(ROWS[2])])
+    # Act/Assert: one key per url.
+    assert scan_resume(str(out)) == {("url", "u/1"), ("url", "u/3")}
+
+
+def test_scan_resume_refuses_corruption_before_the_end(tmp_path):
+    # Arrange: a broken line followed by valid output.
+    out = tmp_path / "out.jsonl"
+    _write_lines(out, [_dump(ROWS[0]), "{not json\n", _dump(ROWS[2])])
+    before = out.read_bytes()
+    # Act/Assert: no truncation of rows after the bad line.
+    with pytest.raises(ValueError, match="line 2"):
+        scan_resume(str(out))
+    assert out.read_bytes() == before
+
+
+def test_skip_done_counts_skipped_rows():
+    # Arrange: first and third rows already written.
+    skipped = [0]
+    done = {("url", "u/1"), ("url", "u/3"), ("index", 3)}
+    # Act: filter the input.
+    remaining = list(skip_done(ROWS, done, skipped))
+    # Assert: only unseen rows remain, in order.
+    assert remaining == [ROWS[1], ROWS[4]]
+    assert skipped == [3]
+
+
+def test_checkpoint_resume_round_trip(llm_app, tmp_path, monkeypatch):
+    # Arrange: a complete run to compare against, then a crashed partial run.
+    in_path = tmp_path / "in.json"
+    in_path.write_text(json.dumps(ROWS), encoding="utf-8")
+    full = tmp_path / "full.jsonl"
+    llm_app._cli_process_file(str(in_path), str(full), False, False, checkpoint_every=0)
+    expected = full.read_text(encoding="utf-8")
+    lines = expected.splitlines(keepends=True)
+    partial = tmp_path / "partial.jsonl"
+    partial.write_text(lines[0] + lines[1] + lines[2][:10], encoding="utf-8")
+    fsyncs = []
+    monkeypatch.setattr(llm_app.os, "fsync", fsyncs.append)
+    # Act: resume with a checkpoint every two rows.
+    llm_app._cli_process_file(
+        str(in_path), str(partial), False, False, resume=True, checkpoint_every=2
+    )
+    # Assert: identical output; three new rows -> one checkpoint plus the final sync.
+    assert partial.read_text(encoding="utf-8") == expected
+    assert len(fsyncs) == 2
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--file", "in.json", "--stdout", "--resume"],
+        ["--serve", "--resume"],
+        ["--resume"],
+    ],
+)
+def test_resume_requires_an_output_file(llm_app, argv, capsys):
+    # Act/Assert: argparse rejects the combination instead of ignoring --resume.
+    with pytest.raises(SystemExit) as exc:
+        llm_app.main(argv)
+    assert exc.value.code == 2
+    assert "--resume" in capsys.readouterr().err
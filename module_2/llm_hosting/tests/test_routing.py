@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+OLD_ABBREV_UNI = {
+    r"(?i)^mcg(\.|ill)?$": "McGill University",
+    r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
+    r"(?i)^uoft$": "University of Toronto",
+}
+
+
+def _old_expand(uni):
+    # The per-pattern loop ABBREV_UNI_RE replaced.
+    for pat, full in OLD_ABBREV_UNI.items():
+        if re.fullmatch(pat, uni):
+            return full
+    return uni
+
+
+def _new_expand(app_module, uni):
+    match = app_module.ABBREV_UNI_RE.fullmatch(uni)
+    return app_module.ABBREV_UNI_FULL[match.lastindex - 1] if match else uni
+
+
+@pytest.mark.parametrize(
+    "uni",
+    [
+        "McG", "mcg.", "McGill", "MCGILL", "mcgil", "mcg..", "UBC", "u.b.c.", "U.B.C",
+        "ubc.", "UofT", "uoft ", "UOFT", "", "Stanford University", "McGill University",
+        "ubcx", "xubc", "uoft\n",
+    ],
+)
+def test_merged_abbreviation_regex_matches_per_pattern_loop(llm_app, uni):
+    assert _new_expand(llm_app, uni) == _old_expand(uni)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (
+            "Computer Science, Stanford University",
+            ("Computer Science", "Stanford University"),
+        ),
+        ("  computer science ,  stanford university ", ("Computer Science", "Stanford University")),
+        ("Mathematics at UBC", ("Mathematics", "University of British Columbia")),
+        ("Mathematics @ McG", ("Mathematics", "McGill University")),
+    ],
+)
+def test_rule_classify_accepts_canonical_pairs(llm_app, text, expected):
+    result = llm_app._rule_classify(text)
+    assert (result["standardized_program"], result["standardized_university"]) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "Computer Science",
+        "Computer Science, Stanford University, CA",
+        "Compter Sciense, Stanford University",
+        "Computer Science, Stanfrd Univ",
+    ],
+)
+def test_rule_classify_leaves_everything_else_to_the_model(llm_app, text):
+    assert llm_app._rule_classify(text) is None
+
+
+def test_routes_count_every_row(llm_app):
+    # Arrange: one rule row, one model row.
+    texts = ["Computer Science, Stanford University", "Underwater Basketry, Atlantis"]
+    llm_app._standardize_texts(texts)
+    # Act: the model row again, now a cache hit.
+    llm_app._standardize_texts(texts[1:])
+    stats = llm_app.app.test_client().get("/stats").get_json()["routes"]
+    # Assert: cache hits are their own route and count toward the total.
+    assert {key: stats[key] for key in ("rules", "cache", "model")} == {
+        "rules": 1, "cache": 1, "model": 1,
+    }
+    assert stats["fast_path_rate"] == pytest.approx(1 / 3)
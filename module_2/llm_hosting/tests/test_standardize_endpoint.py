@@ -0,0 +1,32 @@
+import json
+
+ROWS = [{"program": f"Field {i}, Example University {i}", "url": f"u/{i}"} for i in range(7)]
+
+
+def _post(client, **headers):
+    return client.post("/standardize?batch_size=2", data=json.dumps(ROWS), headers=headers)
+
+
+def test_default_response_is_a_rows_object(llm_app):
+    # Act: no Accept header.
+    resp = _post(llm_app.app.test_client())
+    # Assert: the usual {"rows": [...]} body, input fields kept, in order.
+    body = resp.get_json()
+    assert resp.mimetype == "application/json"
+    assert list(body) == ["rows"]
+    assert [row["url"] for row in body["rows"]] == [row["url"] for row in ROWS]
+    for row in body["rows"]:
+        assert {"llm-generated-program", "llm-generated-university"} <= set(row)
+
+
+def test_ndjson_response_has_one_line_per_row_in_order(llm_app):
+    # Arrange: the JSON answer to compare against.
+    client = llm_app.app.test_client()
+    expected = _post(client).get_json()["rows"]
+    # Act: same rows, several batches, streamed.
+    resp = _post(client, Accept="application/x-ndjson")
+    lines = resp.get_data(as_text=True).splitlines()
+    # Assert: one JSON object per input row, same order and content.
+    assert resp.mimetype == "application/x-ndjson"
+    assert len(lines) == len(ROWS)
+    assert [json.loads(line) for line in lines] == expected
@@ -0,0 +1,86 @@
+import pytest
+
+from conftest import FakeLlama
+
+
+@pytest.fixture
+def cold_app(llm_app, monkeypatch):
+    # app with no model loaded and fresh startup state.
+    monkeypatch.setattr(llm_app, "_LLM", None)
+    monkeypatch.setattr(
+        llm_app,
+        "_STARTUP",
+        {"preloading": False, "warmed_up": False, "load_seconds": None, "error": None},
+    )
+    return llm_app
+
+
+def _ready(app_module):
+    resp = app_module.app.test_client().get("/ready")
+    return resp.status_code, resp.get_json()
+
+
+def test_lazy_server_is_ready_before_loading(cold_app):
+    # Act/Assert: no preload, so traffic is let through to trigger the load.
+    status, body = _ready(cold_app)
+    assert status == 200
+    assert body["ready"] is True
+    assert body["loaded"] is False
+
+
+def test_not_ready_while_preloading(cold_app):
+    # Arrange: a preload has been started but has not finished.
+    cold_app._STARTUP["preloading"] = True
+    # Act/Assert
+    status, body = _ready(cold_app)
+    assert status == 503
+    assert body["ready"] is False
+
+
+def test_preload_loads_and_warms_up(cold_app):
+    # Act: run the preload synchronously.
+    cold_app._preload()
+    # Assert: the model is published after one warm-up completion.
+    status, body = _ready(cold_app)
+    assert status == 200
+    assert body["loaded"] is True
+    assert body["warmed_up"] is True
+    assert body["preloading"] is False
+    assert len(FakeLlama.calls) == 1
+
+
+def test_failed_preload_reports_error_until_a_load_succeeds(cold_app, monkeypatch):
+    # Arrange: the model file cannot be found.
+    def missing():
+        raise FileNotFoundError("no model")
+
+    monkeypatch.setattr(cold_app, "_model_path", missing)
+    # Act: preload fails.
+    cold_app._preload()
+    # Assert: not ready, with the error reported.
+    status, body = _ready(cold_app)
+    assert status == 503
+    assert body["error"] == "FileNotFoundError: no model"
+    # A later successful load clears the error.
+    monkeypatch.setattr(cold_app, "_model_path", lambda: "fake.gguf")
+    cold_app._load_llm()
+    status, body = _ready(cold_app)
+    assert status == 200
+    assert body["error"] is None
+
+
+def test_offline_model_path_never_contacts_the_hub(llm_app, monkeypatch, tmp_path):
+    # Arrange: offline mode with an empty models directory.
+    def hub(**kwargs):
+        raise AssertionError("Hub contacted in OFFLINE mode")
+
+    monkeypatch.setattr(llm_app, "OFFLINE", True)
+    monkeypatch.setattr(llm_app, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_app, "hf_hub_download", hub)
+    # Act/Assert: a missing file is an error, not a download.
+    with pytest.raises(FileNotFoundError, match="OFFLINE"):
+        llm_app._model_path()
+    # Once the file exists it is used directly.
+    local = tmp_path / llm_app.MODEL_FILE
+    local.write_bytes(b"gguf")
+    assert llm_app._model_path() == str(local)
@@ -0,0 +1,53 @@
+import json
+import re
+
+ROWS = [
+    {"program": "Computer Science, Stanford University", "url": "u/0"},
+    {"program": "Underwater Basketry, Atlantis", "url": "u/1"},
+    {"program": "Marine Knitting, Lemuria College", "url": "u/2"},
+    {"program": "Underwater Basketry, Atlantis", "url": "u/3"},
+    {"program": "Physics, Massachusetts Institute of Technology", "url": "u/4"},
+    {"program": "Sky Weaving, Avalon University", "url": "u/5"},
+    {"program": "Marine Knitting, Lemuria College", "url": "u/6"},
+    {"program": "Dream Cartography, Hyperborea Tech", "url": "u/7"},
+    {"program": "Underwater Basketry, Atlantis", "url": "u/8"},
+    {"program": "Cloud Herding, Shangri-La Institute", "url": "u/9"},
+]
+
+ROUTING_RE = re.compile(r"routing: (\d+) rows by rules, (\d+) from the cache, (\d+) by the model")
+
+
+def _run(app_module, tmp_path, name, **kwargs):
+    in_path = tmp_path / "in.json"
+    in_path.write_text(json.dumps(ROWS), encoding="utf-8")
+    out = tmp_path / name
+    app_module._cli_process_file(str(in_path), str(out), False, False, batch_size=1, **kwargs)
+    return out
+
+
+def test_workers_keep_input_order_and_sum_counters(llm_app, tmp_path, capsys):
+    # Arrange: the single-process output to compare against.
+    expected = _run(llm_app, tmp_path, "one.jsonl").read_text(encoding="utf-8")
+    capsys.readouterr()
+    # Act: the same input over two worker processes (three shards).
+    out = _run(llm_app, tmp_path, "two.jsonl", workers=2)
+    # Assert: identical rows in input order.
+    lines = out.read_text(encoding="utf-8")
+    assert lines == expected
+    assert [json.loads(line)["url"] for line in lines.splitlines()] == [r["url"] for r in ROWS]
+    # Worker counter deltas add up to one route per input row in the parent.
+    rules, cache, model = map(int, ROUTING_RE.search(capsys.readouterr().err).groups())
+    assert rules == 2
+    assert rules + cache + model == len(ROWS)
+
+
+def test_resume_with_workers_neither_drops_nor_duplicates(llm_app, tmp_path):
+    # Arrange: a complete run, then a crashed partial copy with a torn last line.
+    expected = _run(llm_app, tmp_path, "full.jsonl", workers=2).read_text(encoding="utf-8")
+    lines = expected.splitlines(keepends=True)
+    partial = tmp_path / "partial.jsonl"
+    partial.write_text("".join(lines[:3]) + lines[3][:15], encoding="utf-8")
+    # Act: resume the partial output with two workers.
+    _run(llm_app, tmp_path, "partial.jsonl", workers=2, resume=True)
+    # Assert: each row exactly once, in order.
+    assert partial.read_text(encoding="utf-8") == expected
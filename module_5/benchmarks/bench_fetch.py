@@ -0,0 +1,123 @@
+"""Benchmark page transfer and decoding in module_2.scrape against a local server.
+
+Serves a saved survey page from a stub HTTP server on 127.0.0.1 (gzip-encoded
+when the client accepts it) and compares three ways of turning it into
+records:
+
+* ``identity``: plain transfer, whole body read, then ``parse_page``
+  (``fetch`` before compression was negotiated)
+* ``gzip``: compressed transfer via ``fetch``, then ``parse_page``
+* ``gzip stream``: ``fetch_records``, which decodes and parses while reading
+
+Reports bytes on the wire, time and peak traced memory per page.
+
+    python benchmarks/bench_fetch.py --repeat 20
+    python benchmarks/bench_fetch.py --html saved_page.html --parser stream
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# pylint: disable=wrong-import-position
+from module_2 import scrape
+
+DEFAULT_HTML = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "fixtures", "survey_page.html"
+)
+
+
+def start_server(body: bytes) -> Tuple[ThreadingHTTPServer, Dict[str, int]]:
+    """Serve ``body`` at every path; returns the server and a sent-bytes counter."""
+    compressed = gzip.compress(body)
+    sent = {"bytes": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        """Stub survey page handler."""
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Send the page, compressed when accepted."""
+            payload = body
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                payload = compressed
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            sent["bytes"] += len(payload)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Keep the benchmark output quiet."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, sent
+
+
+def measure(func: Callable[[], List], repeat: int, sent: Dict[str, int]) -> Tuple[float, int, int]:
+    """Best-of-``repeat`` ms per call, bytes sent per call and peak traced bytes."""
+    sent["bytes"] = 0
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    wire = sent["bytes"] // repeat
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000, wire, peak
+
+
+def main() -> None:
+    """Compare identity, gzip and streaming fetch paths on a local server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html", default=DEFAULT_HTML, help="saved survey page")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--parser", default="stream", help="backend for the whole-page paths")
+    args = parser.parse_args()
+
+    with open(args.html, encoding="utf-8") as handle:
+        html = handle.read()
+    server, sent = start_server(html.encode("utf-8"))
+    scrape.RESPECT_ROBOTS = False
+    url = f"http://127.0.0.1:{server.server_address[1]}/survey/?page=1&pp=100"
+    identity = {"Accept-Encoding": "identity"}
+
+    def plain() -> List:
+        response = scrape.http.request("GET", url, headers=identity)
+        return scrape.parse_page(response.data.decode("utf-8", errors="ignore"), args.parser)
+
+    paths = {
+        "identity": plain,
+        "gzip": lambda: scrape.parse_page(scrape.fetch(url), args.parser),
+        "gzip stream": lambda: scrape.fetch_records(url),
+    }
+    expected = plain()
+    print(f"{len(expected)} records from {os.path.basename(args.html)}, best of {args.repeat}")
+    try:
+        for name, func in paths.items():
+            if func() != expected:
+                sys.exit(f"{name}: records differ")
+            millis, wire, peak = measure(func, args.repeat, sent)
+            print(f"{name:>12}: {millis:8.2f} ms/page {wire:>9,} B on wire {peak:>11,} B peak")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
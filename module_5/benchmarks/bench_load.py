@@ -0,0 +1,89 @@
+"""Benchmark the executemany and COPY load paths in load_data.
+
+Runs each loader against a throwaway schema so the real ``applicants`` table
+is never touched. Uses the same DB_* / PG* / DATABASE_URL env vars as the app.
+
+    python benchmarks/bench_load.py --rows 30000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import closing
+from typing import Any, Dict, List
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# pylint: disable=wrong-import-position
+from db import connect, get_conninfo
+from load_data import LOADERS, create_table, prepare_rows
+
+BENCH_SCHEMA = "bench_load"
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` raw rows shaped like cleaned scraper output."""
+    statuses = ["Accepted", "Rejected", "Wait listed", "Interview"]
+    return [
+        {
+            "program": f"Computer Science, University {i % 500}",
+            "comments": None,
+            "date_added": "January 1, 2026",
+            "url": f"https://www.thegradcafe.com/result/{i}",
+            "applicant_status": statuses[i % len(statuses)],
+            "semester_year_start": "Fall 2026",
+            "citizenship": "International" if i % 3 else "American",
+            "gpa": "GPA 3.75",
+            "gre": "GRE 320",
+            "gre_v": "160",
+            "gre_aw": "4.5",
+            "masters_or_phd": "PhD" if i % 2 else "Masters",
+            "llm-generated-program": "Computer Science",
+            "llm-generated-university": f"University {i % 500}",
+        }
+        for i in range(count)
+    ]
+
+
+def time_loader(method: str, prepared: List[Dict[str, Any]]) -> float:
+    """Load ``prepared`` into an empty scratch table and return elapsed seconds."""
+    with closing(connect(get_conninfo())) as conn:
+        conn.autocommit = True
+        conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        conn.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        conn.execute(f"SET search_path TO {BENCH_SCHEMA}")
+        try:
+            create_table(conn)
+            started = time.perf_counter()
+            LOADERS[method](conn, prepared)
+            elapsed = time.perf_counter() - started
+            count = conn.execute("SELECT COUNT(*) FROM applicants").fetchone()[0]
+            assert count == len(prepared), (method, count)
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    return elapsed
+
+
+def main() -> None:
+    """Run both loaders and print best-of-N timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    prepared = prepare_rows(make_rows(args.rows))
+    best: Dict[str, float] = {}
+    for method in LOADERS:
+        best[method] = min(time_loader(method, prepared) for _ in range(args.repeat))
+        print(
+            f"{method:>7}: {best[method]:.3f}s "
+            f"({args.rows / best[method]:,.0f} rows/sec)"
+        )
+    print(f"speedup: {best['insert'] / best['copy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
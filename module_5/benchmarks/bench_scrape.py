@@ -0,0 +1,176 @@
+"""Benchmark per-row record extraction in module_2.scrape.
+
+Parses a saved survey page once, then times ``row_to_record`` over every
+detail/metrics row pair against the previous implementation (a ``re.search``
+per field with string patterns, and every cell re-cleaned). Both must produce
+identical records. Finally times ``parse_page`` end to end with each parser
+backend in ``scrape.PARSERS``.
+
+    python benchmarks/bench_scrape.py --repeat 20
+    python benchmarks/bench_scrape.py --html saved_page.html
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# pylint: disable=wrong-import-position
+from module_2 import scrape
+
+DEFAULT_HTML = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "fixtures", "survey_page.html"
+)
+
+
+def legacy_clean(text: Any) -> Optional[str]:
+    """Whitespace normalization as it was before the precompiled pattern."""
+    if text is None:
+        return None
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+
+def legacy_row_to_record(row, metrics_row=None) -> Dict[str, Any]:
+    """The per-field extraction ``row_to_record`` used before the tokenizer."""
+    cols = [legacy_clean(c.get_text(" ", strip=True)) for c in row.find_all("td")]
+    url_tag = row.find("a", href=True)
+    href = url_tag["href"] if url_tag else None
+    url_value = f"{scrape.BASE_URL}{href}" if href and href.startswith("/") else legacy_clean(href)
+
+    metrics_text = None
+    if metrics_row is not None:
+        metrics_cols = [
+            legacy_clean(c.get_text(" ", strip=True)) for c in metrics_row.find_all("td")
+        ]
+        metrics_text = metrics_cols[0] if metrics_cols else None
+
+    gre_text = metrics_text or ""
+    match_v = re.search(r"V\s*(\d{2,3})", gre_text)
+    match_aw = re.search(r"AW\s*([0-6]\.?(?:\d)?)", gre_text)
+    citizenship = term = None
+    if metrics_text:
+        if "American" in metrics_text:
+            citizenship = "American"
+        elif "International" in metrics_text:
+            citizenship = "International"
+        term_match = re.search(r"(Fall|Spring|Summer|Winter)\s+\d{4}", metrics_text)
+        term = term_match.group(0) if term_match else None
+
+    return {
+        "program": cols[1] if len(cols) > 1 else cols[0],
+        "comments": None,
+        "date_added": cols[2] if len(cols) > 2 else None,
+        "url": legacy_clean(url_value),
+        "applicant_status": cols[3] if len(cols) > 3 else None,
+        "semester_year_start": term,
+        "citizenship": citizenship,
+        "gpa": gre_text,
+        "gre": gre_text,
+        "gre_v": match_v.group(1) if match_v else None,
+        "gre_aw": match_aw.group(1) if match_aw else None,
+        "masters_or_phd": None,
+        "llm-generated-program": cols[1] if len(cols) > 1 else cols[0],
+        "llm-generated-university": cols[0],
+    }
+
+
+def row_pairs(html: str) -> List[Tuple[Any, Any]]:
+    """Detail/metrics row pairs exactly as ``parse_page`` walks them."""
+    rows = BeautifulSoup(html, "html.parser").find_all("tr")
+    pairs = []
+    index = 1
+    while index < len(rows):
+        tds = rows[index].find_all("td")
+        if len(tds) < 4 or not tds[0].get_text(strip=True) or not tds[1].get_text(strip=True):
+            index += 1
+            continue
+        pairs.append((rows[index], rows[index + 1] if index + 1 < len(rows) else None))
+        index += 2
+    return pairs
+
+
+def per_call_us(func: Callable, calls: List[Tuple[Any, ...]], repeat: int) -> float:
+    """Best-of-``repeat`` microseconds per ``func(*args)`` call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for args in calls:
+            func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best / len(calls) * 1e6
+
+
+def legacy_metrics(text: str) -> Tuple[Any, ...]:
+    """The old parse_gre_parts + extract_citizenship_and_term pair for one row."""
+    match_v = re.search(r"V\s*(\d{2,3})", text)
+    match_aw = re.search(r"AW\s*([0-6]\.?(?:\d)?)", text)
+    gre = (match_v.group(1) if match_v else None, match_aw.group(1) if match_aw else None)
+    if not text:
+        return gre + (None, None)
+    citizenship = (
+        "American"
+        if "American" in text
+        else ("International" if "International" in text else None)
+    )
+    term_match = re.search(r"(Fall|Spring|Summer|Winter)\s+\d{4}", text)
+    return gre + (citizenship, term_match.group(0) if term_match else None)
+
+
+def main() -> None:
+    """Compare legacy and current per-row extraction on a saved page."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html", default=DEFAULT_HTML, help="saved survey page")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.html, encoding="utf-8") as handle:
+        html = handle.read()
+    pairs = row_pairs(html)
+    if not pairs:
+        sys.exit(f"no survey rows found in {args.html}")
+
+    current = [scrape.row_to_record(row, metrics) for row, metrics in pairs]
+    legacy = [legacy_row_to_record(row, metrics) for row, metrics in pairs]
+    if current != legacy:
+        sys.exit("records differ between legacy and current extraction")
+
+    metric_texts = [(record["gre"],) for record in current]
+    results = {
+        "row_to_record": (
+            per_call_us(legacy_row_to_record, pairs, args.repeat),
+            per_call_us(scrape.row_to_record, pairs, args.repeat),
+        ),
+        "metrics only": (
+            per_call_us(legacy_metrics, metric_texts, args.repeat),
+            per_call_us(scrape.parse_metrics, metric_texts, args.repeat),
+        ),
+    }
+
+    print(f"{len(pairs)} rows from {os.path.basename(args.html)}, best of {args.repeat}")
+    for name, (old, new) in results.items():
+        print(f"{name:>14}: {old:8.2f} us/row -> {new:8.2f} us/row ({old / new:.2f}x)")
+
+    baseline = scrape.parse_page(html, "html.parser")
+    for name in scrape.PARSERS:
+        try:
+            same = scrape.parse_page(html, name) == baseline
+        except FeatureNotFound:
+            print(f"{'parse_page':>14}: {name} backend not installed")
+            continue
+        page_us = per_call_us(scrape.parse_page, [(html, name)], args.repeat)
+        print(
+            f"{'parse_page':>14}: {name:<11} {page_us / len(pairs):8.2f} us/row"
+            f"{'' if same else '  (RECORDS DIFFER)'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
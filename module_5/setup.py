@@ -9,7 +9,7 @@ setup(
     description="Flask + PostgreSQL app for Grad Cafe applicant analytics.",
     package_dir={"": "src"},
     packages=find_packages(where="src"),
-    py_modules=["app", "load_data", "query_data", "db"],
+    py_modules=["app", "load_data", "query_data", "db", "pipeline"],
     include_package_data=True,
     install_requires=[
         "Flask==3.1.3",
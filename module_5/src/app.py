@@ -1,18 +1,21 @@
 """Flask web application for Grad Cafe Analytics."""
 import threading
-from typing import Any, Callable, Dict, Optional
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from flask import Flask, jsonify, render_template
 
 try:
-    from load_data import insert_applicants
+    from load_data import insert_applicants, known_urls
     from module_2.clean import clean_data
-    from module_2.scrape import scrape_data
+    from module_2.scrape import DEFAULT_STOP_AFTER_KNOWN, KnownUrls, iter_scrape, scrape_data
+    from pipeline import StreamingPipeline
     from query_data import get_analysis
 except ImportError:
-    from src.load_data import insert_applicants
+    from src.load_data import insert_applicants, known_urls
     from src.module_2.clean import clean_data
-    from src.module_2.scrape import scrape_data
+    from src.module_2.scrape import DEFAULT_STOP_AFTER_KNOWN, KnownUrls, iter_scrape, scrape_data
+    from src.pipeline import StreamingPipeline
     from src.query_data import get_analysis
 
 
@@ -22,6 +25,9 @@ class PullState:
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self.busy = False
+        # Pages the last pull skipped, and the error that ended it (if any)
+        self.failed_pages: List[Any] = []
+        self.error: Optional[str] = None
 
     def start(self) -> bool:
         """Attempt pull and returns False if already running."""
@@ -29,39 +35,143 @@ class PullState:
             if self.busy:
                 return False
             self.busy = True
+            self.failed_pages = []
+            self.error = None
             return True
 
+    def fail(self, exc: BaseException) -> None:
+        """Record the exception that stopped the pull."""
+        with self._lock:
+            self.error = f"{type(exc).__name__}: {exc}"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Busy flag, skipped pages and error for ``/pull-status``."""
+        with self._lock:
+            return {
+                "busy": self.busy,
+                "failed_pages": [
+                    {"url": page.url, "error": page.error} for page in self.failed_pages
+                ],
+                "error": self.error,
+            }
+
     def end(self) -> None:
         """Mark the pull as finished and release any held lock."""
         with self._lock:
             self.busy = False
 
 
+class AnalysisCache:
+    """TTL cache for analysis results with explicit invalidation.
+
+    ``invalidate`` expires the entry but keeps the last value so it can still
+    be served (stale-while-revalidate) while a pull is rewriting the data.
+    A ``ttl`` of zero or less disables caching.
+    """
+
+    def __init__(self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.ttl = float(ttl)
+        self._value: Optional[Dict[str, Any]] = None
+        self._has_value = False
+        self._expires_at = 0.0
+        self._counts = {"hits": 0, "stale_hits": 0, "misses": 0}
+
+    def get(self, compute: Callable[[], Dict[str, Any]], allow_stale: bool = False):
+        """Return the cached value, computing it on a miss.
+
+        With ``allow_stale`` an expired or invalidated value is still returned.
+        """
+        with self._lock:
+            if self.ttl > 0 and self._has_value:
+                if self._clock() < self._expires_at:
+                    self._counts["hits"] += 1
+                    return self._value
+                if allow_stale:
+                    self._counts["stale_hits"] += 1
+                    return self._value
+            self._counts["misses"] += 1
+            return self._store(compute())
+
+    def refresh(self, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Recompute and store the value unconditionally."""
+        with self._lock:
+            self._counts["misses"] += 1
+            return self._store(compute())
+
+    def invalidate(self) -> None:
+        """Expire the current entry, keeping it available for stale reads."""
+        with self._lock:
+            self._expires_at = 0.0
+
+    def _store(self, value: Dict[str, Any]) -> Dict[str, Any]:
+        if self.ttl > 0:
+            self._value = value
+            self._has_value = True
+            self._expires_at = self._clock() + self.ttl
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {"ttl": self.ttl, **self._counts}
+
+
 ScraperFn = Callable[[], Any]
+BatchScraperFn = Callable[[], Iterable[Any]]
 CleanerFn = Callable[[Any], Any]
 LoaderFn = Callable[[Any], Any]
 AnalysisFn = Callable[[], Dict[str, Any]]
 
 
-def create_app(
+def incremental(config: Dict[str, Any]) -> Optional[KnownUrls]:
+    """Known-URL tracker for an ``INCREMENTAL_PULL`` scrape, else ``None``."""
+    if not config["INCREMENTAL_PULL"]:
+        return None
+    return KnownUrls(known_urls(), config["STOP_AFTER_KNOWN"])
+
+
+def scrape_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Keyword arguments for the default scrapers: known URLs and failure list."""
+    return {"known": incremental(config), "failed": config["PULL_STATE"].failed_pages}
+
+
+def create_app(  # pylint: disable=too-many-arguments
     config: Optional[Dict[str, Any]] = None,
     scraper: Optional[ScraperFn] = None,
     cleaner: Optional[CleanerFn] = None,
     loader: Optional[LoaderFn] = None,
     analysis_fn: Optional[AnalysisFn] = None,
+    batch_scraper: Optional[BatchScraperFn] = None,
 ) -> Flask:
-    """Create and configure the Flask app (used forrrr tests and local runs)."""
+    """Create and configure the Flask app (used forrrr tests and local runs).
+
+    With ``STREAMING_PIPELINE`` enabled, ``batch_scraper`` yields one page of
+    rows at a time and each batch flows through clean and load stages
+    connected by bounded queues, so rows reach the database as pages arrive.
+    """
     flask_app = Flask(__name__)
     if config:
         flask_app.config.update(config)
 
-    scraper = scraper or scrape_data
+    scraper = scraper or (lambda: scrape_data(**scrape_options(flask_app.config)))
     cleaner = cleaner or clean_data
     loader = loader or insert_applicants
     analysis_fn = analysis_fn or get_analysis
+    batch_scraper = batch_scraper or (lambda: iter_scrape(**scrape_options(flask_app.config)))
 
     flask_app.config.setdefault("RUN_ASYNC", True)
     flask_app.config.setdefault("PULL_STATE", PullState())
+    flask_app.config.setdefault("STREAMING_PIPELINE", False)
+    flask_app.config.setdefault("INCREMENTAL_PULL", False)
+    flask_app.config.setdefault("STOP_AFTER_KNOWN", DEFAULT_STOP_AFTER_KNOWN)
+    flask_app.config.setdefault("PIPELINE_QUEUE_SIZE", 4)
+    flask_app.config.setdefault("PIPELINE", None)
+    flask_app.config.setdefault("ANALYSIS_CACHE_TTL", 60.0)
+    flask_app.config.setdefault(
+        "ANALYSIS_CACHE", AnalysisCache(ttl=flask_app.config["ANALYSIS_CACHE_TTL"])
+    )
 
     @flask_app.template_filter("pct2")
     def pct2(value: Any) -> str:  # pylint: disable=unused-variable
@@ -70,23 +180,39 @@ def create_app(
             return "0.00"
         return f"{float(value):.2f}"
 
+    def run_streaming_pipeline() -> None:
+        stages = [("clean", cleaner)] if cleaner else []
+        stages.append(("load", loader))
+        pipeline = StreamingPipeline(stages, maxsize=flask_app.config["PIPELINE_QUEUE_SIZE"])
+        flask_app.config["PIPELINE"] = pipeline
+        pipeline.run(batch_scraper())
+
     def run_pipeline() -> None:
         try:
+            if flask_app.config["STREAMING_PIPELINE"]:
+                run_streaming_pipeline()
+                return
             raw_rows = scraper()
             cleaned_rows = cleaner(raw_rows) if cleaner else raw_rows
             loader(cleaned_rows)
+        except Exception as exc:
+            # Background pulls have no caller to see the traceback
+            flask_app.config["PULL_STATE"].fail(exc)
+            raise
         finally:
+            flask_app.config["ANALYSIS_CACHE"].invalidate()
             flask_app.config["PULL_STATE"].end()
 
     @flask_app.route("/")
     @flask_app.route("/analysis")
     def index():  # pylint: disable=unused-variable
-        """Render analysis page."""
-        results = analysis_fn()
+        """Render analysis page, serving cached results (stale during a pull)."""
+        busy = flask_app.config["PULL_STATE"].busy
+        results = flask_app.config["ANALYSIS_CACHE"].get(analysis_fn, allow_stale=busy)
         return render_template(
             "index.html",
             results=results,
-            pull_in_progress=flask_app.config["PULL_STATE"].busy,
+            pull_in_progress=busy,
         )
 
     @flask_app.route("/pull-data", methods=["POST"])
@@ -104,14 +230,26 @@ def create_app(
         run_pipeline()
         return jsonify({"ok": True}), 200
 
+    @flask_app.route("/pull-status")
+    def pull_status():  # pylint: disable=unused-variable
+        """Report pull progress: busy flag, stage counters, skipped pages, error."""
+        pipeline = flask_app.config["PIPELINE"]
+        stages = pipeline.snapshot() if pipeline else {}
+        return jsonify({**flask_app.config["PULL_STATE"].snapshot(), "stages": stages}), 200
+
     @flask_app.route("/update-analysis", methods=["POST"])
     def update_analysis():  # pylint: disable=unused-variable
         """Recompute analysis metrics without pulling new data"""
         if flask_app.config["PULL_STATE"].busy:
             return jsonify({"busy": True}), 409
-        analysis_fn()
+        flask_app.config["ANALYSIS_CACHE"].refresh(analysis_fn)
         return jsonify({"ok": True}), 200
 
+    @flask_app.route("/cache-stats")
+    def cache_stats():  # pylint: disable=unused-variable
+        """Report analysis cache hit/miss counters."""
+        return jsonify(flask_app.config["ANALYSIS_CACHE"].stats()), 200
+
     return flask_app
 
 
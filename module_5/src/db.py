@@ -9,12 +9,21 @@ Primary env vars--------------------------------:
 Compatibility for testing--------------------------------:
 - DATABASE_URL (full string)
 - PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD required for local/dev/tests
+
+Connection pool--------------------------------:
+- DB_POOL_MIN, DB_POOL_MAX (0 disables pooling), DB_POOL_IDLE_TIMEOUT,
+  DB_POOL_TIMEOUT (seconds)
 """
 
 import os
-from typing import Optional
+import threading
+import time
+from collections import deque
+from contextlib import closing, contextmanager
+from typing import Deque, Dict, Iterator, Optional, Tuple
 
 import psycopg
+from psycopg.pq import TransactionStatus
 
 
 def env(name: str, fallback: Optional[str] = None) -> Optional[str]:
@@ -49,3 +58,175 @@ def get_conninfo() -> str:
 def connect(conninfo: Optional[str] = None) -> psycopg.Connection:
     """Create a psycopg connection."""
     return psycopg.connect(conninfo or get_conninfo())
+
+
+class PoolTimeout(psycopg.OperationalError):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+class ConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """Small thread-safe pool of psycopg connections for one conninfo.
+
+    Connections are health-checked on checkout, rolled back on return, and
+    closed after ``idle_timeout`` seconds unused (down to ``min_size``).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        conninfo: str,
+        min_size: int = 1,
+        max_size: int = 5,
+        idle_timeout: float = 300.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.conninfo = conninfo
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[psycopg.Connection, float]] = deque()
+        self._size = 0
+
+    def _prune_idle(self) -> None:
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            conn.close()
+
+    @staticmethod
+    def _healthy(conn: psycopg.Connection) -> bool:
+        if conn.closed or conn.broken:
+            return False
+        try:
+            conn.execute("SELECT 1")
+            conn.rollback()
+        except psycopg.Error:
+            return False
+        return True
+
+    def _discard(self, conn: psycopg.Connection) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        conn.close()
+
+    def _checkout(self, deadline: float) -> Optional[psycopg.Connection]:
+        """Pop an idle connection, or reserve a slot for a new one (None)."""
+        with self._cond:
+            while True:
+                self._prune_idle()
+                if self._idle:
+                    return self._idle.pop()[0]
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise PoolTimeout(
+                        f"no connection available within {self.timeout:g}s "
+                        f"(max_size={self.max_size})"
+                    )
+
+    def getconn(self) -> psycopg.Connection:
+        """Check out a healthy connection, opening one if below ``max_size``."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = self._checkout(deadline)
+            if conn is None:
+                break
+            # Health check runs outside the lock so it never blocks other checkouts.
+            if self._healthy(conn):
+                return conn
+            self._discard(conn)
+        try:
+            return psycopg.connect(self.conninfo)
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn: psycopg.Connection) -> None:
+        """Return a connection, discarding it if broken."""
+        reusable = not (conn.closed or conn.broken)
+        if reusable:
+            try:
+                if conn.info.transaction_status != TransactionStatus.IDLE:
+                    conn.rollback()
+                conn.autocommit = False
+            except psycopg.Error:
+                reusable = False
+        if not reusable:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return open and idle connection counts."""
+        with self._cond:
+            return {"size": self._size, "idle": len(self._idle)}
+
+
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(conninfo: Optional[str] = None) -> Optional[ConnectionPool]:
+    """Return the process-wide pool for ``conninfo``, or None when disabled."""
+    max_size = int(env("DB_POOL_MAX", "5"))
+    if max_size <= 0:
+        return None
+    conninfo = conninfo or get_conninfo()
+    with _POOLS_LOCK:
+        pool = _POOLS.get(conninfo)
+        # A forked worker must not share the parent's sockets.
+        if pool is None or pool.pid != os.getpid():
+            pool = ConnectionPool(
+                conninfo,
+                min_size=int(env("DB_POOL_MIN", "1")),
+                max_size=max_size,
+                idle_timeout=float(env("DB_POOL_IDLE_TIMEOUT", "300")),
+                timeout=float(env("DB_POOL_TIMEOUT", "30")),
+            )
+            _POOLS[conninfo] = pool
+        return pool
+
+
+def close_pools() -> None:
+    """Close and forget every pool (tests, shutdown)."""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+@contextmanager
+def connection(conninfo: Optional[str] = None) -> Iterator[psycopg.Connection]:
+    """Yield a connection from the pool, or a one-shot one if pooling is off."""
+    conninfo = conninfo or get_conninfo()
+    pool = get_pool(conninfo)
+    if pool is None:
+        with closing(connect(conninfo)) as conn:
+            yield conn
+        return
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
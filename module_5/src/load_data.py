@@ -9,17 +9,16 @@ from __future__ import annotations
 import json
 import os
 import re
-from contextlib import closing
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 import psycopg
 from psycopg import sql
 
 try:
-    from db import connect, get_conninfo
+    from db import connection, get_conninfo
 except ImportError:
-    from src.db import connect, get_conninfo
+    from src.db import connection, get_conninfo
 
 # Pulls data in from module_2 and inserts in database
 DEFAULT_INPUT = os.getenv("INPUT_JSON", "../module_2/applicant_data.json")
@@ -69,8 +68,51 @@ def load_rows(path: str) -> List[Dict[str, Any]]:
         return json.load(file_handle)
 
 
+# Group key and per-group aggregates kept in applicant_stats. Flag columns
+# pre-evaluate the program LIKE filters used by query_data's index metrics.
+STATS_KEY_COLUMNS: List[str] = [
+    "term",
+    "status",
+    "degree",
+    "us_or_international",
+    "llm_generated_university",
+    "is_cs",
+    "is_jhu",
+    "is_cs_target",
+    "is_llm_cs",
+]
+
+STATS_METRICS: List[str] = ["gpa", "gre", "gre_v", "gre_aw"]
+
+# applicant_stats needs UNIQUE NULLS NOT DISTINCT (PostgreSQL 15+). Older
+# servers load without it and summary-mode analysis falls back to a scan.
+STATS_MIN_SERVER_VERSION = 150000
+
+# Normalized term columns derived from free-text ``term`` (e.g. "Fall 2026"),
+# added to existing tables on demand so queries can use equality + btree.
+GENERATED_COLUMNS: Dict[str, str] = {
+    "term_season": (
+        "TEXT GENERATED ALWAYS AS "
+        "(substring(term from '(Fall|Spring|Summer|Winter)')) STORED"
+    ),
+    "term_year": r"INTEGER GENERATED ALWAYS AS (substring(term from '\d{4}')::integer) STORED",
+}
+
+BTREE_INDEXES: Dict[str, str] = {
+    "applicants_term_idx": "(term_year, term_season, status, degree)",
+    "applicants_degree_idx": "(degree, status)",
+    "applicants_citizenship_idx": "(us_or_international)",
+}
+
+# Trigram indexes serve the unanchored ``program LIKE '%...%'`` filters.
+TRGM_INDEXES: Dict[str, str] = {
+    "applicants_program_trgm_idx": "USING gin (program gin_trgm_ops)",
+    "applicants_llm_program_trgm_idx": "USING gin (llm_generated_program gin_trgm_ops)",
+}
+
+
 def create_table(conn) -> None:
-    """Create the applicants table if does not exist."""
+    """Create the applicants table (and its summary table) if missing."""
     stmt = sql.SQL(
         """
         CREATE TABLE IF NOT EXISTS applicants (
@@ -93,6 +135,208 @@ def create_table(conn) -> None:
         """
     )
     conn.execute(stmt)
+    create_indexes(conn)
+    create_stats_table(conn)
+
+
+def enable_trgm(conn) -> bool:
+    """Ensure the pg_trgm extension exists; False if it cannot be created."""
+    if conn.execute(
+        sql.SQL("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).fetchone():
+        return True
+    try:
+        with conn.transaction():
+            conn.execute(sql.SQL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except psycopg.Error:
+        return False
+    return True
+
+
+def add_generated_columns(conn, table: str) -> None:
+    """Add the ``GENERATED_COLUMNS`` that ``table`` is missing."""
+    columns = {
+        row[0]
+        for row in conn.execute(
+            sql.SQL(
+                """
+                SELECT attname FROM pg_attribute
+                WHERE attrelid = %s::regclass AND NOT attisdropped
+                """
+            ),
+            (table,),
+        ).fetchall()
+    }
+    for name, definition in GENERATED_COLUMNS.items():
+        if name not in columns:
+            conn.execute(
+                sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                    sql.Identifier(table), sql.Identifier(name), sql.SQL(definition)
+                )
+            )
+
+
+def create_indexes(conn) -> None:
+    """Add generated term columns and query indexes that are missing.
+
+    Existing objects are looked up first so routine loads never take the
+    table locks that ``ALTER TABLE``/``CREATE INDEX`` would need.
+    """
+    add_generated_columns(conn, "applicants")
+
+    def missing(names):
+        return [
+            name
+            for name in names
+            if conn.execute(sql.SQL("SELECT to_regclass(%s)"), (name,)).fetchone()[0] is None
+        ]
+
+    for name in missing(BTREE_INDEXES):
+        conn.execute(
+            sql.SQL("CREATE INDEX IF NOT EXISTS {} ON applicants {}").format(
+                sql.Identifier(name), sql.SQL(BTREE_INDEXES[name])
+            )
+        )
+    trgm_missing = missing(TRGM_INDEXES)
+    if trgm_missing and enable_trgm(conn):
+        for name in trgm_missing:
+            conn.execute(
+                sql.SQL("CREATE INDEX IF NOT EXISTS {} ON applicants {}").format(
+                    sql.Identifier(name), sql.SQL(TRGM_INDEXES[name])
+                )
+            )
+
+
+def stats_supported(conn) -> bool:
+    """True if the server is new enough to keep ``applicant_stats``."""
+    return conn.info.server_version >= STATS_MIN_SERVER_VERSION
+
+
+def create_stats_table(conn) -> None:
+    """Create ``applicant_stats`` and backfill it the first time it appears.
+
+    The table carries the same generated ``term_season``/``term_year``
+    columns as ``applicants``, so summary queries filter on the same terms.
+    Skipped on servers older than ``STATS_MIN_SERVER_VERSION``.
+    """
+    if not stats_supported(conn):
+        return
+    exists = conn.execute(
+        sql.SQL("SELECT to_regclass('applicant_stats') IS NOT NULL")
+    ).fetchone()[0]
+    if exists:
+        add_generated_columns(conn, "applicant_stats")
+        return
+    metric_cols = sql.SQL(",\n").join(
+        sql.SQL("{} DOUBLE PRECISION NOT NULL DEFAULT 0, {} BIGINT NOT NULL DEFAULT 0").format(
+            sql.Identifier(f"{metric}_sum"), sql.Identifier(f"{metric}_n")
+        )
+        for metric in STATS_METRICS
+    )
+    key_cols = sql.SQL(", ").join(sql.Identifier(c) for c in STATS_KEY_COLUMNS)
+    conn.execute(
+        sql.SQL(
+            """
+            CREATE TABLE IF NOT EXISTS applicant_stats (
+                term TEXT,
+                status TEXT,
+                degree TEXT,
+                us_or_international TEXT,
+                llm_generated_university TEXT,
+                is_cs BOOLEAN NOT NULL,
+                is_jhu BOOLEAN NOT NULL,
+                is_cs_target BOOLEAN NOT NULL,
+                is_llm_cs BOOLEAN NOT NULL,
+                n BIGINT NOT NULL DEFAULT 0,
+                {metric_cols},
+                UNIQUE NULLS NOT DISTINCT ({key_cols})
+            )
+            """
+        ).format(metric_cols=metric_cols, key_cols=key_cols)
+    )
+    add_generated_columns(conn, "applicant_stats")
+    rebuild_stats(conn)
+
+
+def _stats_select(where: sql.Composable) -> sql.Composed:
+    """SELECT producing applicant_stats rows for the applicants matching ``where``."""
+    metrics = sql.SQL(", ").join(
+        sql.SQL("COALESCE(SUM({col}), 0), COUNT({col})").format(col=sql.Identifier(metric))
+        for metric in STATS_METRICS
+    )
+    return sql.SQL(
+        """
+        SELECT
+            term,
+            status,
+            degree,
+            us_or_international,
+            llm_generated_university,
+            COALESCE(program LIKE '%%Computer Science%%', FALSE),
+            COALESCE(program LIKE '%%Johns Hopkins%%', FALSE),
+            COALESCE(
+                program LIKE '%%Georgetown University%%'
+                OR program LIKE '%%Massachusetts Institute of Technology%%'
+                OR program LIKE '%%MIT%%'
+                OR program LIKE '%%Stanford University%%'
+                OR program LIKE '%%Carnegie Mellon University%%',
+                FALSE
+            ),
+            COALESCE(llm_generated_program LIKE '%%Computer Science%%', FALSE),
+            COUNT(*),
+            {metrics}
+        FROM applicants
+        WHERE {where}
+        GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9
+        """
+    ).format(metrics=metrics, where=where)
+
+
+def _stats_columns() -> sql.Composed:
+    cols = STATS_KEY_COLUMNS + ["n"]
+    for metric in STATS_METRICS:
+        cols += [f"{metric}_sum", f"{metric}_n"]
+    return sql.SQL(", ").join(sql.Identifier(c) for c in cols)
+
+
+def update_stats(cur, p_ids: List[int]) -> None:
+    """Fold newly inserted applicants (by ``p_id``) into ``applicant_stats``."""
+    if not p_ids or not stats_supported(cur.connection):
+        return
+    counters = ["n"] + [f"{m}_{suffix}" for m in STATS_METRICS for suffix in ("sum", "n")]
+    updates = sql.SQL(", ").join(
+        sql.SQL("{col} = applicant_stats.{col} + EXCLUDED.{col}").format(
+            col=sql.Identifier(col)
+        )
+        for col in counters
+    )
+    stmt = sql.SQL(
+        """
+        INSERT INTO applicant_stats ({cols})
+        {select}
+        ON CONFLICT ({key}) DO UPDATE SET {updates}
+        """
+    ).format(
+        cols=_stats_columns(),
+        select=_stats_select(sql.SQL("p_id = ANY(%s)")),
+        key=sql.SQL(", ").join(sql.Identifier(c) for c in STATS_KEY_COLUMNS),
+        updates=updates,
+    )
+    cur.execute(stmt, (list(p_ids),))
+
+
+def rebuild_stats(conn) -> None:
+    """Recompute ``applicant_stats`` from scratch (backfill or repair)."""
+    if not stats_supported(conn):
+        return
+    with conn.transaction():
+        conn.execute(sql.SQL("TRUNCATE TABLE applicant_stats"))
+        conn.execute(
+            sql.SQL("INSERT INTO applicant_stats ({cols}) {select}").format(
+                cols=_stats_columns(), select=_stats_select(sql.SQL("TRUE"))
+            ),
+            (),
+        )
 
 
 def _insert_stmt() -> sql.Composed:
@@ -103,21 +347,93 @@ def _insert_stmt() -> sql.Composed:
         INSERT INTO applicants ({cols})
         VALUES ({values})
         ON CONFLICT (url) DO NOTHING
+        RETURNING p_id
         """
     ).format(cols=cols, values=placeholders)
 
 
 def insert_rows(conn, rows: Iterable[Dict[str, Any]]) -> None:
-    """Insert prepared rows into the applicants table."""
+    """Insert prepared rows and update ``applicant_stats`` in one transaction."""
     stmt = _insert_stmt()
     values = [tuple(row.get(col) for col in APPLICANT_COLUMNS) for row in rows]
-    with conn.cursor() as cur:
-        cur.executemany(stmt, values)
+    if values:
+        with conn.transaction():
+            with conn.cursor() as cur:
+                cur.executemany(stmt, values, returning=True)
+                p_ids: List[int] = []
+                while True:
+                    p_ids.extend(row[0] for row in cur.fetchall())
+                    if not cur.nextset():
+                        break
+                update_stats(cur, p_ids)
+    # Commit even with no rows so the caller's CREATE TABLE is not rolled back.
     # Ensure inserts are visible across other connections used by tests/apppp
     if hasattr(conn, "autocommit") and not conn.autocommit:
         conn.commit()
 
 
+def _staging_stmt() -> sql.Composed:
+    # Session-private temp table: unlogged like an UNLOGGED table, and private to
+    # the connection so concurrent pulls cannot see each other's staged rows.
+    return sql.SQL(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS applicants_staging (
+            ord BIGSERIAL,
+            program TEXT,
+            comments TEXT,
+            date_added DATE,
+            url TEXT,
+            status TEXT,
+            term TEXT,
+            us_or_international TEXT,
+            gpa FLOAT,
+            gre FLOAT,
+            gre_v FLOAT,
+            gre_aw FLOAT,
+            degree TEXT,
+            llm_generated_program TEXT,
+            llm_generated_university TEXT
+        )
+        """
+    )
+
+
+def copy_rows(conn, rows: Iterable[Dict[str, Any]]) -> None:
+    """Bulk load prepared rows with COPY into a staging table, then merge.
+
+    Rows are streamed through ``COPY ... FROM STDIN`` and merged into
+    ``applicants`` with one ``INSERT ... SELECT ... ON CONFLICT (url) DO NOTHING``
+    ordered by arrival, so the first row per URL wins exactly as with
+    :func:`insert_rows`. ``applicant_stats`` is updated in the same transaction.
+    """
+    cols = sql.SQL(", ").join(sql.Identifier(c) for c in APPLICANT_COLUMNS)
+    copy_stmt = sql.SQL("COPY applicants_staging ({cols}) FROM STDIN").format(cols=cols)
+    merge_stmt = sql.SQL(
+        """
+        INSERT INTO applicants ({cols})
+        SELECT {cols} FROM applicants_staging
+        ORDER BY ord
+        ON CONFLICT (url) DO NOTHING
+        RETURNING p_id
+        """
+    ).format(cols=cols)
+
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(_staging_stmt())
+            with cur.copy(copy_stmt) as copy:
+                for row in rows:
+                    copy.write_row(tuple(row.get(col) for col in APPLICANT_COLUMNS))
+            cur.execute(merge_stmt)
+            update_stats(cur, [row[0] for row in cur.fetchall()])
+            cur.execute(sql.SQL("DROP TABLE applicants_staging"))
+    if hasattr(conn, "autocommit") and not conn.autocommit:
+        conn.commit()
+
+
+LOADERS = {"insert": insert_rows, "copy": copy_rows}
+
+
 def prepare_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Normalize and coerce fields into the schema expected"""
     prepared: List[Dict[str, Any]] = []
@@ -143,18 +459,37 @@ def prepare_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return prepared
 
 
+def known_urls(conninfo: Optional[str] = None) -> Set[str]:
+    """Return every applicant URL already loaded (empty before the first load)."""
+    with connection(conninfo or get_conninfo()) as conn:
+        if conn.execute("SELECT to_regclass('applicants')").fetchone()[0] is None:
+            return set()
+        rows = conn.execute("SELECT url FROM applicants WHERE url IS NOT NULL").fetchall()
+    return {row[0] for row in rows}
+
+
 def load_data(input_path: str = DEFAULT_INPUT) -> List[Dict[str, Any]]:
     """Load and prepare rows from a JSON file"""
     rows = load_rows(input_path)
     return prepare_rows(rows)
 
 
-def insert_applicants(rows: List[Dict[str, Any]], conninfo: Optional[str] = None):
-    """Insert applicants into the database, creating the table """
+def insert_applicants(
+    rows: List[Dict[str, Any]],
+    conninfo: Optional[str] = None,
+    method: str = "insert",
+):
+    """Insert applicants into the database, creating the table.
+
+    ``method`` selects the load path: ``"insert"`` (per-row executemany) or
+    ``"copy"`` (COPY into staging, then a single merge).
+    """
+    if method not in LOADERS:
+        raise ValueError(f"Unknown load method: {method!r}")
     prepared = prepare_rows(rows)
-    with closing(connect(conninfo or get_conninfo())) as conn:
+    with connection(conninfo or get_conninfo()) as conn:
         create_table(conn)
-        insert_rows(conn, prepared)
+        LOADERS[method](conn, prepared)
     return prepared
 
 
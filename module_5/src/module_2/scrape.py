@@ -1,89 +1,407 @@
 """Web scraping helpers for survey data.
 """
 
+import codecs
+import email.utils
+import gzip
+import hashlib
 import json
+import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from urllib.robotparser import RobotFileParser
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import urllib3
 from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
 
 BASE_URL = "https://www.thegradcafe.com"
 SURVEY_URL = f"{BASE_URL}/survey/"
 ROBOTS_URL = f"{BASE_URL}/robots.txt"
 USER_AGENT = "GradCafeScraper/1.0"
 
+# Upper bound on concurrent page requests; also sizes the per-host connection pool
+MAX_WORKERS = 16
+DEFAULT_WORKERS = int(os.getenv("SCRAPE_WORKERS", "1"))
+# Page parser backend: "html.parser" (BeautifulSoup), "lxml" or "stream"
+DEFAULT_PARSER = os.getenv("SCRAPE_PARSER", "html.parser")
+# Incremental scrapes stop after this many consecutive already-loaded rows
+DEFAULT_STOP_AFTER_KNOWN = int(os.getenv("SCRAPE_STOP_AFTER_KNOWN", "100"))
+# On-disk page cache directory (unset disables it); SCRAPE_OFFLINE=1 replays it
+CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR")
+OFFLINE = os.getenv("SCRAPE_OFFLINE", "0") == "1"
+# Request pacing (0 = unlimited; robots.txt Crawl-delay can only lower it),
+# per-request timeout in seconds, retries and base backoff for 429/5xx/errors
+DEFAULT_RATE = float(os.getenv("SCRAPE_RATE", "0"))
+TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "10"))
+RETRIES = int(os.getenv("SCRAPE_RETRIES", "4"))
+BACKOFF = float(os.getenv("SCRAPE_BACKOFF", "0.5"))
+MAX_BACKOFF = 30.0
+# Consecutive pages that may fail after all retries before paging stops
+MAX_FAILED_PAGES = 5
+RESPECT_ROBOTS = os.getenv("SCRAPE_RESPECT_ROBOTS", "1") == "1"
+# Bytes read per socket read on the streaming path
+STREAM_CHUNK = 16 * 1024
+
+# Retries are handled in _request so they share the limiter and backoff
 http = urllib3.PoolManager(
+    maxsize=MAX_WORKERS,
+    timeout=urllib3.Timeout(total=TIMEOUT),
+    retries=False,
     headers={
         "User-Agent": USER_AGENT,
         "Accept-Language": "en-US,en;q=0.9",
         "Referer": BASE_URL,
+        # gzip/deflate, plus br/zstd when brotli/zstandard is installed
+        **urllib3.util.make_headers(accept_encoding=True),
     }
 )
 
 
+class FetchError(urllib3.exceptions.HTTPError):
+    """Raised when a page still fails (429/5xx/network error) after all retries."""
+
+
+class PageFailure(NamedTuple):
+    """A survey page skipped because it raised ``FetchError``."""
+
+    url: str
+    error: str
+
+
+class RateLimiter:  # pylint: disable=too-many-instance-attributes
+    """Token bucket shared by every fetch thread, with adaptive concurrency.
+
+    ``acquire`` blocks until a request slot is free and a token is available
+    (``rate`` tokens per second, up to ``burst`` saved; ``rate <= 0`` disables
+    pacing). ``release(throttled=True)`` halves the concurrency limit; each
+    run of ``limit`` successful requests raises it by one again, up to
+    ``max_concurrency``.
+    """
+
+    def __init__(
+        self, rate: float = 0.0, burst: int = 1, max_concurrency: int = MAX_WORKERS
+    ) -> None:
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def _take_token(self) -> float:
+        # Returns 0 when a token was taken, else the seconds until the next one.
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a request may start."""
+        with self._cond:
+            while True:
+                if self.in_flight < self.limit:
+                    wait = self._take_token()
+                    if not wait:
+                        self.in_flight += 1
+                        return
+                else:
+                    wait = None
+                self._cond.wait(wait)
+
+    def release(self, throttled: bool = False) -> None:
+        """Finish a request; ``throttled`` reports a 429/5xx/network failure."""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            elif self.limit < self.max_concurrency:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def crawl_delay(robots_url: Optional[str] = None) -> Optional[float]:
+    """``Crawl-delay`` for ``USER_AGENT`` from robots.txt; None if unset or unreachable."""
+    try:
+        response = http.request("GET", robots_url or ROBOTS_URL)
+    except urllib3.exceptions.HTTPError:
+        return None
+    if response.status != 200:
+        return None
+    robots = RobotFileParser()
+    robots.parse(response.data.decode("utf-8", errors="ignore").splitlines())
+    delay = robots.crawl_delay(USER_AGENT)
+    return float(delay) if delay else None
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def default_limiter() -> RateLimiter:
+    """Process-wide limiter from ``SCRAPE_RATE``, capped by robots.txt ``Crawl-delay``."""
+    global _LIMITER  # pylint: disable=global-statement
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            rate = DEFAULT_RATE
+            delay = crawl_delay() if RESPECT_ROBOTS else None
+            if delay:
+                rate = min(rate, 1 / delay) if rate > 0 else 1 / delay
+            _LIMITER = RateLimiter(rate=rate)
+        return _LIMITER
+
+
+def _retry_after(response: Any) -> float:
+    """Seconds asked for by ``Retry-After`` (delta-seconds or HTTP-date); 0 if none."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _request(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    consume: Optional[Callable[[Any], Any]] = None,
+) -> Any:
+    """GET ``url`` through the limiter, retrying 429/5xx and network errors.
+
+    Waits ``BACKOFF * 2**attempt`` seconds between attempts (or the server's
+    ``Retry-After``, if longer), never more than ``MAX_BACKOFF``, and raises
+    ``FetchError`` once ``RETRIES`` retries are used up. With ``consume`` the
+    body is left unread (``preload_content=False``) and ``consume(response)``
+    reads it within the attempt, so a connection dropped mid-body is retried
+    like any other network error; its result is returned instead of the
+    response.
+    """
+    limiter = default_limiter()
+    options = {"preload_content": False} if consume else {}
+    for attempt in range(RETRIES + 1):
+        limiter.acquire()
+        response = None
+        throttled = True
+        try:
+            response = http.request("GET", url, headers=headers, **options)
+            if response.status != 429 and response.status < 500:
+                result = consume(response) if consume else response
+                throttled = False
+                return result
+            failure = f"HTTP {response.status}"
+            if consume:
+                response.drain_conn()
+        except urllib3.exceptions.HTTPError as exc:
+            failure = f"{type(exc).__name__}: {exc}"
+        finally:
+            if consume and response is not None:
+                response.release_conn()
+            limiter.release(throttled=throttled)
+        if attempt < RETRIES:
+            time.sleep(min(MAX_BACKOFF, max(BACKOFF * 2 ** attempt, _retry_after(response))))
+    raise FetchError(f"GET {url} failed after {RETRIES + 1} attempts ({failure})")
+
+
 def fetch(url: str) -> str:
     """Fetch URL and return decoded HTML."""
-    response = http.request("GET", url)
+    response = _request(url)
     return response.data.decode("utf-8", errors="ignore")
 
 
+class PageCache:
+    """On-disk HTTP response cache keyed by URL.
+
+    Each entry keeps the gzip-compressed body with its ``ETag`` and
+    ``Last-Modified`` headers, so later fetches send a conditional request and
+    reuse the stored body on ``304 Not Modified``. Records parsed from a body
+    are stored next to it and reused while the body is unchanged. With
+    ``offline`` no requests are made and uncached URLs read as empty pages.
+    """
+
+    def __init__(self, path: str, offline: bool = False) -> None:
+        self.path = path
+        self.offline = offline
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "parsed": 0, "reused": 0}
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{key}{suffix}")
+
+    def _read(self, url: str, suffix: str) -> Optional[Any]:
+        try:
+            with gzip.open(self._file(url, suffix), "rt", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, url: str, suffix: str, payload: Dict[str, Any]) -> None:
+        # Write to a temp file first so readers never see a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp, self._file(url, suffix))
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``url`` (body plus validators), if any."""
+        return self._read(url, ".json.gz")
+
+    def put(self, url: str, body: str, headers: Any) -> None:
+        """Store a 200 response body with its validators."""
+        self._write(url, ".json.gz", {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": body,
+        })
+
+    def fetch(self, url: str) -> str:
+        """Fetch ``url`` through the cache and return decoded HTML."""
+        entry = self.get(url)
+        if self.offline:
+            self.stats["hits" if entry else "misses"] += 1
+            return entry["body"] if entry else ""
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = _request(url, headers)
+        if response.status == 304 and entry:
+            self.stats["not_modified"] += 1
+            return entry["body"]
+        body = response.data.decode("utf-8", errors="ignore")
+        self.stats["misses"] += 1
+        if response.status == 200:
+            self.put(url, body, response.headers)
+        return body
+
+    def parse(self, url: str, html: str, parser: Optional[str] = None) -> Optional[List[Any]]:
+        """``parse_page`` with the result reused while the page body is unchanged."""
+        digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        saved = self._read(url, ".records.json.gz")
+        if saved is not None and saved["digest"] == digest:
+            self.stats["reused"] += 1
+            return saved["records"]
+        records = parse_page(html, parser)
+        self.stats["parsed"] += 1
+        if records is not None:
+            self._write(url, ".records.json.gz", {"digest": digest, "records": records})
+        return records
+
+
+def default_cache() -> Optional[PageCache]:
+    """Page cache configured by ``SCRAPE_CACHE_DIR``/``SCRAPE_OFFLINE``, if any."""
+    return PageCache(CACHE_DIR, offline=OFFLINE) if CACHE_DIR else None
+
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Metrics-row fields, compiled once. Benchmarked against one combined
+# alternation scanned with finditer, which was slower in CPython's re because
+# it loses the literal-prefix search each separate pattern gets.
+METRICS_PATTERNS = {
+    "gpa": re.compile(r"GPA\s*(\d+(?:\.\d+)?)"),
+    "gre": re.compile(r"GRE\s*(\d{3})"),
+    "gre_v": re.compile(r"V\s*(\d{2,3})"),
+    "gre_aw": re.compile(r"AW\s*([0-6]\.?(?:\d)?)"),
+}
+TERM_RE = re.compile(r"(?:Fall|Spring|Summer|Winter)\s+\d{4}")
+
+
 def clean(text: Any) -> Optional[str]:
     """Normalize whitespace and strip leading/trailing spaces."""
     if text is None:
         return None
-    return re.sub(r"\s+", " ", str(text)).strip()
+    return WHITESPACE_RE.sub(" ", str(text)).strip()
+
+
+def parse_metrics(metrics_text: Optional[str]) -> Dict[str, Optional[str]]:
+    """Extract GPA, GRE, GRE V, GRE AW, term and citizenship from a metrics row.
+
+    The first occurrence of each field wins, except that "American" anywhere
+    takes precedence over "International".
+    """
+    if not metrics_text:
+        return dict.fromkeys(("gpa", "gre", "gre_v", "gre_aw", "term", "citizenship"))
+    found: Dict[str, Optional[str]] = {}
+    for field, pattern in METRICS_PATTERNS.items():
+        match = pattern.search(metrics_text)
+        found[field] = match.group(1) if match else None
+    term = TERM_RE.search(metrics_text)
+    found["term"] = term.group(0) if term else None
+    if "American" in metrics_text:
+        found["citizenship"] = "American"
+    elif "International" in metrics_text:
+        found["citizenship"] = "International"
+    else:
+        found["citizenship"] = None
+    return found
 
 
 def parse_gre_parts(gre_text: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
     """Extract GRE verbal and AW values from a metrics string."""
-    if not gre_text:
-        return None, None
-    match_v = re.search(r"V\s*(\d{2,3})", gre_text)
-    match_aw = re.search(r"AW\s*([0-6]\.?(?:\d)?)", gre_text)
-    gre_v = match_v.group(1) if match_v else None
-    gre_aw = match_aw.group(1) if match_aw else None
-    return gre_v, gre_aw
+    metrics = parse_metrics(gre_text)
+    return metrics["gre_v"], metrics["gre_aw"]
 
 
 def extract_citizenship_and_term(
     metrics_text: Optional[str],
 ) -> Tuple[Optional[str], Optional[str]]:
     """Extract citizenship and term (e.g., Fall 2026) from metrics text."""
-    if not metrics_text:
-        return None, None
-    citizenship = (
-        "American"
-        if "American" in metrics_text
-        else ("International" if "International" in metrics_text else None)
-    )
-    term_match = re.search(r"(Fall|Spring|Summer|Winter)\s+\d{4}", metrics_text)
-    term = term_match.group(0) if term_match else None
-    return citizenship, term
+    metrics = parse_metrics(metrics_text)
+    return metrics["citizenship"], metrics["term"]
 
 
-def row_to_record(
-    row,
-    metrics_row=None,
-) -> Optional[Dict[str, Any]]:
-    """Convert a detail row (+ optional metrics row) into a normalized record."""
-    cols = [clean(c.get_text(" ", strip=True)) for c in row.find_all("td")]
+def cell_texts(row) -> List[Optional[str]]:
+    """Return the cleaned text of each ``<td>`` in a row."""
+    return [clean(c.get_text(" ", strip=True)) for c in row.find_all("td")]
 
-    url_tag = row.find("a", href=True)
-    href = url_tag["href"] if url_tag else None
+
+def build_record(
+    cols: List[Optional[str]],
+    href: Optional[str],
+    metrics_text: Optional[str],
+) -> Dict[str, Any]:
+    """Build a normalized record from a row's cell texts, link and metrics text."""
     if href and href.startswith("/"):
         url_value = f"{BASE_URL}{href}"
     else:
         url_value = clean(href)
 
-    metrics_text = None
-    if metrics_row is not None:
-        metrics_cols = [clean(c.get_text(" ", strip=True)) for c in metrics_row.find_all("td")]
-        metrics_text = metrics_cols[0] if metrics_cols else None
-
     gre_text = metrics_text or ""
-    gre_v, gre_aw = parse_gre_parts(gre_text)
-    citizenship, term = extract_citizenship_and_term(metrics_text)
+    metrics = parse_metrics(metrics_text)
 
     date_added = cols[2] if len(cols) > 2 else None
     status = cols[3] if len(cols) > 3 else None
@@ -94,63 +412,483 @@ def row_to_record(
         "date_added": date_added,
         "url": clean(url_value),
         "applicant_status": status,
-        "semester_year_start": term,
-        "citizenship": citizenship,
+        "semester_year_start": metrics["term"],
+        "citizenship": metrics["citizenship"],
         "gpa": gre_text,
         "gre": gre_text,
-        "gre_v": gre_v,
-        "gre_aw": gre_aw,
+        "gre_v": metrics["gre_v"],
+        "gre_aw": metrics["gre_aw"],
         "masters_or_phd": None,
         "llm-generated-program": cols[1] if len(cols) > 1 else cols[0],
         "llm-generated-university": cols[0],
     }
 
 
-def scrape_data(  # pylint: disable=too-many-locals
-    min_entries: int = 30000,
-    max_pages: int = 2000,
-    per_page: int = 100,
-) -> List[Dict[str, Any]]:
-    """Scrape survey pages and return a list of row dicts."""
-    results: List[Dict[str, Any]] = []
-    page = 1
-    empty_pages = 0
+def row_to_record(
+    row,
+    metrics_row=None,
+    cols: Optional[List[Optional[str]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Convert a detail row (+ optional metrics row) into a normalized record.
+
+    ``cols`` may carry the row's already-cleaned cell texts to skip re-reading
+    them.
+    """
+    if cols is None:
+        cols = cell_texts(row)
+
+    url_tag = row.find("a", href=True)
+    href = url_tag["href"] if url_tag else None
+
+    metrics_text = None
+    if metrics_row is not None:
+        # Only the first cell is used, so clean just that one
+        first_td = metrics_row.find("td")
+        metrics_text = clean(first_td.get_text(" ", strip=True)) if first_td else None
+
+    return build_record(cols, href, metrics_text)
+
+
+# Page parser backends: each returns the rows parse_page walks.
+class SurveyRow(NamedTuple):
+    """What ``parse_page`` needs from one ``<tr>``: cell texts and first link."""
+
+    cells: List[Optional[str]]
+    href: Optional[str]
+
 
-    while page <= max_pages and len(results) < min_entries:
-        url = f"{SURVEY_URL}?page={page}&pp={per_page}"
-        soup = BeautifulSoup(fetch(url), "html.parser")
+def _soup_rows(html: str, features: str) -> List[SurveyRow]:
+    """Rows of the first table (or the whole page) via a BeautifulSoup tree."""
+    soup = BeautifulSoup(html, features)
+    table = soup.find("table")
+    rows = []
+    for row in table.find_all("tr") if table else soup.find_all("tr"):
+        url_tag = row.find("a", href=True)
+        rows.append(SurveyRow(cell_texts(row), url_tag["href"] if url_tag else None))
+    return rows
 
-        table = soup.find("table")
-        rows = table.find_all("tr") if table else soup.find_all("tr")
 
-        if not rows:
-            empty_pages += 1
-            if empty_pages >= 5:
+# Elements html.parser never leaves open (BeautifulSoup's empty-element list)
+VOID_ELEMENTS = frozenset(
+    "area base basefont bgsound br col command embed frame hr image img input "
+    "isindex keygen link menuitem meta nextid param source spacer track wbr".split()
+)
+# Text BeautifulSoup stores as Script/Stylesheet strings, which get_text skips
+RAW_TEXT_ELEMENTS = frozenset(("script", "style", "template"))
+
+
+class _OpenRow:  # pylint: disable=too-few-public-methods
+    __slots__ = ("cells", "href", "in_table")
+
+    def __init__(self, in_table: bool) -> None:
+        self.cells: List[List[str]] = []
+        self.href: Optional[str] = None
+        self.in_table = in_table
+
+
+class RowTokenizer(HTMLParser):  # pylint: disable=too-many-instance-attributes
+    """Tag-level scan that keeps only ``<tr>``, ``<td>`` text and ``<a href>``.
+
+    No tree is built. An open-element stack reproduces how html.parser
+    BeautifulSoup nests and closes tags, so every ``<td>`` gets the same text
+    ``get_text(" ", strip=True)`` would return, and each row's link is the first
+    ``<a href>`` inside it in document order.
+    """
+
+    def __init__(self) -> None:
+        # References are resolved below exactly as BeautifulSoup's builder does
+        super().__init__(convert_charrefs=False)
+        self.rows: List[_OpenRow] = []
+        self.saw_table = False
+        self._stack: List[Tuple[str, Any]] = []
+        self._open_rows: List[_OpenRow] = []
+        self._open_cells: List[List[str]] = []
+        self._in_first_table = False
+        self._raw_depth = 0
+        self._text: List[str] = []
+        self._closed_voids: List[str] = []
+
+    def _flush(self) -> None:
+        # Adjacent text is one string to BeautifulSoup; strip it as a whole
+        if self._text:
+            text = "".join(self._text)
+            self._text.clear()
+            if self._raw_depth == 0:
+                for cell in self._open_cells:
+                    cell.append(text)
+
+    def _open(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush()
+        obj: Any = None
+        if tag == "tr":
+            obj = _OpenRow(self._in_first_table)
+            self.rows.append(obj)
+            self._open_rows.append(obj)
+        elif tag == "td":
+            obj = []
+            for row in self._open_rows:
+                row.cells.append(obj)
+            self._open_cells.append(obj)
+        elif tag == "a":
+            href = dict(attrs).get("href", False)
+            if href is not False:
+                for row in self._open_rows:
+                    if row.href is None:
+                        row.href = href or ""
+        elif tag == "table" and not self.saw_table:
+            self.saw_table = self._in_first_table = True
+            obj = "first-table"
+        elif tag in RAW_TEXT_ELEMENTS:
+            self._raw_depth += 1
+        self._stack.append((tag, obj))
+
+    def _close(self, tag: str, check_voids: bool = True) -> None:
+        if check_voids and tag in self._closed_voids:
+            # Redundant end tag for a void element already closed at its start;
+            # it does not even split the surrounding text
+            self._closed_voids.remove(tag)
+            return
+        self._flush()
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
                 break
-            page += 1
+        else:
+            return
+        while len(self._stack) > depth:
+            name, obj = self._stack.pop()
+            if name == "tr":
+                self._open_rows.pop()
+            elif name == "td":
+                self._open_cells.pop()
+            elif obj == "first-table":
+                self._in_first_table = False
+            elif name in RAW_TEXT_ELEMENTS:
+                self._raw_depth -= 1
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._open(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            self._close(tag, check_voids=False)
+            self._closed_voids.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._open(tag, attrs)
+        self._close(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._close(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._text.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        code = int(name.lstrip("xX"), 16) if name[:1] in "xX" else int(name)
+        data = None
+        if code < 256:
+            # Numeric references in the C1 range usually mean Windows-1252
+            try:
+                data = bytes([code]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self._text.append(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name: str) -> None:
+        # Unknown names stay literal, without the semicolon (as BeautifulSoup)
+        self._text.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f"&{name}"))
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+        # BeautifulSoup keeps CDATA sections as separate strings get_text includes
+        if data.startswith("CDATA["):
+            self._text.append(data[len("CDATA["):])
+            self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def _stream_rows(html: str) -> List[SurveyRow]:
+    """Rows of the first table (or the whole page) without building a tree."""
+    tokenizer = RowTokenizer()
+    tokenizer.feed(html)
+    tokenizer.close()
+    return _tokenizer_rows(tokenizer)
+
+
+def _tokenizer_rows(tokenizer: RowTokenizer) -> List[SurveyRow]:
+    return [
+        SurveyRow(
+            [clean(" ".join(t.strip() for t in cell if t.strip())) for cell in row.cells],
+            row.href,
+        )
+        for row in tokenizer.rows
+        if row.in_table or not tokenizer.saw_table
+    ]
+
+
+PARSERS = {
+    "html.parser": lambda html: _soup_rows(html, "html.parser"),
+    "lxml": lambda html: _soup_rows(html, "lxml"),
+    "stream": _stream_rows,
+}
+
+
+def page_url(page: int, per_page: int) -> str:
+    """Build the survey listing URL for a page number."""
+    return f"{SURVEY_URL}?page={page}&pp={per_page}"
+
+
+def parse_page(html: str, parser: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """Parse one survey page into records; None when the page has no rows.
+
+    ``parser`` picks a backend from ``PARSERS`` (default ``SCRAPE_PARSER``);
+    all of them produce identical records.
+    """
+    parser = parser or DEFAULT_PARSER
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser: {parser!r}")
+    return _rows_to_records(PARSERS[parser](html))
+
+
+def _rows_to_records(rows: List[SurveyRow]) -> Optional[List[Dict[str, Any]]]:
+    if not rows:
+        return None
+
+    records: List[Dict[str, Any]] = []
+    index = 1
+    while index < len(rows):
+        cols = rows[index].cells
+        if len(cols) < 4 or not cols[0] or not cols[1]:
+            index += 1
             continue
 
-        empty_pages = 0
-        index = 1
-        while index < len(rows):
-            row = rows[index]
-            tds = row.find_all("td")
-            if len(tds) < 4:
-                index += 1
+        metrics_text = None
+        if index + 1 < len(rows) and rows[index + 1].cells:
+            metrics_text = rows[index + 1].cells[0]
+        records.append(build_record(cols, rows[index].href, metrics_text))
+        index += 2
+    return records
+
+
+def fetch_records(url: str) -> Optional[List[Dict[str, Any]]]:
+    """Fetch one survey page and parse it as it downloads (``stream`` backend).
+
+    The body is read ``STREAM_CHUNK`` bytes at a time, decompressed and
+    decoded incrementally and fed straight to ``RowTokenizer``, so neither
+    the whole body nor the whole HTML string is ever held in memory.
+    Records are identical to ``parse_page(fetch(url), "stream")``. A body
+    cut off mid-read is retried, and raises ``FetchError`` once retries are
+    used up.
+    """
+    return _rows_to_records(_tokenizer_rows(_request(url, consume=_tokenize_body)))
+
+
+def _tokenize_body(response: Any) -> RowTokenizer:
+    # Runs inside a _request attempt; a retry starts again with a fresh tokenizer.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    tokenizer = RowTokenizer()
+    for chunk in response.stream(STREAM_CHUNK):
+        tokenizer.feed(decoder.decode(chunk))
+    tokenizer.feed(decoder.decode(b"", final=True))
+    tokenizer.close()
+    return tokenizer
+
+
+class KnownUrls:
+    """Stop condition for incremental scrapes.
+
+    Survey pages list the newest entries first, so once ``stop_after``
+    consecutive rows have URLs that are already loaded, everything older is
+    assumed to be loaded too.
+    """
+
+    def __init__(self, urls: Iterable[str], stop_after: int = DEFAULT_STOP_AFTER_KNOWN) -> None:
+        self.urls = set(urls)
+        self.stop_after = max(1, int(stop_after))
+        self.run = 0
+        self.skipped = 0
+
+    def filter(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop already-loaded records and track the consecutive-known run."""
+        fresh = []
+        for record in records:
+            if record.get("url") in self.urls:
+                self.run += 1
+                self.skipped += 1
+            else:
+                self.run = 0
+                fresh.append(record)
+        return fresh
+
+    @property
+    def done(self) -> bool:
+        """True once ``stop_after`` known rows have been seen in a row."""
+        return self.run >= self.stop_after
+
+
+def _iter_fetched(
+    get: Callable[[str], Any], max_pages: int, per_page: int, workers: int
+) -> Iterator[Any]:
+    """Yield ``get(page_url)`` in page order, keeping up to ``workers`` calls in flight.
+
+    Pages are requested ahead of the consumer through a bounded thread pool that
+    shares the module-level ``http`` pool. Closing the generator early cancels
+    any queued fetches that have not started yet.
+    """
+    workers = max(1, min(MAX_WORKERS, int(workers)))
+    if workers == 1:
+        for page in range(1, max_pages + 1):
+            yield get(page_url(page, per_page))
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape")
+    pending: Deque = deque()
+    next_page = 1
+    try:
+        while True:
+            while len(pending) < workers and next_page <= max_pages:
+                pending.append(pool.submit(get, page_url(next_page, per_page)))
+                next_page += 1
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pages(
+    max_pages: int, per_page: int, workers: int = 1, cache: Optional[PageCache] = None
+) -> Iterator[str]:
+    """Yield page HTML in page order, keeping up to ``workers`` fetches in flight.
+
+    With ``cache`` pages go through ``cache.fetch`` instead of ``fetch``.
+    """
+    return _iter_fetched(cache.fetch if cache is not None else fetch, max_pages, per_page, workers)
+
+
+def _skip_failures(load: Callable[[str], Any]) -> Callable[[str], Any]:
+    # Turn a page that exhausted its retries into a PageFailure for iter_scrape.
+    def get(url: str) -> Any:
+        try:
+            return load(url)
+        except FetchError as exc:
+            return PageFailure(url, str(exc))
+
+    return get
+
+
+def _page_loader(
+    parser: Optional[str], cache: Optional[PageCache]
+) -> Callable[[str], Optional[List[Dict[str, Any]]]]:
+    # Fetch and parse one page URL; the stream backend parses while downloading.
+    if cache is not None:
+        return lambda url: cache.parse(url, cache.fetch(url), parser)
+    if (parser or DEFAULT_PARSER) == "stream":
+        return fetch_records
+    return lambda url: parse_page(fetch(url), parser)
+
+
+def iter_scrape(  # pylint: disable=too-many-arguments
+    min_entries: int = 30000,
+    max_pages: int = 2000,
+    per_page: int = 100,
+    workers: int = DEFAULT_WORKERS,
+    parser: Optional[str] = None,
+    known: Optional[KnownUrls] = None,
+    cache: Optional[PageCache] = None,
+    failed: Optional[List[PageFailure]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield parsed records one survey page at a time.
+
+    With ``workers > 1`` pages are fetched and parsed concurrently but yielded
+    in page order, so the output and the stop conditions (five consecutive empty
+    pages, ``min_entries`` reached) match the sequential scrape.
+
+    With ``known``, already-loaded rows are dropped and paging stops once
+    ``known.stop_after`` of them appear consecutively.
+
+    ``cache`` (default from ``SCRAPE_CACHE_DIR``) serves pages through a
+    ``PageCache``; unchanged pages reuse their previously parsed records.
+    Without a cache the ``stream`` parser reads each response incrementally
+    (see ``fetch_records``).
+
+    A page that still fails after its retries is skipped, reported on stderr
+    and appended to ``failed``; it does not count as an empty page. Paging
+    stops after ``MAX_FAILED_PAGES`` consecutive failures.
+    """
+    total = 0
+    empty_pages = 0
+    failed_run = 0
+    if min_entries <= 0:
+        return
+
+    cache = cache if cache is not None else default_cache()
+    loader = _skip_failures(_page_loader(parser, cache))
+    pages = _iter_fetched(loader, max_pages, per_page, workers)
+    try:
+        for records in pages:
+            if isinstance(records, PageFailure):
+                print(f"skipping {records.url}: {records.error}", file=sys.stderr)
+                if failed is not None:
+                    failed.append(records)
+                failed_run += 1
+                if failed_run >= MAX_FAILED_PAGES:
+                    break
                 continue
-            cols = [clean(c.get_text(" ", strip=True)) for c in tds]
-            if not cols[0] or not cols[1]:
-                index += 1
+            failed_run = 0
+            if records is None:
+                empty_pages += 1
+                if empty_pages >= 5:
+                    break
                 continue
 
-            metrics_row = rows[index + 1] if index + 1 < len(rows) else None
-            record = row_to_record(row, metrics_row)
-            if record:
-                results.append(record)
-            index += 2
+            empty_pages = 0
+            if known is not None:
+                records = known.filter(records)
+            total += len(records)
+            if records:
+                yield records
+            if total >= min_entries or (known is not None and known.done):
+                break
+    finally:
+        pages.close()
 
-        page += 1
 
+def scrape_data(  # pylint: disable=too-many-arguments
+    min_entries: int = 30000,
+    max_pages: int = 2000,
+    per_page: int = 100,
+    workers: int = DEFAULT_WORKERS,
+    parser: Optional[str] = None,
+    known: Optional[KnownUrls] = None,
+    cache: Optional[PageCache] = None,
+    failed: Optional[List[PageFailure]] = None,
+) -> List[Dict[str, Any]]:
+    """Scrape survey pages and return a list of row dicts.
+
+    Pass ``PageCache(path, offline=True)`` to replay a previous scrape from
+    disk without any network access. Pages that fail are skipped and listed
+    in ``failed`` (see ``iter_scrape``).
+    """
+    results: List[Dict[str, Any]] = []
+    pages = iter_scrape(min_entries, max_pages, per_page, workers, parser, known, cache, failed)
+    for records in pages:
+        results.extend(records)
     return results
 
 
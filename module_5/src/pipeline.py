@@ -0,0 +1,149 @@
+"""Queue-connected streaming stages for the pull-data job.
+
+Each stage runs in its own thread and hands batches (one survey page worth of
+rows) to the next stage through a bounded queue, so a slow loader applies
+backpressure to the scraper instead of letting whole datasets pile up.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+StageFn = Callable[[Any], Any]
+
+_DONE = object()
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+    def record(self, batch: Any, elapsed: float) -> None:
+        """Count one processed batch and the time spent on it."""
+        self.batches += 1
+        self.rows += len(batch) if hasattr(batch, "__len__") else 0
+        self.seconds += elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return counters as a JSON-friendly dict."""
+        rate = self.rows / self.seconds if self.seconds else None
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 4),
+            "rows_per_sec": round(rate, 2) if rate is not None else None,
+        }
+
+
+class StreamingPipeline:
+    """Run a batch source through a chain of stages connected by bounded queues."""
+
+    def __init__(
+        self,
+        stages: Sequence[Tuple[str, StageFn]],
+        maxsize: int = 4,
+        source_name: str = "fetch",
+    ) -> None:
+        self.stages = list(stages)
+        self.maxsize = max(1, int(maxsize))
+        self.source_name = source_name
+        self.stats: Dict[str, StageStats] = {source_name: StageStats(source_name)}
+        for name, _ in self.stages:
+            self.stats[name] = StageStats(name)
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+
+    def _fail(self, exc: BaseException) -> None:
+        if self._error is None:
+            self._error = exc
+        self._stop.set()
+
+    def _produce(self, source: Iterable[Any], out_q: queue.Queue, stats: StageStats) -> None:
+        iterator = iter(source)
+        try:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    break
+                stats.record(batch, time.perf_counter() - started)
+                out_q.put(batch)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._fail(exc)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+            out_q.put(_DONE)
+
+    def _consume(
+        self,
+        func: StageFn,
+        in_q: queue.Queue,
+        out_q: Optional[queue.Queue],
+        stats: StageStats,
+    ) -> None:
+        # After a failure anywhere, keep draining the input so upstream never blocks.
+        while True:
+            batch = in_q.get()
+            if batch is _DONE:
+                break
+            if self._stop.is_set():
+                continue
+            started = time.perf_counter()
+            try:
+                result = func(batch)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self._fail(exc)
+                continue
+            stats.record(batch, time.perf_counter() - started)
+            if out_q is not None:
+                out_q.put(batch if result is None else result)
+        if out_q is not None:
+            out_q.put(_DONE)
+
+    def run(self, source: Iterable[Any]) -> Dict[str, Any]:
+        """Drain ``source`` through every stage and return per-stage counters.
+
+        Any exception raised by the source or a stage stops the pipeline and is
+        re-raised here once all threads have finished.
+        """
+        queues: List[queue.Queue] = [
+            queue.Queue(maxsize=self.maxsize) for _ in self.stages
+        ]
+        threads = [
+            threading.Thread(
+                target=self._produce,
+                args=(source, queues[0], self.stats[self.source_name]),
+                daemon=True,
+            )
+        ]
+        for index, (name, func) in enumerate(self.stages):
+            out_q = queues[index + 1] if index + 1 < len(queues) else None
+            threads.append(
+                threading.Thread(
+                    target=self._consume,
+                    args=(func, queues[index], out_q, self.stats[name]),
+                    daemon=True,
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters for every stage."""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
@@ -6,21 +6,32 @@ LIMIT and enforces a maximum allowed limit.
 """
 
 
-from typing import Any, Dict, Sequence
-
-from contextlib import closing
+import os
+import threading
+from typing import Any, Dict, Sequence, Set
 
 from psycopg import sql
 
 try:
     import db as _db
+    from load_data import create_table, stats_supported
 except ImportError:
     from src import db as _db
+    from src.load_data import create_table, stats_supported
 
 connect = _db.connect
+connection = _db.connection
 get_conninfo = _db.get_conninfo
 
 MAX_LIMIT = 100
+# Target term, matched against the generated term_season/term_year columns.
+TERM_SEASON = "Fall"
+TERM_YEAR = 2026
+DEFAULT_ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "queries")
+
+# Databases whose schema has been brought up to date by this process.
+_MIGRATED: Set[str] = set()
+_MIGRATE_LOCK = threading.Lock()
 
 
 def clamp_limit(value: Any, default: int = 50, low: int = 1, high: int = MAX_LIMIT) -> int:
@@ -32,6 +43,21 @@ def clamp_limit(value: Any, default: int = 50, low: int = 1, high: int = MAX_LIM
     return max(low, min(high, number))
 
 
+def ensure_schema(conn, conninfo: str) -> None:
+    """Run the idempotent ``create_table`` migration once per database.
+
+    Analysis reads the generated term columns and ``applicant_stats``, which
+    older databases only gain on their next load; migrate before the first
+    query instead of failing until then.
+    """
+    with _MIGRATE_LOCK:
+        if conninfo in _MIGRATED:
+            return
+        create_table(conn)
+        conn.commit()
+        _MIGRATED.add(conninfo)
+
+
 def fetch_one(conn, stmt: sql.Composable, params: Sequence[Any] | None = None):
     """Execute statement and return a single row."""
     with conn.cursor() as cur:
@@ -51,7 +77,7 @@ STMT_FALL_2026 = sql.SQL(
     """
     SELECT COUNT(*)
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_season = %s AND term_year = %s
     LIMIT 1
     """
 )
@@ -85,7 +111,7 @@ STMT_AVG_GPA_AMERICAN_FALL = sql.SQL(
     """
     SELECT ROUND(AVG(gpa)::numeric, 2)
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_season = %s AND term_year = %s
       AND us_or_international = 'American'
       AND gpa IS NOT NULL
     LIMIT 1
@@ -100,7 +126,7 @@ STMT_ACCEPT_PCT_FALL = sql.SQL(
         2
     )
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_season = %s AND term_year = %s
     LIMIT 1
     """
 )
@@ -109,7 +135,7 @@ STMT_AVG_GPA_ACCEPT_FALL = sql.SQL(
     """
     SELECT ROUND(AVG(gpa)::numeric, 2)
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_season = %s AND term_year = %s
       AND status = 'Accepted'
       AND gpa IS NOT NULL
     LIMIT 1
@@ -131,7 +157,7 @@ STMT_CS_PHD_ACCEPT_2026 = sql.SQL(
     """
     SELECT COUNT(*)
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_year = %s
       AND status = 'Accepted'
       AND degree = 'PhD'
       AND program LIKE %s
@@ -150,7 +176,7 @@ STMT_CS_PHD_ACCEPT_2026_LLM = sql.SQL(
     """
     SELECT COUNT(*)
     FROM applicants
-    WHERE term LIKE %s
+    WHERE term_year = %s
       AND status = 'Accepted'
       AND degree = 'PhD'
       AND llm_generated_program LIKE %s
@@ -168,7 +194,7 @@ STMT_EXTRA_Q1 = sql.SQL(
     """
     SELECT status, ROUND(AVG(gpa)::numeric, 2) AS avg_gpa
     FROM applicants
-    WHERE term LIKE %s AND gpa IS NOT NULL
+    WHERE term_season = %s AND term_year = %s AND gpa IS NOT NULL
     GROUP BY status
     ORDER BY avg_gpa DESC
     LIMIT %s
@@ -179,7 +205,7 @@ STMT_EXTRA_Q2 = sql.SQL(
     """
     SELECT llm_generated_university, COUNT(*) AS total
     FROM applicants
-    WHERE term LIKE %s AND llm_generated_university IS NOT NULL
+    WHERE term_season = %s AND term_year = %s AND llm_generated_university IS NOT NULL
     GROUP BY llm_generated_university
     ORDER BY total DESC
     LIMIT %s
@@ -187,18 +213,247 @@ STMT_EXTRA_Q2 = sql.SQL(
 )
 
 
-def get_analysis(limit: int = MAX_LIMIT) -> Dict[str, Any]:
-    """Compute summary metrics for the analysis page."""
+# One scan of applicants for every scalar metric; each FILTER mirrors the
+# WHERE clause of the matching per-metric statement above.
+STMT_COMBINED_SCALARS = sql.SQL(
+    """
+    SELECT
+        COUNT(*) FILTER (WHERE term_season = p.season AND term_year = p.year),
+        ROUND(
+            100.0 * SUM(CASE WHEN us_or_international = 'International' THEN 1 ELSE 0 END)
+                FILTER (WHERE us_or_international IS NOT NULL)
+            / NULLIF(COUNT(*) FILTER (WHERE us_or_international IS NOT NULL), 0),
+            2
+        ),
+        ROUND(AVG(gpa)::numeric, 2),
+        ROUND(AVG(gre)::numeric, 2),
+        ROUND(AVG(gre_v)::numeric, 2),
+        ROUND(AVG(gre_aw)::numeric, 2),
+        ROUND(AVG(gpa) FILTER (
+            WHERE term_season = p.season AND term_year = p.year
+              AND us_or_international = 'American'
+        )::numeric, 2),
+        ROUND(
+            100.0 * SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END)
+                FILTER (WHERE term_season = p.season AND term_year = p.year)
+            / NULLIF(COUNT(*) FILTER (WHERE term_season = p.season AND term_year = p.year), 0),
+            2
+        ),
+        ROUND(AVG(gpa) FILTER (
+            WHERE term_season = p.season AND term_year = p.year
+              AND status = 'Accepted'
+        )::numeric, 2),
+        COUNT(*) FILTER (
+            WHERE program LIKE p.cs_like AND degree = 'Masters' AND program LIKE p.jhu_like
+        ),
+        COUNT(*) FILTER (
+            WHERE term_year = p.year
+              AND status = 'Accepted'
+              AND degree = 'PhD'
+              AND program LIKE p.cs_like
+              AND (
+                program LIKE p.georgetown_like
+                OR program LIKE p.mit_like
+                OR program LIKE p.mit_abbrev_like
+                OR program LIKE p.stanford_like
+                OR program LIKE p.cmu_like
+              )
+        ),
+        COUNT(*) FILTER (
+            WHERE term_year = p.year
+              AND status = 'Accepted'
+              AND degree = 'PhD'
+              AND llm_generated_program LIKE p.cs_like
+              AND llm_generated_university IN (
+                'Georgetown University',
+                'Massachusetts Institute of Technology',
+                'Stanford University',
+                'Carnegie Mellon University'
+              )
+        )
+    FROM applicants, (
+        SELECT
+            %s::text AS season,
+            %s::integer AS year,
+            %s::text AS cs_like,
+            %s::text AS jhu_like,
+            %s::text AS georgetown_like,
+            %s::text AS mit_like,
+            %s::text AS mit_abbrev_like,
+            %s::text AS stanford_like,
+            %s::text AS cmu_like
+    ) AS p
+    LIMIT 1
+    """
+)
+
+# Summary-table statements: same metrics answered from applicant_stats groups,
+# filtered on the same generated term columns as the statements above.
+STMT_SUMMARY_SCALARS = sql.SQL(
+    """
+    SELECT
+        COALESCE(SUM(n) FILTER (
+            WHERE term_season = p.season AND term_year = p.year
+        ), 0)::bigint,
+        ROUND(
+            100.0 * COALESCE(SUM(n) FILTER (WHERE us_or_international = 'International'), 0)
+            / NULLIF(SUM(n) FILTER (WHERE us_or_international IS NOT NULL), 0),
+            2
+        ),
+        ROUND((SUM(gpa_sum) / NULLIF(SUM(gpa_n), 0))::numeric, 2),
+        ROUND((SUM(gre_sum) / NULLIF(SUM(gre_n), 0))::numeric, 2),
+        ROUND((SUM(gre_v_sum) / NULLIF(SUM(gre_v_n), 0))::numeric, 2),
+        ROUND((SUM(gre_aw_sum) / NULLIF(SUM(gre_aw_n), 0))::numeric, 2),
+        ROUND((
+            SUM(gpa_sum) FILTER (
+                WHERE term_season = p.season AND term_year = p.year
+                  AND us_or_international = 'American'
+            )
+            / NULLIF(SUM(gpa_n) FILTER (
+                WHERE term_season = p.season AND term_year = p.year
+                  AND us_or_international = 'American'
+            ), 0)
+        )::numeric, 2),
+        ROUND(
+            100.0 * COALESCE(SUM(n) FILTER (
+                WHERE term_season = p.season AND term_year = p.year
+                  AND status = 'Accepted'
+            ), 0)
+            / NULLIF(SUM(n) FILTER (WHERE term_season = p.season AND term_year = p.year), 0),
+            2
+        ),
+        ROUND((
+            SUM(gpa_sum) FILTER (
+                WHERE term_season = p.season AND term_year = p.year
+                  AND status = 'Accepted'
+            )
+            / NULLIF(SUM(gpa_n) FILTER (
+                WHERE term_season = p.season AND term_year = p.year
+                  AND status = 'Accepted'
+            ), 0)
+        )::numeric, 2),
+        COALESCE(SUM(n) FILTER (WHERE is_cs AND is_jhu AND degree = 'Masters'), 0)::bigint,
+        COALESCE(SUM(n) FILTER (
+            WHERE term_year = p.year AND status = 'Accepted' AND degree = 'PhD'
+              AND is_cs AND is_cs_target
+        ), 0)::bigint,
+        COALESCE(SUM(n) FILTER (
+            WHERE term_year = p.year AND status = 'Accepted' AND degree = 'PhD'
+              AND is_llm_cs
+              AND llm_generated_university IN (
+                'Georgetown University',
+                'Massachusetts Institute of Technology',
+                'Stanford University',
+                'Carnegie Mellon University'
+              )
+        ), 0)::bigint
+    FROM applicant_stats, (SELECT %s::text AS season, %s::integer AS year) AS p
+    LIMIT 1
+    """
+)
+
+STMT_SUMMARY_EXTRA_Q1 = sql.SQL(
+    """
+    SELECT status, ROUND((SUM(gpa_sum) / SUM(gpa_n))::numeric, 2) AS avg_gpa
+    FROM applicant_stats
+    WHERE term_season = %s AND term_year = %s AND gpa_n > 0
+    GROUP BY status
+    ORDER BY avg_gpa DESC
+    LIMIT %s
+    """
+)
+
+STMT_SUMMARY_EXTRA_Q2 = sql.SQL(
+    """
+    SELECT llm_generated_university, SUM(n)::bigint AS total
+    FROM applicant_stats
+    WHERE term_season = %s AND term_year = %s AND llm_generated_university IS NOT NULL
+    GROUP BY llm_generated_university
+    ORDER BY total DESC
+    LIMIT %s
+    """
+)
+
+SCALAR_KEYS = [
+    "fall_2026_count",
+    "international_percent",
+    "avg_gpa",
+    "avg_gre",
+    "avg_gre_v",
+    "avg_gre_aw",
+    "avg_gpa_american_fall",
+    "accept_percent_fall",
+    "avg_gpa_accept_fall",
+    "jhu_ms_cs",
+    "cs_phd_accept_2026",
+    "cs_phd_accept_2026_llm",
+]
+
+
+def _summary_analysis(conn, limit: int) -> Dict[str, Any]:
+    """Answer the index-page metrics from ``applicant_stats`` in O(groups)."""
+    fall = (TERM_SEASON, TERM_YEAR)
+    row = fetch_one(conn, STMT_SUMMARY_SCALARS, fall)
+    results: Dict[str, Any] = dict(zip(SCALAR_KEYS, row))
+    results["extra_q1"] = fetch_all(conn, STMT_SUMMARY_EXTRA_Q1, (*fall, limit))
+    results["extra_q2"] = fetch_all(conn, STMT_SUMMARY_EXTRA_Q2, (*fall, 5))
+    return results
+
+
+def _single_pass_analysis(conn, limit: int) -> Dict[str, Any]:
+    """Compute every scalar metric in one scan, then the two grouped lists."""
+    fall = (TERM_SEASON, TERM_YEAR)
+    row = fetch_one(
+        conn,
+        STMT_COMBINED_SCALARS,
+        (
+            *fall,
+            "%Computer Science%",
+            "%Johns Hopkins%",
+            "%Georgetown University%",
+            "%Massachusetts Institute of Technology%",
+            "%MIT%",
+            "%Stanford University%",
+            "%Carnegie Mellon University%",
+        ),
+    )
+    results: Dict[str, Any] = dict(zip(SCALAR_KEYS, row))
+    results["extra_q1"] = fetch_all(conn, STMT_EXTRA_Q1, (*fall, limit))
+    results["extra_q2"] = fetch_all(conn, STMT_EXTRA_Q2, (*fall, 5))
+    return results
+
+
+ANALYSIS_MODES = ("queries", "summary", "single_pass")
+
+
+def get_analysis(limit: int = MAX_LIMIT, mode: str = DEFAULT_ANALYSIS_MODE) -> Dict[str, Any]:
+    """Compute summary metrics for the analysis page.
+
+    ``mode="queries"`` scans ``applicants`` once per metric;
+    ``mode="single_pass"`` computes all scalar metrics in one scan with
+    ``FILTER`` aggregates; ``mode="summary"`` reads the pre-aggregated
+    ``applicant_stats`` table kept up to date by the loader, and falls back
+    to ``single_pass`` on servers too old to keep that table.
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode: {mode!r}")
     limit = clamp_limit(limit, default=MAX_LIMIT)
 
-    fall_like = "%Fall 2026%"
+    fall = (TERM_SEASON, TERM_YEAR)
     cs_like = "%Computer Science%"
     jhu_like = "%Johns Hopkins%"
 
-    with closing(connect(get_conninfo())) as conn:
+    conninfo = get_conninfo()
+    with connection(conninfo) as conn:
+        ensure_schema(conn, conninfo)
+        if mode == "summary" and stats_supported(conn):
+            return _summary_analysis(conn, limit)
+        if mode in ("summary", "single_pass"):
+            return _single_pass_analysis(conn, limit)
+
         results: Dict[str, Any] = {}
 
-        results["fall_2026_count"] = fetch_one(conn, STMT_FALL_2026, (fall_like,))[0]
+        results["fall_2026_count"] = fetch_one(conn, STMT_FALL_2026, fall)[0]
         results["international_percent"] = fetch_one(conn, STMT_INTL_PCT)[0]
 
         avg_metrics = fetch_one(conn, STMT_AVG_METRICS)
@@ -208,11 +463,11 @@ def get_analysis(limit: int = MAX_LIMIT) -> Dict[str, Any]:
         results["avg_gre_aw"] = avg_metrics[3]
 
         results["avg_gpa_american_fall"] = fetch_one(
-            conn, STMT_AVG_GPA_AMERICAN_FALL, (fall_like,)
+            conn, STMT_AVG_GPA_AMERICAN_FALL, fall
         )[0]
-        results["accept_percent_fall"] = fetch_one(conn, STMT_ACCEPT_PCT_FALL, (fall_like,))[0]
+        results["accept_percent_fall"] = fetch_one(conn, STMT_ACCEPT_PCT_FALL, fall)[0]
         results["avg_gpa_accept_fall"] = fetch_one(
-            conn, STMT_AVG_GPA_ACCEPT_FALL, (fall_like,)
+            conn, STMT_AVG_GPA_ACCEPT_FALL, fall
         )[0]
 
         results["jhu_ms_cs"] = fetch_one(conn, STMT_JHU_MS_CS, (cs_like, jhu_like))[0]
@@ -221,7 +476,7 @@ def get_analysis(limit: int = MAX_LIMIT) -> Dict[str, Any]:
             conn,
             STMT_CS_PHD_ACCEPT_2026,
             (
-                "%2026%",
+                TERM_YEAR,
                 cs_like,
                 "%Georgetown University%",
                 "%Massachusetts Institute of Technology%",
@@ -234,11 +489,11 @@ def get_analysis(limit: int = MAX_LIMIT) -> Dict[str, Any]:
         results["cs_phd_accept_2026_llm"] = fetch_one(
             conn,
             STMT_CS_PHD_ACCEPT_2026_LLM,
-            ("%2026%", cs_like),
+            (TERM_YEAR, cs_like),
         )[0]
 
-        results["extra_q1"] = fetch_all(conn, STMT_EXTRA_Q1, (fall_like, limit))
-        results["extra_q2"] = fetch_all(conn, STMT_EXTRA_Q2, (fall_like, 5))
+        results["extra_q1"] = fetch_all(conn, STMT_EXTRA_Q1, (*fall, limit))
+        results["extra_q2"] = fetch_all(conn, STMT_EXTRA_Q2, (*fall, 5))
 
     return results
 
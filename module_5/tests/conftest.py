@@ -1,5 +1,10 @@
+import gzip
+import hashlib
 import os
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
 SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
 if SRC_DIR not in sys.path:
@@ -21,6 +26,16 @@ def default_pg_env(monkeypatch):
     yield
 
 
+@pytest.fixture(autouse=True)
+def scrape_defaults(monkeypatch):
+    # No robots.txt lookups or shared limiter state across tests.
+    from module_2 import scrape as scrape_module
+
+    monkeypatch.setattr(scrape_module, "RESPECT_ROBOTS", False)
+    monkeypatch.setattr(scrape_module, "_LIMITER", None)
+    yield
+
+
 @pytest.fixture
 def sample_rows():
     # Baseline sample applicant row for tests.
@@ -66,6 +81,44 @@ def sample_rows_extra(sample_rows):
     return sample_rows + [extra]
 
 
+@pytest.fixture
+def varied_rows():
+    # Mixed terms/statuses/degrees/citizenship so every analysis metric is non-trivial.
+    programs = [
+        ("Computer Science, Johns Hopkins University", "Computer Science", "Johns Hopkins University"),
+        ("Computer Science, Stanford University", "Computer Science", "Stanford University"),
+        ("Computer Science, MIT", "Computer Science", "Massachusetts Institute of Technology"),
+        ("Mathematics, Carnegie Mellon University", "Mathematics", "Carnegie Mellon University"),
+        ("Physics, Georgetown University", "Physics", "Georgetown University"),
+    ]
+    statuses = ["Accepted", "Rejected", "Wait listed", "Accepted", "Interview", None]
+    terms = ["Fall 2026", "Spring 2026", "Fall 2025", None]
+    citizenships = ["American", "International", None]
+    degrees = ["Masters", "PhD", None]
+    rows = []
+    for i in range(60):
+        program, llm_program, llm_university = programs[i % len(programs)]
+        rows.append(
+            {
+                "program": program,
+                "comments": None,
+                "date_added": "March 3, 2026",
+                "url": f"https://example.com/varied/{i}",
+                "applicant_status": statuses[i % len(statuses)],
+                "semester_year_start": terms[i % len(terms)],
+                "citizenship": citizenships[i % len(citizenships)],
+                "gpa": f"GPA {3 + (i % 10) / 10:.2f}" if i % 7 else None,
+                "gre": f"GRE {300 + i % 40}" if i % 5 else None,
+                "gre_v": f"{145 + i % 25}",
+                "gre_aw": f"{3 + (i % 4) * 0.5:.1f}" if i % 3 else None,
+                "masters_or_phd": degrees[i % len(degrees)],
+                "llm-generated-program": llm_program,
+                "llm-generated-university": llm_university,
+            }
+        )
+    return rows
+
+
 @pytest.fixture
 def sample_analysis():
     # Known analysis values used by rendering and formatting tests.
@@ -99,7 +152,123 @@ def db_conn(db_conninfo):
     conn = psycopg.connect(db_conninfo)
     conn.autocommit = True
     create_table(conn)
-    conn.execute("TRUNCATE TABLE applicants")
+    conn.execute("TRUNCATE TABLE applicants, applicant_stats")
     yield conn
-    conn.execute("TRUNCATE TABLE applicants")
+    conn.execute("TRUNCATE TABLE applicants, applicant_stats")
     conn.close()
+
+
+def _survey_page_html(page, entries=2):
+    # Canned GradCafe survey page: header row, then detail + metrics row pairs.
+    rows = ["<tr><th>School</th><th>Program</th><th>Added</th><th>Decision</th></tr>"]
+    for i in range(entries):
+        entry = f"{page}-{i}"
+        rows.append(
+            "<tr>"
+            f"<td>University {entry}</td>"
+            "<td>Computer Science</td>"
+            "<td>January 1, 2026</td>"
+            "<td>Accepted Jan 1</td>"
+            f'<td><a href="/result/{entry}">link</a></td>'
+            "</tr>"
+        )
+        rows.append(
+            "<tr><td>GPA 3.9 GRE 330 GRE V 165 GRE AW 5.0 International Fall 2026</td></tr>"
+        )
+    return "<html><body><table>" + "".join(rows) + "</table></body></html>"
+
+
+@pytest.fixture
+def survey_page_html():
+    # Builder for canned survey page HTML.
+    return _survey_page_html
+
+
+@pytest.fixture
+def survey_server(monkeypatch):
+    # Local stub HTTP server serving canned survey pages keyed by ?page=N.
+    # Pages carry an ETag and matching If-None-Match requests get a 304.
+    # state["fail"][page] lists statuses to answer before serving the page;
+    # state["robots"] is served at /robots.txt (404 when None). With
+    # state["gzip"], bodies are gzip-encoded for clients that accept it.
+    # state["cut"][page] counts responses to close halfway through the body.
+    from module_2 import scrape as scrape_module
+
+    state = {
+        "pages": {},
+        "requests": [],
+        "not_modified": [],
+        "fail": {},
+        "cut": {},
+        "robots": None,
+        "gzip": False,
+        "sent_bytes": 0,
+    }
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 - http.server naming
+            parsed = urlparse(self.path)
+            if parsed.path == "/robots.txt":
+                self._send_robots()
+                return
+            page = int(parse_qs(parsed.query).get("page", ["0"])[0])
+            with lock:
+                state["requests"].append(page)
+                failures = state["fail"].get(page)
+                status = failures.pop(0) if failures else None
+            if status:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = state["pages"].get(page, "<html></html>").encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with lock:
+                    state["not_modified"].append(page)
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if state["gzip"] and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            with lock:
+                state["sent_bytes"] += len(body)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            with lock:
+                cut = state["cut"].get(page, 0)
+                if cut:
+                    state["cut"][page] = cut - 1
+            if cut:
+                # Promise the full length, send half, then hang up.
+                self.wfile.write(body[: len(body) // 2])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+        def _send_robots(self):
+            body = (state["robots"] or "").encode("utf-8")
+            self.send_response(200 if state["robots"] is not None else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(scrape_module, "SURVEY_URL", f"{base}/survey/")
+    monkeypatch.setattr(scrape_module, "ROBOTS_URL", f"{base}/robots.txt")
+    state["base_url"] = base
+    yield state
+    server.shutdown()
+    server.server_close()
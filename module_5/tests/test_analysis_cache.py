@@ -0,0 +1,85 @@
+import pytest
+
+from app import AnalysisCache, create_app
+
+
+def _counting_analysis(sample_analysis):
+    calls = {"analysis": 0}
+
+    def analysis_fn():
+        calls["analysis"] += 1
+        return sample_analysis
+
+    return calls, analysis_fn
+
+
+@pytest.mark.web
+def test_index_uses_cache_until_update_analysis(sample_analysis):
+    # Arrange: app with the default TTL and a counting analysis function.
+    calls, analysis_fn = _counting_analysis(sample_analysis)
+    app = create_app(config={"TESTING": True}, analysis_fn=analysis_fn)
+    client = app.test_client()
+    # Act: repeated page views hit the cache.
+    for _ in range(3):
+        assert client.get("/analysis").status_code == 200
+    assert calls["analysis"] == 1
+    # Update Analysis always recomputes and refreshes the cache.
+    assert client.post("/update-analysis").status_code == 200
+    assert client.get("/").status_code == 200
+    assert calls["analysis"] == 2
+    # Assert: counters are exposed.
+    stats = client.get("/cache-stats").get_json()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+
+
+@pytest.mark.buttons
+def test_pull_invalidates_and_busy_serves_stale(sample_rows, sample_analysis):
+    # Arrange: a pull whose loader inspects the page mid-pull.
+    calls, analysis_fn = _counting_analysis(sample_analysis)
+    seen = {}
+
+    def fake_loader(rows):
+        seen["status"] = client.get("/analysis").status_code
+
+    app = create_app(
+        config={"TESTING": True, "RUN_ASYNC": False},
+        scraper=lambda: sample_rows,
+        cleaner=lambda rows: rows,
+        loader=fake_loader,
+        analysis_fn=analysis_fn,
+    )
+    client = app.test_client()
+    client.get("/analysis")
+    app.config["ANALYSIS_CACHE"].invalidate()
+    # Act: pull while the entry is expired; the mid-pull view is served stale.
+    assert client.post("/pull-data").status_code == 200
+    assert seen["status"] == 200
+    assert calls["analysis"] == 1
+    assert app.config["ANALYSIS_CACHE"].stats()["stale_hits"] == 1
+    # Assert: after the pull finishes the next view recomputes.
+    client.get("/analysis")
+    assert calls["analysis"] == 2
+
+
+@pytest.mark.web
+def test_cache_ttl_expiry_and_disable():
+    # Arrange: a controllable clock.
+    now = {"t": 0.0}
+    cache = AnalysisCache(ttl=10, clock=lambda: now["t"])
+    values = iter(range(100))
+
+    def compute():
+        return {"v": next(values)}
+
+    # Act/Assert: fresh within TTL, recomputed after it.
+    assert cache.get(compute) == {"v": 0}
+    now["t"] = 9.9
+    assert cache.get(compute) == {"v": 0}
+    now["t"] = 10.0
+    assert cache.get(compute) == {"v": 1}
+    # TTL <= 0 disables caching entirely, even for stale reads.
+    disabled = AnalysisCache(ttl=0)
+    assert disabled.get(compute) == {"v": 2}
+    assert disabled.get(compute, allow_stale=True) == {"v": 3}
+    assert disabled.stats()["hits"] == 0
@@ -0,0 +1,147 @@
+import pytest
+
+import load_data
+import query_data
+from load_data import create_table, insert_applicants
+from query_data import get_analysis
+
+
+def _sorted_extras(results):
+    # Tie order inside GROUP BY ... ORDER BY is unspecified; compare as sets of rows.
+    results = dict(results)
+    results["extra_q1"] = sorted(results["extra_q1"], key=repr)
+    results["extra_q2"] = sorted(results["extra_q2"], key=repr)
+    return results
+
+
+@pytest.mark.db
+def test_summary_mode_matches_per_query_mode(db_conn, varied_rows):
+    # Arrange: load varied rows through the default loader.
+    insert_applicants(varied_rows)
+    # Act: compute metrics both ways.
+    per_query = get_analysis()
+    summary = get_analysis(mode="summary")
+    # Assert: identical keys and values.
+    assert _sorted_extras(summary) == _sorted_extras(per_query)
+    assert summary["fall_2026_count"] == 15
+    assert summary["jhu_ms_cs"] > 0
+
+
+@pytest.mark.db
+def test_summary_is_updated_incrementally_and_ignores_duplicates(db_conn, varied_rows):
+    # Arrange: load in two overlapping batches with both load paths.
+    insert_applicants(varied_rows[:40])
+    insert_applicants(varied_rows[20:], method="copy")
+    insert_applicants(varied_rows[:10])
+    # Act/Assert: summary still agrees with a full scan.
+    assert _sorted_extras(get_analysis(mode="summary")) == _sorted_extras(get_analysis())
+    total = db_conn.execute("SELECT SUM(n) FROM applicant_stats").fetchone()[0]
+    assert total == len(varied_rows)
+
+
+@pytest.mark.db
+def test_summary_table_backfills_existing_rows(db_conn, varied_rows):
+    # Arrange: rows exist but the summary table was dropped.
+    insert_applicants(varied_rows)
+    db_conn.execute("DROP TABLE applicant_stats")
+    # Act: create_table recreates and backfills it.
+    create_table(db_conn)
+    # Assert: summary answers match the per-query path.
+    assert _sorted_extras(get_analysis(mode="summary")) == _sorted_extras(get_analysis())
+
+
+@pytest.mark.db
+def test_summary_mode_on_empty_table(db_conn):
+    # Empty data: counts are zero and averages/percentages are None in both modes.
+    assert get_analysis(mode="summary") == get_analysis()
+
+
+@pytest.mark.db
+def test_get_analysis_rejects_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown analysis mode"):
+        get_analysis(mode="bogus")
+
+
+@pytest.mark.db
+def test_single_pass_mode_matches_per_query_mode(db_conn, varied_rows, sample_rows_extra):
+    # Arrange: varied rows plus the JHU/MIT sample rows.
+    insert_applicants(varied_rows + sample_rows_extra)
+    # Act: compute metrics with 13 queries and with the single FILTER scan.
+    per_query = get_analysis()
+    single_pass = get_analysis(mode="single_pass")
+    # Assert: byte-for-byte identical results dict (values and types).
+    assert single_pass == per_query
+    assert [type(value) for value in single_pass.values()] == [
+        type(value) for value in per_query.values()
+    ]
+
+
+@pytest.mark.db
+def test_single_pass_mode_on_empty_table(db_conn):
+    # Empty data: zero counts and None averages/percentages, as per-query.
+    assert get_analysis(mode="single_pass") == get_analysis()
+
+
+@pytest.mark.db
+def test_summary_mode_filters_on_generated_term_columns(db_conn, varied_rows):
+    # Arrange: terms where a LIKE on the raw text and the parsed columns disagree.
+    base = {
+        "program": "Computer Science, Stanford University",
+        "applicant_status": "Accepted",
+        "masters_or_phd": "PhD",
+        "gpa": "GPA 3.90",
+        "llm-generated-program": "Computer Science",
+        "llm-generated-university": "Stanford University",
+    }
+    odd_terms = [
+        dict(base, url="https://example.com/odd/1", semester_year_start="2026 Fall"),
+        dict(base, url="https://example.com/odd/2", semester_year_start="Fall 2025 (start 2026)"),
+    ]
+    insert_applicants(varied_rows + odd_terms)
+    # Act: compute metrics both ways.
+    summary = get_analysis(mode="summary")
+    # Assert: "2026 Fall" counts as Fall 2026, the deferred 2025 row does not.
+    assert _sorted_extras(summary) == _sorted_extras(get_analysis())
+    assert summary["fall_2026_count"] == 16
+
+
+@pytest.mark.db
+def test_existing_summary_table_gains_term_columns(db_conn, varied_rows):
+    # Arrange: a summary table created before the term columns existed.
+    insert_applicants(varied_rows)
+    db_conn.execute("ALTER TABLE applicant_stats DROP COLUMN term_season, DROP COLUMN term_year")
+    # Act: the next load's create_table adds them back.
+    create_table(db_conn)
+    # Assert: summary answers still match the per-query path.
+    assert _sorted_extras(get_analysis(mode="summary")) == _sorted_extras(get_analysis())
+
+
+@pytest.mark.db
+def test_analysis_migrates_a_pre_existing_schema(db_conn, varied_rows, monkeypatch):
+    # Arrange: data in the original schema (no term columns, no summary table).
+    insert_applicants(varied_rows)
+    expected = get_analysis()
+    db_conn.execute("DROP TABLE applicant_stats")
+    db_conn.execute("ALTER TABLE applicants DROP COLUMN term_season, DROP COLUMN term_year")
+    monkeypatch.setattr(query_data, "_MIGRATED", set())
+    # Act/Assert: the first analysis call migrates instead of failing.
+    assert _sorted_extras(get_analysis()) == _sorted_extras(expected)
+    assert _sorted_extras(get_analysis(mode="summary")) == _sorted_extras(expected)
+
+
+@pytest.mark.db
+def test_servers_without_nulls_not_distinct_skip_the_summary_table(
+    db_conn, varied_rows, monkeypatch
+):
+    # Arrange: pretend the server predates PostgreSQL 15.
+    db_conn.execute("DROP TABLE applicant_stats")
+    monkeypatch.setattr(load_data, "STATS_MIN_SERVER_VERSION", 10**9)
+    # Act: load through both paths.
+    insert_applicants(varied_rows[:30])
+    insert_applicants(varied_rows[30:], method="copy")
+    # Assert: no summary table, and summary mode answers with a scan.
+    assert db_conn.execute("SELECT to_regclass('applicant_stats')").fetchone()[0] is None
+    assert _sorted_extras(get_analysis(mode="summary")) == _sorted_extras(get_analysis())
+    # Put the table back for the fixture's cleanup.
+    monkeypatch.setattr(load_data, "STATS_MIN_SERVER_VERSION", 0)
+    create_table(db_conn)
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+import db
+import query_data
+from load_data import insert_applicants
+
+
+@pytest.fixture
+def fresh_pools():
+    # Each test starts and ends with no cached pools.
+    db.close_pools()
+    yield
+    db.close_pools()
+
+
+def _backend_pid(conn):
+    return conn.execute("SELECT pg_backend_pid()").fetchone()[0]
+
+
+@pytest.mark.db
+def test_connection_reuses_pooled_backend(db_conninfo, fresh_pools):
+    # Two sequential checkouts share one server backend.
+    with db.connection(db_conninfo) as conn:
+        first = _backend_pid(conn)
+    with db.connection(db_conninfo) as conn:
+        second = _backend_pid(conn)
+    assert first == second
+    assert db.get_pool(db_conninfo).stats() == {"size": 1, "idle": 1}
+
+
+@pytest.mark.db
+def test_pool_disabled_falls_back_to_one_shot(db_conninfo, fresh_pools, monkeypatch):
+    # DB_POOL_MAX=0 restores a fresh connection per call.
+    monkeypatch.setenv("DB_POOL_MAX", "0")
+    assert db.get_pool(db_conninfo) is None
+    with db.connection(db_conninfo) as conn:
+        first = _backend_pid(conn)
+    assert conn.closed
+    with db.connection(db_conninfo) as conn:
+        assert _backend_pid(conn) != first
+
+
+@pytest.mark.db
+def test_pool_discards_unhealthy_and_rolls_back(db_conninfo, fresh_pools):
+    # Arrange: return one connection mid-transaction, then break it.
+    pool = db.get_pool(db_conninfo)
+    conn = pool.getconn()
+    conn.execute("SELECT 1")
+    pool.putconn(conn)
+    assert conn.info.transaction_status == db.TransactionStatus.IDLE
+    conn.close()
+    # Act: the closed idle connection fails the checkout health check.
+    replacement = pool.getconn()
+    # Assert: a new, working connection replaces it.
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone() == (1,)
+    pool.putconn(replacement)
+    assert pool.stats() == {"size": 1, "idle": 1}
+    # Closed connections handed back are dropped rather than pooled.
+    broken = pool.getconn()
+    broken.close()
+    pool.putconn(broken)
+    assert pool.stats() == {"size": 0, "idle": 0}
+
+
+@pytest.mark.db
+def test_pool_prunes_idle_and_times_out(db_conninfo):
+    # Arrange: a one-connection pool with instant idle expiry.
+    pool = db.ConnectionPool(db_conninfo, min_size=0, max_size=1, idle_timeout=0, timeout=0.05)
+    held = pool.getconn()
+    # Act/Assert: a second checkout times out while the only slot is held.
+    with pytest.raises(db.PoolTimeout):
+        pool.getconn()
+    pool.putconn(held)
+    # The expired idle connection is closed on the next checkout.
+    again = pool.getconn()
+    assert again is not held and held.closed
+    # A waiter is woken when the slot frees up.
+    pool.timeout = 5
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    pool.putconn(again)
+    waiter.join(timeout=5)
+    assert got
+    pool.putconn(got[0])
+    pool.close()
+    assert pool.stats() == {"size": 0, "idle": 0}
+
+
+@pytest.mark.db
+def test_pool_releases_slot_when_connect_fails(fresh_pools):
+    # A failed connect does not leak a pool slot.
+    pool = db.ConnectionPool("host=127.0.0.1 port=1 connect_timeout=1", max_size=1, timeout=0.1)
+    for _ in range(2):
+        with pytest.raises(db.psycopg.OperationalError):
+            pool.getconn()
+    assert pool.stats() == {"size": 0, "idle": 0}
+
+
+@pytest.mark.db
+def test_load_and_query_share_the_pool(db_conn, fresh_pools, sample_rows):
+    # Loader and analysis both check out from the same process-wide pool.
+    insert_applicants(sample_rows)
+    query_data.get_analysis()
+    pool = db.get_pool()
+    assert pool.stats()["size"] == 1
@@ -80,8 +80,9 @@ def test_scrape_fetch_and_clean(monkeypatch):
     class DummyResponse:
         def __init__(self, data):
             self.data = data
+            self.status = 200
 
-    def fake_request(method, url):
+    def fake_request(method, url, headers=None):
         assert method == "GET"
         assert url == "https://example.com"
         return DummyResponse(b"<html> ok </html>")
@@ -0,0 +1,158 @@
+import pytest
+
+from app import create_app
+from load_data import insert_applicants
+from pipeline import StreamingPipeline
+
+
+@pytest.mark.buttons
+def test_streaming_pull_loads_each_batch(sample_rows_extra):
+    # Arrange: a batch scraper yielding one row per "page".
+    loaded = []
+
+    def fake_batches():
+        for row in sample_rows_extra:
+            yield [row]
+
+    def fake_cleaner(rows):
+        return [dict(row, cleaned=True) for row in rows]
+
+    def fake_loader(rows):
+        loaded.append(rows)
+
+    app = create_app(
+        config={"TESTING": True, "RUN_ASYNC": False, "STREAMING_PIPELINE": True},
+        cleaner=fake_cleaner,
+        loader=fake_loader,
+        analysis_fn=dict,
+        batch_scraper=fake_batches,
+    )
+    client = app.test_client()
+    # Act: trigger a synchronous streaming pull.
+    response = client.post("/pull-data")
+    # Assert: every batch was cleaned and loaded separately, in order.
+    assert response.status_code == 200
+    assert [batch[0]["url"] for batch in loaded] == [row["url"] for row in sample_rows_extra]
+    assert all(batch[0]["cleaned"] for batch in loaded)
+
+    status = client.get("/pull-status").get_json()
+    assert status["busy"] is False
+    assert set(status["stages"]) == {"fetch", "clean", "load"}
+    assert status["stages"]["load"]["batches"] == 2
+    assert status["stages"]["load"]["rows"] == 2
+
+
+@pytest.mark.buttons
+def test_pull_status_before_any_pull():
+    # Arrange/Act: no pull has run yet.
+    app = create_app(config={"TESTING": True}, analysis_fn=dict)
+    status = app.test_client().get("/pull-status").get_json()
+    # Assert: idle with no stage counters.
+    assert status == {"busy": False, "stages": {}, "failed_pages": [], "error": None}
+
+
+@pytest.mark.buttons
+def test_pipeline_stage_error_propagates_without_deadlock():
+    # Arrange: a tiny queue and a loader that fails on the first batch.
+    produced = []
+
+    def source():
+        for index in range(50):
+            produced.append(index)
+            yield [index]
+
+    def failing_loader(rows):
+        raise RuntimeError("db down")
+
+    pipeline = StreamingPipeline([("clean", list), ("load", failing_loader)], maxsize=1)
+    # Act/Assert: the error surfaces and the source stops early.
+    with pytest.raises(RuntimeError, match="db down"):
+        pipeline.run(source())
+    assert len(produced) < 50
+    assert pipeline.snapshot()["load"]["batches"] == 0
+
+
+@pytest.mark.buttons
+def test_pipeline_source_error_propagates():
+    # Arrange: a source that fails after one batch.
+    def source():
+        yield [1]
+        raise ValueError("bad page")
+
+    pipeline = StreamingPipeline([("load", len)])
+    # Act/Assert: source errors are re-raised after stages drain.
+    with pytest.raises(ValueError, match="bad page"):
+        pipeline.run(source())
+    assert pipeline.snapshot()["fetch"]["batches"] == 1
+
+
+@pytest.mark.integration
+def test_streaming_pull_inserts_into_db(db_conn, sample_rows_extra):
+    # Arrange: stream pages straight into the real loader.
+    def fake_batches():
+        yield sample_rows_extra[:1]
+        yield sample_rows_extra[1:]
+
+    app = create_app(
+        config={"TESTING": True, "RUN_ASYNC": False, "STREAMING_PIPELINE": True},
+        cleaner=lambda rows: rows,
+        loader=insert_applicants,
+        analysis_fn=dict,
+        batch_scraper=fake_batches,
+    )
+    # Act: pull once.
+    response = app.test_client().post("/pull-data")
+    # Assert: both pages reached the database.
+    assert response.status_code == 200
+    count = db_conn.execute("SELECT COUNT(*) FROM applicants").fetchone()[0]
+    assert count == 2
+
+
+@pytest.mark.buttons
+def test_pull_keeps_rows_around_a_failed_page(monkeypatch, survey_server, survey_page_html):
+    # Arrange: default scraper; page 2 fails every attempt.
+    from module_2 import scrape as scrape_module
+
+    monkeypatch.setattr(scrape_module, "BACKOFF", 0.0)
+    monkeypatch.setattr(scrape_module, "RETRIES", 1)
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 4)}
+    survey_server["fail"] = {2: [503, 503]}
+    loaded = []
+    app = create_app(
+        config={"TESTING": True, "RUN_ASYNC": False},
+        cleaner=list,
+        loader=loaded.extend,
+        analysis_fn=dict,
+    )
+    client = app.test_client()
+    # Act
+    response = client.post("/pull-data")
+    status = client.get("/pull-status").get_json()
+    # Assert: the other pages were loaded and the skipped page is reported.
+    assert response.status_code == 200
+    assert len(loaded) == 4
+    assert [page["url"] for page in status["failed_pages"]] == [
+        scrape_module.page_url(2, 100)
+    ]
+    assert status["error"] is None
+
+
+@pytest.mark.buttons
+def test_pull_status_reports_the_error_that_stopped_a_pull():
+    # Arrange: a scraper that fails outright.
+    def broken_scraper():
+        raise RuntimeError("site down")
+
+    app = create_app(
+        config={"TESTING": True, "RUN_ASYNC": False},
+        scraper=broken_scraper,
+        analysis_fn=dict,
+    )
+    client = app.test_client()
+    # Act
+    with pytest.raises(RuntimeError):
+        client.post("/pull-data")
+    status = client.get("/pull-status").get_json()
+    # Assert: the failure is visible and the pull is no longer busy.
+    assert status["busy"] is False
+    assert status["error"] == "RuntimeError: site down"
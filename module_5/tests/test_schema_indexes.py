@@ -0,0 +1,81 @@
+import pytest
+from psycopg import sql
+
+import query_data
+from load_data import create_table, enable_trgm, insert_applicants
+
+
+def _plan(conn, stmt, params):
+    # Force the planner off sequential scans so tiny test tables still show index usage.
+    conn.execute("SET enable_seqscan = off")
+    try:
+        rows = conn.execute(sql.SQL("EXPLAIN ") + stmt, params).fetchall()
+    finally:
+        conn.execute("RESET enable_seqscan")
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.db
+def test_generated_term_columns(db_conn, varied_rows):
+    # Arrange/Act: load rows; term_season/term_year are derived by Postgres.
+    insert_applicants(varied_rows)
+    rows = db_conn.execute(
+        "SELECT DISTINCT term, term_season, term_year FROM applicants ORDER BY term"
+    ).fetchall()
+    # Assert: season and year split out of the free-text term.
+    assert rows == [
+        ("Fall 2025", "Fall", 2025),
+        ("Fall 2026", "Fall", 2026),
+        ("Spring 2026", "Spring", 2026),
+        (None, None, None),
+    ]
+
+
+@pytest.mark.db
+def test_create_table_is_idempotent_and_upgrades_old_schema(db_conn):
+    # Arrange: simulate a table created before the generated columns/indexes existed.
+    db_conn.execute("DROP INDEX applicants_term_idx")
+    db_conn.execute("ALTER TABLE applicants DROP COLUMN term_year")
+    # Act: running create_table twice restores everything without errors.
+    create_table(db_conn)
+    create_table(db_conn)
+    # Assert: column and index are back.
+    assert db_conn.execute("SELECT to_regclass('applicants_term_idx')").fetchone()[0]
+    assert db_conn.execute(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'applicants' AND column_name = 'term_year'"
+    ).fetchone()
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "stmt, params",
+    [
+        (query_data.STMT_FALL_2026, ("Fall", 2026)),
+        (query_data.STMT_ACCEPT_PCT_FALL, ("Fall", 2026)),
+        (query_data.STMT_EXTRA_Q2, ("Fall", 2026, 5)),
+    ],
+)
+def test_term_queries_use_term_index(db_conn, varied_rows, stmt, params):
+    insert_applicants(varied_rows)
+    db_conn.execute("ANALYZE applicants")
+    assert "applicants_term_idx" in _plan(db_conn, stmt, params)
+
+
+@pytest.mark.db
+def test_citizenship_query_uses_index(db_conn, varied_rows):
+    insert_applicants(varied_rows)
+    db_conn.execute("ANALYZE applicants")
+    assert "applicants_citizenship_idx" in _plan(db_conn, query_data.STMT_INTL_PCT, ())
+
+
+@pytest.mark.db
+def test_program_like_uses_trigram_index(db_conn, varied_rows):
+    # pg_trgm is a contrib extension; skip where the server does not ship it.
+    if not enable_trgm(db_conn):
+        pytest.skip("pg_trgm extension not available")
+    create_table(db_conn)
+    insert_applicants(varied_rows)
+    db_conn.execute("ANALYZE applicants")
+    stmt = sql.SQL("SELECT COUNT(*) FROM applicants WHERE program LIKE %s")
+    assert "applicants_program_trgm_idx" in _plan(db_conn, stmt, ("%Johns Hopkins%",))
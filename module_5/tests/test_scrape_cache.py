@@ -0,0 +1,51 @@
+import pytest
+
+from module_2 import scrape as scrape_module
+
+
+@pytest.mark.db
+def test_page_cache_sends_conditional_requests(tmp_path, survey_server, survey_page_html):
+    # Arrange: three pages behind the stub server and an empty cache.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 4)}
+    first = scrape_module.PageCache(str(tmp_path))
+    fresh = scrape_module.scrape_data(min_entries=1000, max_pages=3, per_page=2, cache=first)
+    # Act: scrape again after page 3 changes.
+    survey_server["pages"][3] = survey_page_html(3, entries=1)
+    second = scrape_module.PageCache(str(tmp_path))
+    again = scrape_module.scrape_data(min_entries=1000, max_pages=3, per_page=2, cache=second)
+    # Assert: unchanged pages came back 304 and reused their parsed records.
+    assert survey_server["not_modified"] == [1, 2]
+    assert again == fresh[:5]
+    assert second.stats["not_modified"] == 2
+    assert second.stats["reused"] == 2
+    assert second.stats["parsed"] == 1
+
+
+@pytest.mark.db
+def test_offline_replay_matches_live_scrape(tmp_path, survey_server, survey_page_html):
+    # Arrange: populate the cache with a live scrape.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 4)}
+    live = scrape_module.scrape_data(
+        min_entries=1000, max_pages=4, per_page=2, workers=2,
+        cache=scrape_module.PageCache(str(tmp_path)),
+    )
+    survey_server["requests"].clear()
+    # Act: replay from disk only.
+    offline = scrape_module.PageCache(str(tmp_path), offline=True)
+    replay = scrape_module.scrape_data(min_entries=1000, max_pages=6, per_page=2, cache=offline)
+    # Assert: same rows, no requests; uncached pages read as empty.
+    assert replay == live
+    assert survey_server["requests"] == []
+    assert offline.stats == {"hits": 4, "misses": 2, "not_modified": 0, "parsed": 3, "reused": 3}
+
+
+@pytest.mark.db
+def test_default_cache_from_environment(tmp_path, monkeypatch):
+    # Arrange/Act/Assert: no directory means no cache.
+    monkeypatch.setattr(scrape_module, "CACHE_DIR", None)
+    assert scrape_module.default_cache() is None
+    monkeypatch.setattr(scrape_module, "CACHE_DIR", str(tmp_path / "pages"))
+    monkeypatch.setattr(scrape_module, "OFFLINE", True)
+    cache = scrape_module.default_cache()
+    assert cache.offline
+    assert cache.fetch("https://example.com/missing") == ""
@@ -0,0 +1,53 @@
+import pytest
+
+from module_2 import scrape as scrape_module
+
+
+@pytest.mark.db
+def test_concurrent_scrape_matches_sequential(survey_server, survey_page_html):
+    # Arrange: ten populated pages served by the stub server.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 11)}
+    # Act: scrape the same pages sequentially and with four workers.
+    sequential = scrape_module.scrape_data(min_entries=100, max_pages=10, per_page=2, workers=1)
+    concurrent = scrape_module.scrape_data(min_entries=100, max_pages=10, per_page=2, workers=4)
+    # Assert: identical records, reassembled in page order.
+    assert len(sequential) == 20
+    assert concurrent == sequential
+    assert concurrent[0]["url"].endswith("/result/1-0")
+    assert concurrent[-1]["url"].endswith("/result/10-1")
+
+
+@pytest.mark.db
+def test_concurrent_scrape_honors_min_entries(survey_server, survey_page_html):
+    # Arrange: plenty of pages, but only five entries requested.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 51)}
+    # Act: scrape with a small worker window.
+    results = scrape_module.scrape_data(min_entries=5, max_pages=50, per_page=2, workers=3)
+    # Assert: stops on the page boundary that reaches min_entries.
+    assert [row["url"].rsplit("/", 1)[-1] for row in results] == [
+        "1-0", "1-1", "2-0", "2-1", "3-0", "3-1",
+    ]
+    # Only the pages consumed plus at most one in-flight window were requested.
+    assert max(survey_server["requests"]) <= 3 + 3
+
+
+@pytest.mark.db
+def test_concurrent_scrape_stops_after_five_empty_pages(survey_server, survey_page_html):
+    # Arrange: two real pages followed by a run of empty pages.
+    survey_server["pages"] = {1: survey_page_html(1), 2: survey_page_html(2), 9: survey_page_html(9)}
+    # Act: scrape with more pages allowed than exist.
+    results = scrape_module.scrape_data(min_entries=100, max_pages=20, per_page=2, workers=4)
+    # Assert: pages 3-7 are empty so page 9 is never parsed.
+    assert len(results) == 4
+    assert all(not row["url"].endswith("/result/9-0") for row in results)
+
+
+@pytest.mark.db
+def test_scrape_data_skips_fetch_when_nothing_requested(monkeypatch):
+    # Arrange: any fetch would be an error.
+    def fail_fetch(url):
+        raise AssertionError(url)
+
+    monkeypatch.setattr(scrape_module, "fetch", fail_fetch)
+    # Act/Assert: no entries requested means no pages fetched.
+    assert scrape_module.scrape_data(min_entries=0, workers=4) == []
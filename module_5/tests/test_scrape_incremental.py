@@ -0,0 +1,68 @@
+import pytest
+
+import app as app_module
+from app import create_app
+from load_data import insert_applicants, known_urls
+from module_2 import scrape as scrape_module
+
+
+@pytest.mark.db
+def test_incremental_scrape_stops_at_known_rows(survey_server, survey_page_html):
+    # Arrange: pages 3+ hold rows that are already loaded.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 21)}
+    known = scrape_module.KnownUrls(
+        [f"{scrape_module.BASE_URL}/result/{page}-{i}" for page in range(3, 21) for i in range(2)],
+        stop_after=2,
+    )
+    # Act: incremental scrape with a large min_entries budget.
+    results = scrape_module.scrape_data(min_entries=1000, max_pages=20, per_page=2, known=known)
+    # Assert: only new rows come back and paging stopped on the first known page.
+    assert [row["url"].rsplit("/", 1)[-1] for row in results] == ["1-0", "1-1", "2-0", "2-1"]
+    assert survey_server["requests"] == [1, 2, 3]
+    assert known.skipped == 2
+
+
+@pytest.mark.db
+def test_known_rows_below_threshold_keep_paging(survey_server, survey_page_html):
+    # Arrange: one known row in the middle of new ones.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 4)}
+    known = scrape_module.KnownUrls([f"{scrape_module.BASE_URL}/result/2-0"], stop_after=2)
+    # Act: scrape everything the server has.
+    results = scrape_module.scrape_data(min_entries=1000, max_pages=3, per_page=2, known=known)
+    # Assert: the isolated known row is dropped, paging continues.
+    assert len(results) == 5
+    assert not known.done
+
+
+@pytest.mark.db
+def test_known_urls_reads_loaded_rows(db_conn, sample_rows, db_conninfo):
+    # Arrange: load one applicant.
+    insert_applicants(sample_rows, db_conninfo)
+    # Act/Assert: its URL is reported as known.
+    assert known_urls(db_conninfo) == {sample_rows[0]["url"]}
+
+
+@pytest.mark.buttons
+def test_incremental_pull_uses_known_urls(monkeypatch, survey_server, survey_page_html):
+    # Arrange: app with incremental pulls; everything from page 2 on is loaded.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 11)}
+    loaded = {f"{scrape_module.BASE_URL}/result/{p}-{i}" for p in range(2, 11) for i in range(2)}
+    monkeypatch.setattr(app_module, "known_urls", lambda: loaded)
+    captured = {}
+    app = create_app(
+        config={
+            "TESTING": True,
+            "RUN_ASYNC": False,
+            "INCREMENTAL_PULL": True,
+            "STOP_AFTER_KNOWN": 2,
+        },
+        cleaner=lambda rows: rows,
+        loader=lambda rows: captured.setdefault("rows", rows),
+        analysis_fn=lambda: {},
+    )
+    # Act: trigger a pull through the default scraper.
+    response = app.test_client().post("/pull-data")
+    # Assert: only page 1 rows were new; page 2 ended the scrape.
+    assert response.status_code == 200
+    assert [row["url"].rsplit("/", 1)[-1] for row in captured["rows"]] == ["1-0", "1-1"]
+    assert survey_server["requests"] == [1, 2]
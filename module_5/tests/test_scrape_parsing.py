@@ -0,0 +1,125 @@
+import importlib.util
+import json
+import re
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from module_2 import scrape as scrape_module
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _legacy_metrics(text):
+    # The per-field searches parse_metrics replaced.
+    if not text:
+        return None, None, None, None
+    match_v = re.search(r"V\s*(\d{2,3})", text)
+    match_aw = re.search(r"AW\s*([0-6]\.?(?:\d)?)", text)
+    citizenship = (
+        "American" if "American" in text else ("International" if "International" in text else None)
+    )
+    term = re.search(r"(Fall|Spring|Summer|Winter)\s+\d{4}", text)
+    return (
+        match_v.group(1) if match_v else None,
+        match_aw.group(1) if match_aw else None,
+        citizenship,
+        term.group(0) if term else None,
+    )
+
+
+# lxml is optional; only exercise that backend where it is installed.
+BACKENDS = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(
+            name == "lxml" and importlib.util.find_spec("lxml") is None,
+            reason="lxml not installed",
+        ),
+    )
+    for name in scrape_module.PARSERS
+]
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("parser", BACKENDS)
+def test_parse_page_matches_saved_records(parser):
+    # Arrange: saved survey page and the records the original parser produced.
+    html = (FIXTURES / "survey_page.html").read_text(encoding="utf-8")
+    expected = json.loads((FIXTURES / "survey_page.records.json").read_text(encoding="utf-8"))
+    # Act/Assert: every backend yields identical records.
+    assert scrape_module.parse_page(html, parser) == expected
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "html",
+    [
+        "",
+        "<p>no rows</p>",
+        "<tr><td>A</td><td>B</td><td>C</td><td>D</td></tr><tr><td>x</td></tr>",
+        "<table></table><table><tr><td>outside</td></tr></table>",
+        "<table><tr><td>a<b &amp; &unknown; &#150;<!-- c --></td>"
+        "<td><script>skip()</script>kept<![CDATA[cd]]></td>"
+        "<td>x<br>y</br>z</td><td/><td><a href>l</a><a href='/2'>m</a></td></tr>"
+        "<tr><td><div><td>nested</div>tail</td></tr></table>",
+    ],
+)
+def test_stream_backend_matches_html_parser_tree(html):
+    # Act/Assert: the tokenizer sees the same rows, cells and links as the tree.
+    assert scrape_module.PARSERS["stream"](html) == scrape_module.PARSERS["html.parser"](html)
+
+
+@pytest.mark.db
+def test_row_to_record_on_soup_rows_matches_parse_page():
+    # Arrange: the first saved entry as BeautifulSoup rows.
+    html = (FIXTURES / "survey_page.html").read_text(encoding="utf-8")
+    rows = BeautifulSoup(html, "html.parser").find("table").find_all("tr")
+    # Act/Assert: the tag-based helper builds the same record as parse_page.
+    assert scrape_module.row_to_record(rows[1], rows[2]) == scrape_module.parse_page(html)[0]
+    assert scrape_module.row_to_record(rows[1])["gre"] == ""
+
+
+@pytest.mark.db
+def test_parse_page_rejects_unknown_parser():
+    with pytest.raises(ValueError):
+        scrape_module.parse_page("<table></table>", parser="regex")
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "text",
+    [
+        None,
+        "",
+        "GPA 3.9 GRE 330 GRE V 165 GRE AW 5.0 International Fall 2026",
+        "International American Spring 2025",
+        "AW 4 V 88 AW 7.0 V160",
+        "Fall 2026 Spring 2025 GRE V 1655",
+        "LAW 5.5 InternationalAmerican Winter  2024",
+        "gre v 160 aw 4.0 fall 2026",
+    ],
+)
+def test_parse_metrics_matches_per_field_searches(text):
+    # Act: one pass over the metrics text.
+    metrics = scrape_module.parse_metrics(text)
+    # Assert: same values as the individual regex searches.
+    assert (
+        metrics["gre_v"],
+        metrics["gre_aw"],
+        metrics["citizenship"],
+        metrics["term"],
+    ) == _legacy_metrics(text)
+    assert scrape_module.parse_gre_parts(text) == (metrics["gre_v"], metrics["gre_aw"])
+    assert scrape_module.extract_citizenship_and_term(text) == (
+        metrics["citizenship"],
+        metrics["term"],
+    )
+
+
+@pytest.mark.db
+def test_parse_metrics_extracts_gpa_and_gre_total():
+    metrics = scrape_module.parse_metrics("GPA 3.87 GRE 321 GRE V 160 GRE AW 4.5")
+    assert metrics["gpa"] == "3.87"
+    assert metrics["gre"] == "321"
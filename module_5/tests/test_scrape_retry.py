@@ -0,0 +1,188 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+import urllib3
+
+from module_2 import scrape as scrape_module
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    # Retry immediately so failure tests stay quick.
+    monkeypatch.setattr(scrape_module, "BACKOFF", 0.0)
+    monkeypatch.setattr(scrape_module, "RETRIES", 2)
+
+
+@pytest.mark.db
+def test_server_errors_are_retried(fast_backoff, survey_server, survey_page_html):
+    # Arrange: page 1 answers 503 then 429 before succeeding.
+    survey_server["pages"] = {1: survey_page_html(1)}
+    survey_server["fail"] = {1: [503, 429]}
+    # Act: scrape the single page.
+    results = scrape_module.scrape_data(min_entries=2, max_pages=1, per_page=2)
+    # Assert: the retry produced the real rows and the limiter backed off.
+    assert len(results) == 2
+    assert survey_server["requests"] == [1, 1, 1]
+    limiter = scrape_module.default_limiter()
+    assert limiter.throttled == 2
+    assert limiter.limit == scrape_module.MAX_WORKERS // 4
+
+
+@pytest.mark.db
+def test_persistent_server_error_is_skipped_not_empty(
+    fast_backoff, survey_server, survey_page_html
+):
+    # Arrange: page 2 keeps failing.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 4)}
+    survey_server["fail"] = {2: [500, 500, 500]}
+    failed = []
+    # Act: scrape past the failing page.
+    results = scrape_module.scrape_data(min_entries=1000, max_pages=3, per_page=2, failed=failed)
+    # Assert: pages 1 and 3 are kept and page 2 is reported, not parsed as empty.
+    assert len(results) == 4
+    assert [failure.url for failure in failed] == [scrape_module.page_url(2, 2)]
+    assert "HTTP 500" in failed[0].error
+
+
+@pytest.mark.db
+def test_failed_pages_do_not_count_as_empty(fast_backoff, monkeypatch, survey_page_html):
+    # Arrange: pages 2-6 fail (five in a row would end paging if counted as empty).
+    def load(url):
+        page = int(url.split("page=")[1].split("&")[0])
+        if 2 <= page <= 6:
+            raise scrape_module.FetchError(f"GET {url} failed")
+        return scrape_module.parse_page(survey_page_html(page), "html.parser")
+
+    monkeypatch.setattr(scrape_module, "MAX_FAILED_PAGES", 6)
+    monkeypatch.setattr(scrape_module, "_page_loader", lambda parser, cache: load)
+    failed = []
+    # Act
+    results = scrape_module.scrape_data(min_entries=1000, max_pages=7, per_page=2, failed=failed)
+    # Assert: page 7 was still reached.
+    assert len(results) == 4
+    assert len(failed) == 5
+
+
+@pytest.mark.db
+def test_consecutive_failures_stop_paging(fast_backoff, monkeypatch):
+    # Arrange: every page fails.
+    calls = []
+
+    def load(url):
+        calls.append(url)
+        raise scrape_module.FetchError(f"GET {url} failed")
+
+    monkeypatch.setattr(scrape_module, "_page_loader", lambda parser, cache: load)
+    # Act/Assert: paging gives up after MAX_FAILED_PAGES rather than all pages.
+    assert scrape_module.scrape_data(min_entries=1000, max_pages=50, per_page=2) == []
+    assert len(calls) == scrape_module.MAX_FAILED_PAGES
+
+
+@pytest.mark.db
+def test_network_errors_are_retried(fast_backoff, monkeypatch):
+    # Arrange: every request times out.
+    calls = []
+
+    def timeout_request(method, url, headers=None):
+        calls.append(url)
+        raise urllib3.exceptions.ReadTimeoutError(None, url, "read timed out")
+
+    monkeypatch.setattr(scrape_module.http, "request", timeout_request)
+    # Act/Assert: all attempts are used, then FetchError is raised.
+    with pytest.raises(scrape_module.FetchError, match="ReadTimeoutError"):
+        scrape_module.fetch("https://example.com/slow")
+    assert len(calls) == 3
+
+
+def _response(status, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return SimpleNamespace(status=status, headers=headers)
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, 0.0),
+        ("7", 7.0),
+        ("-3", 0.0),
+        ("soon", 0.0),
+        (format_datetime(datetime.now(timezone.utc) - timedelta(minutes=5), usegmt=True), 0.0),
+    ],
+)
+def test_retry_after_values(value, expected):
+    assert scrape_module._retry_after(_response(429, value)) == expected
+
+
+@pytest.mark.db
+def test_retry_after_http_date():
+    # Arrange: a date two minutes ahead.
+    value = format_datetime(datetime.now(timezone.utc) + timedelta(minutes=2), usegmt=True)
+    # Act/Assert: converted to the seconds left (allowing for the clock moving).
+    assert 115 <= scrape_module._retry_after(_response(503, value)) <= 120
+
+
+@pytest.mark.db
+def test_retry_after_is_capped(fast_backoff, monkeypatch):
+    # Arrange: the server asks for an hour, then answers.
+    replies = [_response(429, "3600"), _response(200)]
+    sleeps = []
+    monkeypatch.setattr(scrape_module.http, "request", lambda *args, **kwargs: replies.pop(0))
+    monkeypatch.setattr(scrape_module.time, "sleep", sleeps.append)
+    # Act: fetch through the retry loop.
+    response = scrape_module._request("https://example.com/busy")
+    # Assert: the wait was clamped to MAX_BACKOFF.
+    assert response.status == 200
+    assert sleeps == [scrape_module.MAX_BACKOFF]
+
+
+@pytest.mark.db
+def test_rate_limiter_paces_requests():
+    # Arrange: 40 requests/sec with no saved burst.
+    limiter = scrape_module.RateLimiter(rate=40, burst=1)
+    started = time.monotonic()
+    # Act: five back-to-back requests.
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release()
+    # Assert: the four after the first waited for tokens.
+    assert time.monotonic() - started >= 4 / 40 * 0.9
+
+
+@pytest.mark.db
+def test_rate_limiter_adapts_concurrency():
+    # Arrange: up to eight requests in flight.
+    limiter = scrape_module.RateLimiter(max_concurrency=8)
+    # Act: two throttled responses, then successes.
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release(throttled=True)
+    assert limiter.limit == 2
+    for _ in range(2 + 3):
+        limiter.acquire()
+        limiter.release()
+    # Assert: the limit climbs back one step per `limit` successes.
+    assert limiter.limit == 4
+
+
+@pytest.mark.db
+def test_crawl_delay_caps_the_rate(monkeypatch, survey_server):
+    # Arrange: robots.txt asks for two seconds between requests.
+    survey_server["robots"] = "User-agent: *\nCrawl-delay: 2\n"
+    monkeypatch.setattr(scrape_module, "RESPECT_ROBOTS", True)
+    monkeypatch.setattr(scrape_module, "DEFAULT_RATE", 5.0)
+    # Act/Assert: the default limiter paces at one request per two seconds.
+    assert scrape_module.crawl_delay() == 2.0
+    assert scrape_module.default_limiter().rate == 0.5
+
+
+@pytest.mark.db
+def test_missing_robots_leaves_rate_unchanged(monkeypatch, survey_server):
+    # Arrange: no robots.txt on the server.
+    monkeypatch.setattr(scrape_module, "RESPECT_ROBOTS", True)
+    # Act/Assert: no delay, so the configured (unlimited) rate stands.
+    assert scrape_module.crawl_delay() is None
+    assert scrape_module.default_limiter().rate == 0.0
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from module_2 import scrape as scrape_module
+
+SAVED_PAGE = (Path(__file__).parent / "fixtures" / "survey_page.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.db
+def test_fetch_records_matches_parse_page(monkeypatch, survey_server):
+    # Arrange: saved page with accented names, gzip on, tiny read size so
+    # multi-byte characters and tags straddle chunk boundaries.
+    page = SAVED_PAGE.replace("University", "Université de Montréal", 5)
+    survey_server["pages"] = {1: page}
+    survey_server["gzip"] = True
+    monkeypatch.setattr(scrape_module, "STREAM_CHUNK", 7)
+    url = scrape_module.page_url(1, 100)
+    # Act: stream-parse the page, then fetch it whole.
+    streamed = scrape_module.fetch_records(url)
+    whole = scrape_module.fetch(url)
+    # Assert: identical records and a compressed transfer.
+    assert streamed == scrape_module.parse_page(page, "html.parser")
+    assert whole == page
+    assert survey_server["sent_bytes"] < len(page.encode("utf-8"))
+
+
+@pytest.mark.db
+def test_stream_parser_scrape_matches_tree_parser(monkeypatch, survey_server, survey_page_html):
+    # Arrange: compressed pages, one of which fails once first.
+    survey_server["pages"] = {page: survey_page_html(page) for page in range(1, 6)}
+    survey_server["gzip"] = True
+    survey_server["fail"] = {2: [503]}
+    monkeypatch.setattr(scrape_module, "BACKOFF", 0.0)
+    # Act: scrape with the streaming path and with BeautifulSoup.
+    streamed = scrape_module.scrape_data(
+        min_entries=100, max_pages=8, per_page=2, workers=3, parser="stream"
+    )
+    tree = scrape_module.scrape_data(
+        min_entries=100, max_pages=8, per_page=2, workers=3, parser="html.parser"
+    )
+    # Assert: same rows in page order.
+    assert len(streamed) == 10
+    assert streamed == tree
+
+
+@pytest.mark.db
+def test_body_cut_off_mid_read_is_retried(monkeypatch, survey_server):
+    # Arrange: the first response for page 1 drops after half its body.
+    survey_server["pages"] = {1: SAVED_PAGE}
+    survey_server["cut"] = {1: 1}
+    monkeypatch.setattr(scrape_module, "BACKOFF", 0.0)
+    monkeypatch.setattr(scrape_module, "STREAM_CHUNK", 256)
+    # Act: stream-parse the page.
+    records = scrape_module.fetch_records(scrape_module.page_url(1, 100))
+    # Assert: a second attempt produced the full page and slowed the limiter.
+    assert records == scrape_module.parse_page(SAVED_PAGE, "html.parser")
+    assert survey_server["requests"] == [1, 1]
+    assert scrape_module.default_limiter().throttled == 1
+
+
+@pytest.mark.db
+def test_body_cut_off_every_time_raises_fetch_error(monkeypatch, survey_server):
+    # Arrange: every response for page 1 drops mid-body.
+    survey_server["pages"] = {1: SAVED_PAGE}
+    survey_server["cut"] = {1: 10}
+    monkeypatch.setattr(scrape_module, "BACKOFF", 0.0)
+    monkeypatch.setattr(scrape_module, "RETRIES", 2)
+    # Act/Assert: the failure surfaces as FetchError after every attempt.
+    with pytest.raises(scrape_module.FetchError, match="after 3 attempts"):
+        scrape_module.fetch_records(scrape_module.page_url(1, 100))
+    assert survey_server["requests"] == [1, 1, 1]
+
+
+@pytest.mark.db
+def test_pool_negotiates_compression():
+    # Assert: the shared pool advertises compressed transfer.
+    assert "gzip" in scrape_module.http.headers["accept-encoding"]